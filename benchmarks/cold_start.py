@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""Measure cold-start time, from interpreter start to the first detection result, in fresh processes.
+
+Compares the default model loading with a local model file configured with `configure_models`, both with a hash
+that has to be verified and with the verification already recorded in the model's sidecar.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from contextual_langdetect.models import file_sha256, sidecar_path
+
+CHILD = """
+import json, sys, time
+from pathlib import Path
+start = time.perf_counter()
+from contextual_langdetect import ModelSize, detect_language
+from contextual_langdetect.backends import configure_models
+from contextual_langdetect.models import LocalModel
+imported = time.perf_counter()
+model = ModelSize(sys.argv[1])
+if len(sys.argv) > 2:
+    configure_models({model: LocalModel(Path(sys.argv[2]), sys.argv[3] if len(sys.argv) > 3 else None)})
+configured = time.perf_counter()
+detect_language("Hello, how are you today?", model=model)
+done = time.perf_counter()
+print(json.dumps({"import": imported - start, "configure": configured - imported, "first result": done - configured}))
+"""
+
+
+def run_child(args: list[str]) -> dict[str, float]:
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD, *args], check=True, capture_output=True, text=True).stdout
+    timings: dict[str, float] = json.loads(output)
+    timings["process total"] = time.perf_counter() - start
+    return timings
+
+
+def report(name: str, runs: list[dict[str, float]]) -> None:
+    print(f"{name}:")
+    for key in runs[0]:
+        median = statistics.median(run[key] for run in runs)
+        print(f"  {key:15} {median * 1e3:9.1f} ms")
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--model", choices=["small", "large"], default="small", help="Model size to load")
+    parser.add_argument("--model-path", type=Path, help="Local model file to compare with the default loading")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Processes per configuration (median reported)")
+    args = parser.parse_args()
+
+    report(f"default {args.model} model", [run_child([args.model]) for _ in range(args.repeat)])
+    if args.model_path is None:
+        return
+
+    path = args.model_path.resolve()
+    sha256 = file_sha256(path)
+    sidecar = sidecar_path(path)
+
+    unverified: list[dict[str, float]] = []
+    for _ in range(args.repeat):
+        sidecar.unlink(missing_ok=True)
+        unverified.append(run_child([args.model, str(path), sha256]))
+    report(f"{path.name}, hash verified at startup", unverified)
+    report(
+        f"{path.name}, verification recorded in sidecar",
+        [run_child([args.model, str(path), sha256]) for _ in range(args.repeat)],
+    )
+    report(f"{path.name}, no hash", [run_child([args.model, str(path)]) for _ in range(args.repeat)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+"""Show that context correction costs the same per sentence however many correction rules are registered.
+
+Resolves a document of ambiguous sentences with rule tables padded with N synthetic rules, and compares the
+per-sentence time with a linear scan over the same rules (the cost of an if/elif chain of that length).
+"""
+
+import random
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.detector import Detector
+from contextual_langdetect.rules import CLOSELY_RELATED_RULES, DEFAULT_RULES, CorrectionRule, RuleTable
+
+SAMPLES = {
+    "你好，最近怎么样？": {"zh": 0.95},
+    "很好。": {"ja": 0.55, "zh": 0.40},
+    "侬好。": {"wuu": 0.60, "zh": 0.35},
+    "Apa khabar hari ini?": {"ms": 0.92},
+    "Terima kasih.": {"id": 0.55, "ms": 0.40},
+    "Okay.": {"en": 0.62, "ms": 0.20},
+}
+
+
+def make_document(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    texts = list(SAMPLES)
+    return [rng.choice(texts) for _ in range(n)]
+
+
+def padded(n: int) -> RuleTable:
+    """The default and closely-related rules, preceded by `n` rules for languages that never occur."""
+    return (
+        RuleTable([CorrectionRule(f"x{i:05}", "zh") for i in range(n)])
+        .extend(DEFAULT_RULES)
+        .extend(CLOSELY_RELATED_RULES)
+    )
+
+
+def linear_scan(rules: RuleTable, detected: str, primary_languages: frozenset[str]) -> CorrectionRule | None:
+    for rule in rules:
+        if rule.detected == detected and rule.target in primary_languages and detected not in primary_languages:
+            return rule
+    return None
+
+
+def time_per_sentence(fn: Callable[[], object], n: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best / n
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--sentences", type=int, default=10_000, help="Sentences per document")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    document = make_document(args.sentences)
+    backend = TableBackend(SAMPLES)
+    detections = [(max(SAMPLES[text], key=SAMPLES[text].__getitem__), text) for text in document]
+    primary_languages = frozenset(["zh", "ms"])
+
+    print(f"{'rules':>7} {'contextual_detect':>18} {'rule table':>12} {'linear scan':>12}")
+    for extra in [0, 10, 100, 1_000, 10_000]:
+        rules = padded(extra)
+        detector = Detector(backend=backend, rules=rules, cache_size=len(SAMPLES))
+
+        def lookups(find: Callable[[RuleTable, str, frozenset[str]], object]) -> None:
+            for detected, _ in detections:
+                find(rules, detected, primary_languages)
+
+        pipeline = time_per_sentence(lambda: detector.contextual_detect(document), len(document), args.repeat)
+        table = time_per_sentence(
+            lambda: lookups(lambda rules, detected, primary: rules.lookup(detected, primary)), len(document), 1
+        )
+        scan = time_per_sentence(lambda: lookups(linear_scan), len(document), 1)
+        print(f"{len(rules):>7} {pipeline * 1e6:>15.2f} µs {table * 1e6:>9.2f} µs {scan * 1e6:>9.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+"""Measure accuracy against throughput and memory across a grid of models and thresholds.
+
+Runs `contextual_detect` (through a `Detector` per configuration) on labeled documents: the fixtures in `tests/data/`,
+whose `.labels` sidecars give the language of each non-blank, non-comment line, and any JSONL files given with
+--data, one {"text", "language", "document"?} record per sentence. Each configuration runs in a fresh process, so its
+peak resident memory includes the model it loads. For each one the script reports accuracy, the corrections made by
+each rule, sentences per second after the model is loaded, and peak memory, and marks the configurations on the
+Pareto front: those that no other configuration beats on accuracy, throughput and memory together.
+"""
+
+import itertools
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from argparse import ArgumentParser
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+from contextual_langdetect import metrics
+from contextual_langdetect.backends import default_backend
+from contextual_langdetect.detection import Language, ModelSize, Thresholds
+from contextual_langdetect.detector import Detector
+from contextual_langdetect.rules import default_rules
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "data"
+
+
+@dataclass(frozen=True)
+class Document:
+    name: str
+    sentences: list[str]
+    labels: list[Language]
+
+
+@dataclass(frozen=True)
+class Config:
+    model: str
+    confidence: float
+    min_alternative_probability: float
+    bias_boost_factor: float
+
+
+@dataclass(frozen=True)
+class Evaluation:
+    config: Config
+    accuracy: float
+    corrections: dict[str, int]
+    sentences_per_second: float
+    peak_mb: float
+
+
+def read_fixture(path: Path) -> Document:
+    """Read a `tests/data` text file and the labels in its `.labels` sidecar."""
+    lines = [line.strip() for line in path.read_text(encoding="utf-8").splitlines()]
+    sentences = [line for line in lines if line and not line.startswith("#")]
+    labels = path.with_suffix(".labels").read_text(encoding="utf-8").split()
+    if len(labels) != len(sentences):
+        raise ValueError(f"{path.name} has {len(sentences)} sentences but {len(labels)} labels")
+    return Document(path.stem, sentences, labels)
+
+
+def read_jsonl(path: Path) -> list[Document]:
+    """Read labeled sentences, grouped into documents by their "document" field (default: one per file)."""
+    documents: dict[str, Document] = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            record = json.loads(line)
+            name = f"{path.stem}:{record['document']}" if "document" in record else path.stem
+            document = documents.setdefault(name, Document(name, [], []))
+            document.sentences.append(record["text"])
+            document.labels.append(record["language"])
+    return list(documents.values())
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10  # bytes on macOS, KiB on Linux
+
+
+def evaluate(config: Config, documents: Sequence[Document], expected_languages: bool, repeat: int) -> Evaluation:
+    """Run one configuration; called in a fresh process."""
+    model = ModelSize(config.model)
+    thresholds = replace(
+        Thresholds.from_module(),
+        confidence=config.confidence,
+        min_alternative_probability=config.min_alternative_probability,
+        bias_boost_factor=config.bias_boost_factor,
+    )
+    backend = default_backend(model)
+    backend.load()
+
+    def detector(document: Document) -> Detector:
+        languages = sorted(set(document.labels)) if expected_languages else None
+        return Detector(model, languages, thresholds=thresholds, backend=backend)
+
+    detectors = [detector(document) for document in documents]
+
+    # One pass for accuracy and rule hits, with metrics on
+    registry = metrics.enable_metrics()
+    correct = total = 0
+    for document, document_detector in zip(documents, detectors):
+        predicted = document_detector.contextual_detect(document.sentences)
+        if len(predicted) != len(document.labels):
+            raise ValueError(f"some sentences of {document.name} could not be detected")
+        correct += sum(p == label for p, label in zip(predicted, document.labels))
+        total += len(document.labels)
+    rule_names = [rule.name for rule in default_rules()] + ["primary_language"]
+    corrections = {name: int(registry.value("corrections_total", rule=name)) for name in rule_names}
+    metrics.disable_metrics()
+
+    # Timed passes, without metrics
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for document, document_detector in zip(documents, detectors):
+            document_detector.contextual_detect(document.sentences)
+    elapsed = time.perf_counter() - start
+
+    return Evaluation(
+        config,
+        accuracy=correct / total if total else 0.0,
+        corrections={name: count for name, count in corrections.items() if count},
+        sentences_per_second=repeat * total / elapsed if elapsed > 0 else 0.0,
+        peak_mb=peak_rss_mb(),
+    )
+
+
+def pareto_front(evaluations: Sequence[Evaluation]) -> set[int]:
+    """Return the indices of the evaluations that no other one matches on every measure and beats on at least one."""
+
+    def measures(e: Evaluation) -> tuple[float, float, float]:
+        return e.accuracy, e.sentences_per_second, -e.peak_mb
+
+    def dominates(a: Evaluation, b: Evaluation) -> bool:
+        ma, mb = measures(a), measures(b)
+        return all(x >= y for x, y in zip(ma, mb)) and ma != mb
+
+    return {i for i, b in enumerate(evaluations) if not any(dominates(a, b) for a in evaluations)}
+
+
+def report(evaluations: Sequence[Evaluation], pareto_only: bool) -> None:
+    front = pareto_front(evaluations)
+    print(
+        f"  {'model':<6} {'conf':>5} {'min alt':>7} {'boost':>5}  {'accuracy':>8} {'sentences/s':>12} "
+        f"{'peak MB':>8}  corrections"
+    )
+    order = sorted(range(len(evaluations)), key=lambda i: -evaluations[i].sentences_per_second)
+    for i in order:
+        if pareto_only and i not in front:
+            continue
+        e, c = evaluations[i], evaluations[i].config
+        corrections = " ".join(f"{name}:{count}" for name, count in sorted(e.corrections.items()))
+        print(
+            f"{'*' if i in front else ' '} {c.model:<6} {c.confidence:5.2f} {c.min_alternative_probability:7.2f} "
+            f"{c.bias_boost_factor:5.2f}  {e.accuracy:8.1%} {e.sentences_per_second:12,.0f} {e.peak_mb:8.0f}  "
+            f"{corrections}"
+        )
+    print("* on the Pareto front of accuracy, throughput and peak memory")
+
+
+def main() -> None:
+    defaults = Thresholds.from_module()
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--data", type=Path, nargs="*", default=[], help="Labeled JSONL files to add to the fixtures")
+    parser.add_argument("--no-fixtures", action="store_true", help="Only use the --data files")
+    parser.add_argument("--models", nargs="+", choices=["small", "large"], default=["small", "large"])
+    parser.add_argument("--confidence", type=float, nargs="+", default=[defaults.confidence])
+    parser.add_argument("--min-alternative", type=float, nargs="+", default=[defaults.min_alternative_probability])
+    parser.add_argument("--bias-boost", type=float, nargs="+", default=[defaults.bias_boost_factor])
+    parser.add_argument(
+        "--expected-languages",
+        action="store_true",
+        help="Pass each document's labeled languages as languages=, which --bias-boost needs to have any effect",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=100, help="Timed passes over the data per configuration")
+    parser.add_argument("--pareto", action="store_true", help="Only show configurations on the Pareto front")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Also write the results to PATH")
+    args = parser.parse_args()
+
+    documents = [] if args.no_fixtures else [read_fixture(path) for path in sorted(FIXTURES.glob("*.txt"))]
+    for path in args.data:
+        documents.extend(read_jsonl(path))
+    if not documents:
+        parser.error("no labeled documents")
+    if len(args.bias_boost) > 1 and not args.expected_languages:
+        print("note: --bias-boost only has an effect with --expected-languages", file=sys.stderr)
+
+    sentences = sum(len(document.sentences) for document in documents)
+    print(f"{len(documents)} documents, {sentences} labeled sentences")
+    configs = [
+        Config(*values)
+        for values in itertools.product(args.models, args.confidence, args.min_alternative, args.bias_boost)
+    ]
+    evaluations: list[Evaluation] = []
+    for config in configs:
+        # A fresh process per configuration, so that peak memory is that of its own model
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            evaluations.append(pool.submit(evaluate, config, documents, args.expected_languages, args.repeat).result())
+    report(evaluations, args.pareto)
+
+    if args.json:
+        args.json.write_text(json.dumps([asdict(e) for e in evaluations], indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+"""Measure import time of the package, in fresh processes.
+
+Reports the median time of each statement, run after the previous ones in the same process, so the first detection
+includes importing fast-langdetect and loading the model.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+STEPS = [
+    ("import contextual_langdetect", "import contextual_langdetect"),
+    ("import LanguageState", "from contextual_langdetect import LanguageState"),
+    ("import contextual_detect", "from contextual_langdetect import contextual_detect"),
+    ("first detection", "contextual_detect(['Hello, how are you today?'])"),
+]
+
+CHILD = """
+import json, sys, time
+timings = {}
+for name, statement in json.loads(sys.argv[1]):
+    start = time.perf_counter()
+    exec(statement)
+    timings[name] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+def run_child(steps: list[tuple[str, str]]) -> dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, json.dumps(steps)], check=True, capture_output=True, text=True
+    ).stdout
+    timings: dict[str, float] = json.loads(output)
+    return timings
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("-r", "--repeat", type=int, default=7, help="Processes to run (median reported)")
+    args = parser.parse_args()
+
+    runs = [run_child(STEPS) for _ in range(args.repeat)]
+    baseline = [run_child([("import fast_langdetect", "import fast_langdetect")]) for _ in range(args.repeat)]
+    for name, _ in STEPS:
+        print(f"{name:30} {statistics.median(run[name] for run in runs) * 1e3:8.1f} ms")
+    fast_langdetect = statistics.median(run["import fast_langdetect"] for run in baseline)
+    print(f"{'(import fast_langdetect alone)':30} {fast_langdetect * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+"""Measure the overhead of contextual_detect apart from model inference time.
+
+Runs the same synthetic document through the table-driven backend (no model time) and the fast-langdetect backend,
+and reports per-sentence times for each, plus the table-driven run with metrics enabled and with its result memoized.
+"""
+
+import random
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+
+from contextual_langdetect.backends import TableBackend, default_backend
+from contextual_langdetect.detection import ModelSize, contextual_detect
+from contextual_langdetect.memo import disable_document_memo, enable_document_memo
+from contextual_langdetect.metrics import disable_metrics, enable_metrics
+
+SAMPLES = {
+    "你好，最近怎么样？": {"zh": 0.95, "ja": 0.03},
+    "很好。": {"ja": 0.55, "zh": 0.40},
+    "侬好。": {"wuu": 0.60, "zh": 0.35},
+    "How are you doing today?": {"en": 0.97, "fr": 0.01},
+    "Okay.": {"en": 0.62, "de": 0.20},
+}
+
+
+def make_document(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    texts = list(SAMPLES)
+    return [rng.choice(texts) for _ in range(n)]
+
+
+def time_per_sentence(fn: Callable[[], object], n: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best / n
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--sentences", type=int, default=10_000, help="Sentences per document")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Repetitions (best time is reported)")
+    parser.add_argument("--model", choices=["small", "large"], default="small", help="Model for the model run")
+    args = parser.parse_args()
+
+    document = make_document(args.sentences)
+    table = TableBackend(SAMPLES)
+    model = default_backend(ModelSize(args.model))
+    model.predict("warm up")
+
+    orchestration = time_per_sentence(lambda: contextual_detect(document, backend=table), len(document), args.repeat)
+    enable_metrics()
+    with_metrics = time_per_sentence(lambda: contextual_detect(document, backend=table), len(document), args.repeat)
+    disable_metrics()
+    enable_document_memo()
+    contextual_detect(document, backend=table)
+    memo_hit = time_per_sentence(lambda: contextual_detect(document, backend=table), len(document), args.repeat)
+    disable_document_memo()
+    total = time_per_sentence(lambda: contextual_detect(document, backend=model), len(document), args.repeat)
+
+    print(f"sentences:            {len(document)}")
+    print(f"orchestration only:   {orchestration * 1e6:8.2f} µs/sentence")
+    print(f"  with metrics:       {with_metrics * 1e6:8.2f} µs/sentence")
+    print(f"document memo hit:    {memo_hit * 1e6:8.2f} µs/sentence")
+    print(f"with {args.model} model:     {total * 1e6:8.2f} µs/sentence")
+    print(f"orchestration share:  {orchestration / total:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
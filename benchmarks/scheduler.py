@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""Measure interactive latency during a bulk backfill, with and without the priority scheduler.
+
+A backfill of large documents is submitted, then single-sentence interactive requests are made at a fixed interval
+while it runs. The baseline runs whole `contextual_detect` calls first-in first-out on one worker thread; the
+scheduler run uses a one-worker `Scheduler`, which interleaves the interactive requests between bulk chunks.
+"""
+
+import random
+import statistics
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from contextual_langdetect.backends import default_backend
+from contextual_langdetect.detection import Language, ModelSize, contextual_detect
+from contextual_langdetect.scheduler import Priority, Scheduler
+
+SENTENCES = [
+    "你好，最近怎么样？",
+    "很好。",
+    "How are you doing today?",
+    "Okay.",
+    "Bonjour, comment allez-vous ?",
+    "Ich habe heute keine Zeit.",
+]
+
+Submit = Callable[[Sequence[str], Priority], Future[list[Language]]]
+
+
+def run(submit: Submit, documents: list[list[str]], requests: int, interval: float) -> tuple[list[float], float]:
+    """Return the interactive latencies and the backfill duration."""
+    start = time.perf_counter()
+    backfill = [submit(document, Priority.BULK) for document in documents]
+    latencies: list[float] = []
+    for i in range(requests):
+        time.sleep(interval)
+        sent = time.perf_counter()
+        submit([SENTENCES[i % len(SENTENCES)]], Priority.INTERACTIVE).result()
+        latencies.append(time.perf_counter() - sent)
+    for future in backfill:
+        future.result()
+    return latencies, time.perf_counter() - start
+
+
+def report(name: str, latencies: list[float], duration: float, sentences: int) -> None:
+    p50 = statistics.median(latencies)
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(
+        f"{name:<10} interactive p50 {p50 * 1e3:8.2f} ms  p99 {p99 * 1e3:8.2f} ms  "
+        f"backfill {sentences / duration:10,.0f} sentences/s"
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("-d", "--documents", type=int, default=4, help="Documents in the backfill")
+    parser.add_argument("-n", "--sentences", type=int, default=5_000, help="Sentences per backfill document")
+    parser.add_argument("--requests", type=int, default=100, help="Interactive requests")
+    parser.add_argument("--interval", type=float, default=0.005, help="Seconds between interactive requests")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Scheduler chunk size")
+    parser.add_argument("--model", choices=["small", "large"], default="small", help="Model to use")
+    args = parser.parse_args()
+
+    model = ModelSize(args.model)
+    backend = default_backend(model)
+    backend.load()
+    rng = random.Random(0)
+    documents = [[rng.choice(SENTENCES) for _ in range(args.sentences)] for _ in range(args.documents)]
+    total = args.documents * args.sentences
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+
+        def fifo(sentences: Sequence[str], priority: Priority) -> Future[list[Language]]:
+            return pool.submit(contextual_detect, sentences, model=model, backend=backend)
+
+        report("fifo", *run(fifo, documents, args.requests, args.interval), total)
+
+    with Scheduler(model, backend=backend, chunk_size=args.chunk_size) as scheduler:
+        report("scheduler", *run(scheduler.submit, documents, args.requests, args.interval), total)
+        stats = scheduler.stats()
+    for priority, queue in stats.items():
+        p50, p99 = queue.wait_p50 * 1e3, queue.wait_p99 * 1e3
+        print(f"  {priority.name.lower():<11} chunk wait p50 {p50:8.2f} ms  p99 {p99:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
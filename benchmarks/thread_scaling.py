@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""Measure how detection throughput scales from 1 to N threads sharing one model.
+
+Two workloads are timed at each thread count: raw model inference (`backend.predict` on a thread pool), which shows
+whether fastText inference releases the GIL, and `contextual_detect_many` over many small documents, which adds the
+Python pipeline. Run it on a standard and a free-threaded (3.13t) build to compare.
+"""
+
+import os
+import platform
+import sys
+import sysconfig
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from contextual_langdetect.backends import default_backend
+from contextual_langdetect.detection import ModelSize
+from contextual_langdetect.parallel import contextual_detect_many
+
+SENTENCES = [
+    "你好，最近怎么样？",
+    "很好。",
+    "How are you doing today?",
+    "Okay.",
+    "Bonjour, comment allez-vous ?",
+    "Ich habe heute keine Zeit.",
+]
+
+
+def gil_status() -> str:
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        return "standard build (GIL)"
+    is_gil_enabled: Callable[[], bool] = getattr(sys, "_is_gil_enabled")
+    return "free-threaded build, GIL " + ("re-enabled" if is_gil_enabled() else "disabled")
+
+
+def best_time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--documents", type=int, default=2_000, help="Documents (of 6 sentences) per run")
+    parser.add_argument("-t", "--max-threads", type=int, default=os.cpu_count() or 4, help="Largest thread count")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    parser.add_argument("--model", choices=["small", "large"], default="small", help="Model to use")
+    args = parser.parse_args()
+
+    model = ModelSize(args.model)
+    backend = default_backend(model)
+    backend.load()
+    documents = [SENTENCES] * args.documents
+    texts = SENTENCES * args.documents
+    sentences = len(texts)
+
+    counts = [1]
+    while counts[-1] * 2 <= args.max_threads:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != args.max_threads:
+        counts.append(args.max_threads)
+
+    print(f"Python {platform.python_version()}, {gil_status()}, {os.cpu_count()} CPUs, {sentences} sentences")
+    print(f"{'threads':>7} {'predict/s':>12} {'speedup':>8} {'pipeline/s':>12} {'speedup':>8}")
+    base: tuple[float, float] | None = None
+    for threads in counts:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            chunk = (sentences + threads - 1) // threads
+            chunks = [texts[i : i + chunk] for i in range(0, sentences, chunk)]
+
+            def predict_all() -> None:
+                list(pool.map(backend.predict_batch, chunks))
+
+            def pipeline() -> None:
+                contextual_detect_many(documents, model=model, executor=pool)
+
+            predict_rate = sentences / best_time(predict_all, args.repeat)
+            pipeline_rate = sentences / best_time(pipeline, args.repeat)
+        if base is None:
+            base = (predict_rate, pipeline_rate)
+        print(
+            f"{threads:>7} {predict_rate:>12,.0f} {predict_rate / base[0]:>7.2f}x "
+            f"{pipeline_rate:>12,.0f} {pipeline_rate / base[1]:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""Compare the per-sentence loop and the NumPy implementation of context correction (steps 2-4).
+
+Builds synthetic first-pass results for documents of increasing size, with a skewed language mix and a share of
+ambiguous sentences, resolves them both ways, checks that the results are identical, and reports the time per
+sentence and the speedup. Inference is not included; this is the cost that remains once inference is batched.
+"""
+
+import random
+import sys
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+
+from contextual_langdetect import detection
+from contextual_langdetect.detection import DetectionResult, FirstPassResult, Language, Thresholds, resolve_first_pass
+from contextual_langdetect.vectorized import resolve_document
+
+LANGUAGES = ["zh", "en", "ja", "wuu", "ms", "id", "fr", "de"]
+WEIGHTS = [40, 30, 10, 3, 6, 4, 4, 3]
+
+
+def make_results(n: int, ambiguous_share: float, seed: int = 0) -> list[FirstPassResult]:
+    rng = random.Random(seed)
+    results: list[FirstPassResult] = []
+    for index, language in enumerate(rng.choices(LANGUAGES, WEIGHTS, k=n)):
+        ambiguous = rng.random() < ambiguous_share
+        confidence = rng.uniform(0.3, 0.69) if ambiguous else rng.uniform(0.7, 1.0)
+        probabilities = {language: confidence, **{lang: rng.random() * 0.4 for lang in rng.sample(LANGUAGES, 3)}}
+        probabilities[language] = confidence
+        sentence = "ひらがな" if language == "ja" and rng.random() < 0.5 else "中文"
+        detection = DetectionResult(language, confidence, ambiguous)
+        results.append(FirstPassResult(sentence, detection, probabilities, index))
+    return results
+
+
+def best_time(fn: Callable[[], list[Language]], repeat: int) -> tuple[float, list[Language]]:
+    best, result = float("inf"), []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--sentences", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--ambiguous", type=float, default=0.3, help="Share of ambiguous sentences (default: 0.3)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    thresholds = Thresholds.from_module()
+    detection.VECTORIZED_MIN_SENTENCES = sys.maxsize  # resolve_first_pass always loops
+    print(f"{'sentences':>10} {'loop':>12} {'vectorized':>12} {'speedup':>8}")
+    for n in args.sentences:
+        results = make_results(n, args.ambiguous)
+        loop_time, expected = best_time(lambda: resolve_first_pass(results, None, True, thresholds), args.repeat)
+        vector_time, actual = best_time(lambda: resolve_document(results, None, thresholds), args.repeat)
+        if actual != expected:
+            raise AssertionError(f"results differ for {n} sentences")
+        print(
+            f"{n:>10,} {loop_time / n * 1e9:>9.0f} ns {vector_time / n * 1e9:>9.0f} ns {loop_time / vector_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,159 @@
-"""Context-aware language detection for multilingual text."""
-
-from contextual_langdetect.detection import (
-    DetectionResult,
-    Language,
-    LanguageState,
-    contextual_detect,
-    count_by_language,
-    detect_language,
-    get_language_probabilities,
-    get_languages_by_count,
-    get_majority_language,
-)
+"""Context-aware language detection for multilingual text.
+
+Public names other than the exception classes are imported on first access (PEP 562), so `import
+contextual_langdetect` stays cheap for processes that never run a detection.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from contextual_langdetect.exceptions import (
     ContextualLangDetectError,
     LanguageDetectionError,
+    ModelVerificationError,
 )
 
+if TYPE_CHECKING:
+    from contextual_langdetect.backends import Backend, FastLangDetectBackend, TableBackend, configure_models
+    from contextual_langdetect.corpus import CorpusCheckpoint, detect_corpus
+    from contextual_langdetect.deadline import Deadline, Degradation
+    from contextual_langdetect.detection import (
+        DetectionResult,
+        DocumentStatistics,
+        Language,
+        LanguageState,
+        ModelSize,
+        Thresholds,
+        contextual_detect,
+        count_by_language,
+        detect_language,
+        get_language_probabilities,
+        get_languages_by_count,
+        get_majority_language,
+    )
+    from contextual_langdetect.detector import Detector, DetectorStats
+    from contextual_langdetect.memo import DocumentMemo, disable_document_memo, enable_document_memo
+    from contextual_langdetect.metrics import MetricsRegistry, disable_metrics, enable_metrics
+    from contextual_langdetect.models import LocalModel
+    from contextual_langdetect.normalize import Lowercase, TextNormalizer
+    from contextual_langdetect.parallel import contextual_detect_many
+    from contextual_langdetect.progress import CancellationToken, Progress
+    from contextual_langdetect.rules import CorrectionRule, RuleTable, register_rules, set_default_rules
+    from contextual_langdetect.scheduler import Priority, QueueStats, Scheduler
+    from contextual_langdetect.session import DocumentSession
+    from contextual_langdetect.sharding import DocumentShard
+    from contextual_langdetect.short_inputs import InheritFrom, ShortInputPolicy
+
+# Module that defines each lazily imported public name
+_LAZY_IMPORTS = {
+    "Backend": "backends",
+    "FastLangDetectBackend": "backends",
+    "TableBackend": "backends",
+    "configure_models": "backends",
+    "CorpusCheckpoint": "corpus",
+    "detect_corpus": "corpus",
+    "Deadline": "deadline",
+    "Degradation": "deadline",
+    "DetectionResult": "detection",
+    "DocumentStatistics": "detection",
+    "Language": "detection",
+    "LanguageState": "detection",
+    "ModelSize": "detection",
+    "Thresholds": "detection",
+    "contextual_detect": "detection",
+    "count_by_language": "detection",
+    "detect_language": "detection",
+    "get_language_probabilities": "detection",
+    "get_languages_by_count": "detection",
+    "get_majority_language": "detection",
+    "Detector": "detector",
+    "DetectorStats": "detector",
+    "DocumentMemo": "memo",
+    "disable_document_memo": "memo",
+    "enable_document_memo": "memo",
+    "MetricsRegistry": "metrics",
+    "disable_metrics": "metrics",
+    "enable_metrics": "metrics",
+    "LocalModel": "models",
+    "Lowercase": "normalize",
+    "TextNormalizer": "normalize",
+    "contextual_detect_many": "parallel",
+    "CancellationToken": "progress",
+    "Progress": "progress",
+    "CorrectionRule": "rules",
+    "RuleTable": "rules",
+    "register_rules": "rules",
+    "set_default_rules": "rules",
+    "Priority": "scheduler",
+    "QueueStats": "scheduler",
+    "Scheduler": "scheduler",
+    "DocumentSession": "session",
+    "DocumentShard": "sharding",
+    "InheritFrom": "short_inputs",
+    "ShortInputPolicy": "short_inputs",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
+
+
 __all__ = [
+    "Backend",
+    "CancellationToken",
     "ContextualLangDetectError",
+    "CorpusCheckpoint",
+    "CorrectionRule",
+    "Deadline",
+    "Degradation",
     "DetectionResult",
+    "Detector",
+    "DetectorStats",
+    "DocumentMemo",
+    "DocumentSession",
+    "DocumentShard",
+    "DocumentStatistics",
+    "FastLangDetectBackend",
+    "InheritFrom",
     "Language",
     "LanguageDetectionError",
     "LanguageState",
+    "LocalModel",
+    "Lowercase",
+    "MetricsRegistry",
+    "ModelVerificationError",
+    "ModelSize",
+    "Priority",
+    "Progress",
+    "QueueStats",
+    "RuleTable",
+    "Scheduler",
+    "ShortInputPolicy",
+    "TableBackend",
+    "TextNormalizer",
+    "Thresholds",
+    "configure_models",
     "contextual_detect",
+    "contextual_detect_many",
     "count_by_language",
+    "detect_corpus",
     "detect_language",
+    "disable_document_memo",
+    "disable_metrics",
+    "enable_document_memo",
+    "enable_metrics",
     "get_language_probabilities",
     "get_languages_by_count",
     "get_majority_language",
+    "register_rules",
+    "set_default_rules",
 ]
@@ -0,0 +1,281 @@
+"""Inference backends that supply per-sentence language predictions to the detection pipeline."""
+
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol, runtime_checkable
+
+from contextual_langdetect.exceptions import LanguageDetectionError
+from contextual_langdetect.models import LocalModel, verify_model
+from contextual_langdetect.types import LangProbabilities, Language, ModelSize
+
+if TYPE_CHECKING:
+    import fast_langdetect
+
+# Number of labels requested for a probability distribution
+DEFAULT_TOP_K = 5
+
+# Messages of the `DetectError`s that fast-langdetect raises when the model fails on one input. Other errors, such as
+# a model that cannot be downloaded or loaded, are not about the input and propagate unchanged.
+_PREDICTION_FAILURES = ("Language detection failed", "Multilingual detection failed")
+
+
+@runtime_checkable
+class Backend(Protocol):
+    """An inference engine that predicts languages for single sentences or batches of sentences.
+
+    Implementations should raise `LanguageDetectionError` when a prediction fails; the detection pipeline skips such
+    sentences. Input validation (e.g. rejecting empty text) is done by the caller.
+    """
+
+    def predict(self, text: str) -> tuple[Language, float]:
+        """Return the most likely language of the text and its probability."""
+        ...
+
+    def predict_batch(self, texts: Sequence[str]) -> list[tuple[Language, float]]:
+        """Return `predict(text)` for each text."""
+        ...
+
+    def top_k(self, text: str, k: int = DEFAULT_TOP_K) -> LangProbabilities:
+        """Return the k most likely languages of the text, mapped to their probabilities, in decreasing order."""
+        ...
+
+    def top_k_batch(self, texts: Sequence[str], k: int = DEFAULT_TOP_K) -> list[LangProbabilities]:
+        """Return `top_k(text, k)` for each text."""
+        ...
+
+
+@runtime_checkable
+class LabelScorer(Protocol):
+    """A backend that can score a given set of labels directly, rather than through a top-k list.
+
+    Optional: `score_labels` falls back to filtering `top_k` for backends without it.
+    """
+
+    def score_labels(self, text: str, labels: Sequence[Language]) -> LangProbabilities:
+        """Return the probability of each of `labels`, omitting labels the model gives no or negligible probability."""
+        ...
+
+
+def score_labels(backend: Backend, text: str, labels: Sequence[Language]) -> LangProbabilities:
+    """Return the probabilities of `labels` for the text, by `backend.score_labels` if the backend supports it.
+
+    Otherwise the labels are looked up in the backend's top-k list, so expected languages outside it are missing.
+    """
+    if isinstance(backend, LabelScorer):
+        return backend.score_labels(text, labels)
+    wanted = set(labels)
+    return {lang: prob for lang, prob in backend.top_k(text).items() if lang in wanted}
+
+
+class FastLangDetectBackend:
+    """Backend that uses the fastText models bundled with, or downloaded by, fast-langdetect.
+
+    With a `local_model`, the backend instead loads that file through its own `fast_langdetect.LangDetector`, with
+    downloads and fallback to the bundled small model disabled, so it never touches the network. The file is
+    verified against its hash (if given) when the backend is created; see `verify_model`.
+
+    With `normalize_input=False`, fast-langdetect's own per-call input normalization (lowercasing mostly-uppercase
+    text) is turned off, for callers that normalize text beforehand with a `TextNormalizer`. Without a local model,
+    such a backend loads its own copy of the model rather than sharing fast-langdetect's.
+
+    fast-langdetect (and its native and network dependencies) is imported when the first backend is created, rather
+    than when this module is imported.
+
+    Predictions are thread-safe and share one loaded model. fast-langdetect loads models on first use without
+    locking, so call `load()` before starting concurrent work to keep simultaneous first calls from each loading a
+    copy.
+    """
+
+    def __init__(
+        self, model: ModelSize = ModelSize.SMALL, local_model: LocalModel | None = None, *, normalize_input: bool = True
+    ) -> None:
+        import fast_langdetect
+
+        self._fast_langdetect = fast_langdetect
+        self.model = model
+        self.local_model = local_model
+        self.normalize_input = normalize_input
+        self._low_memory = model == ModelSize.SMALL
+        self._detector: "fast_langdetect.LangDetector | None" = None
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        if local_model is not None:
+            verify_model(local_model)
+            config = self._fast_langdetect.LangDetectConfig(
+                custom_model_path=str(local_model.path),
+                disable_verify=True,
+                allow_fallback=False,
+                normalize_input=normalize_input,
+            )
+            self._detector = self._fast_langdetect.LangDetector(config)
+            # The custom model serves both memory modes; always use one so it is loaded only once
+            self._low_memory = True
+        elif not normalize_input:
+            config = self._fast_langdetect.LangDetectConfig(normalize_input=False)
+            self._detector = self._fast_langdetect.LangDetector(config)
+
+    def load(self) -> None:
+        """Load the model now, once, if this backend hasn't used it yet.
+
+        Raises:
+            fast_langdetect.DetectError: If the model cannot be loaded.
+        """
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self.predict("warm up")
+                self._loaded = True
+
+    def predict(self, text: str) -> tuple[Language, float]:
+        try:
+            if self._detector is not None:
+                result = self._detector.detect(text, low_memory=self._low_memory)
+            else:
+                result = self._fast_langdetect.detect(text, low_memory=self._low_memory)
+        except self._fast_langdetect.DetectError as e:
+            if not str(e).startswith(_PREDICTION_FAILURES):
+                raise
+            raise LanguageDetectionError(str(e)) from e
+        return result["lang"], float(result["score"])
+
+    def predict_batch(self, texts: Sequence[str]) -> list[tuple[Language, float]]:
+        # fasttext-predict's multi-line entry point drops the scores, so batches are predicted one text at a time
+        return [self.predict(text) for text in texts]
+
+    def top_k(self, text: str, k: int = DEFAULT_TOP_K) -> LangProbabilities:
+        try:
+            if self._detector is not None:
+                result = self._detector.detect_multilingual(text, low_memory=self._low_memory, k=k)
+            else:
+                result = self._fast_langdetect.detect_multilingual(text, low_memory=self._low_memory, k=k)
+        except self._fast_langdetect.DetectError as e:
+            if not str(e).startswith(_PREDICTION_FAILURES):
+                raise
+            raise LanguageDetectionError(str(e)) from e
+        return {item["lang"]: float(item["score"]) for item in result}
+
+    def top_k_batch(self, texts: Sequence[str], k: int = DEFAULT_TOP_K) -> list[LangProbabilities]:
+        return [self.top_k(text, k) for text in texts]
+
+    def score_labels(self, text: str, labels: Sequence[Language]) -> LangProbabilities:
+        """Return the probability of each of `labels`, from the top-k list if it has them all.
+
+        The model objects only expose top-k prediction, not the output layer, so a label missing from the top-k list
+        is found by ranking the whole vocabulary (k=-1): a second model query that costs about as much as the first,
+        plus a pass over every label. That only happens for sentences where an expected language ranks low.
+        """
+        wanted = set(labels)
+        top = {lang: prob for lang, prob in self.top_k(text).items() if lang in wanted}
+        if len(top) == len(wanted):
+            return top
+        # No threshold: an expected language the model rates very unlikely must still reach the bias step
+        try:
+            if self._detector is not None:
+                result = self._detector.detect_multilingual(text, low_memory=self._low_memory, k=-1, threshold=0.0)
+            else:
+                result = self._fast_langdetect.detect_multilingual(
+                    text, low_memory=self._low_memory, k=-1, threshold=0.0
+                )
+        except self._fast_langdetect.DetectError as e:
+            if not str(e).startswith(_PREDICTION_FAILURES):
+                raise
+            raise LanguageDetectionError(str(e)) from e
+        return {item["lang"]: float(item["score"]) for item in result if item["lang"] in wanted}
+
+
+class TableBackend:
+    """Deterministic in-memory backend that looks predictions up in a table.
+
+    Intended for tests and for benchmarking the detection pipeline without model time. Each text maps to a
+    probability distribution; texts missing from the table use `default`, or raise `LanguageDetectionError` if no
+    default is given. Ties are broken by language code so results never depend on dict order.
+
+    Example:
+        >>> backend = TableBackend({"你好": {"zh": 0.95}, "很好": {"ja": 0.55, "zh": 0.40}})
+        >>> backend.predict("很好")
+        ('ja', 0.55)
+    """
+
+    def __init__(
+        self,
+        table: Mapping[str, Mapping[Language, float]],
+        default: Mapping[Language, float] | None = None,
+    ) -> None:
+        self._table = {text: self._sorted(probs) for text, probs in table.items()}
+        self._default = self._sorted(default) if default is not None else None
+        self.calls = 0
+
+    @staticmethod
+    def _sorted(probs: Mapping[Language, float]) -> list[tuple[Language, float]]:
+        return sorted(probs.items(), key=lambda item: (-item[1], item[0]))
+
+    def _lookup(self, text: str) -> list[tuple[Language, float]]:
+        self.calls += 1
+        ranked = self._table.get(text, self._default)
+        if not ranked:
+            raise LanguageDetectionError(f"No prediction for text: {text!r}")
+        return ranked
+
+    def predict(self, text: str) -> tuple[Language, float]:
+        return self._lookup(text)[0]
+
+    def predict_batch(self, texts: Sequence[str]) -> list[tuple[Language, float]]:
+        return [self.predict(text) for text in texts]
+
+    def top_k(self, text: str, k: int = DEFAULT_TOP_K) -> LangProbabilities:
+        return dict(self._lookup(text)[:k])
+
+    def top_k_batch(self, texts: Sequence[str], k: int = DEFAULT_TOP_K) -> list[LangProbabilities]:
+        return [self.top_k(text, k) for text in texts]
+
+    def score_labels(self, text: str, labels: Sequence[Language]) -> LangProbabilities:
+        wanted = set(labels)
+        return {lang: prob for lang, prob in self._lookup(text) if lang in wanted}
+
+
+_default_backends: dict[ModelSize, FastLangDetectBackend] = {}
+
+# Variants of the default backends with fast-langdetect's input normalization turned off
+_unnormalized_backends: dict[ModelSize, FastLangDetectBackend] = {}
+
+
+def default_backend(model: ModelSize = ModelSize.SMALL, *, normalize_input: bool = True) -> FastLangDetectBackend:
+    """Return the shared fast-langdetect backend for the given model size.
+
+    With `normalize_input=False`, returns a variant of it, also shared, that leaves input normalization to the caller.
+    It loads the same model file as the default backend, but as a separate copy.
+    """
+    backends = _default_backends if normalize_input else _unnormalized_backends
+    backend = backends.get(model)
+    if backend is None:
+        if normalize_input:
+            backend = FastLangDetectBackend(model)
+        else:
+            backend = FastLangDetectBackend(model, default_backend(model).local_model, normalize_input=False)
+        backend = backends.setdefault(model, backend)
+    return backend
+
+
+def set_default_backend(model: ModelSize, backend: FastLangDetectBackend) -> None:
+    """Replace the shared backend used for `model` when no backend is passed explicitly."""
+    _default_backends[model] = backend
+    _unnormalized_backends.pop(model, None)
+
+
+def configure_models(models: Mapping[ModelSize, str | Path | LocalModel]) -> None:
+    """Load the given model sizes from local files instead of the bundled or downloaded models.
+
+    Each file is verified (if a hash is given) now, so a missing or corrupt model fails at startup rather than on
+    the first request. Sizes that are not given keep their current backend.
+
+    Example:
+        >>> configure_models({ModelSize.LARGE: LocalModel(Path("/models/lid.176.bin"), sha256="...")})
+    """
+    backends = {
+        size: FastLangDetectBackend(size, model if isinstance(model, LocalModel) else LocalModel(Path(model)))
+        for size, model in models.items()
+    }
+    for size, backend in backends.items():
+        set_default_backend(size, backend)
@@ -0,0 +1,191 @@
+"""Context-aware language detection over Apache Arrow and NumPy string columns.
+
+This module requires the optional `pyarrow` and `numpy` dependencies (`pip install contextual-langdetect[arrow]`).
+"""
+
+from collections.abc import Sequence
+from typing import Any, NamedTuple, cast
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError as e:  # pragma: no cover - exercised only without the optional dependencies
+    raise ImportError(
+        "contextual_langdetect.columnar requires pyarrow and numpy: pip install 'contextual-langdetect[arrow]'"
+    ) from e
+
+from contextual_langdetect import metrics
+from contextual_langdetect.backends import Backend
+from contextual_langdetect.detection import (
+    FirstPassResult,
+    Language,
+    ModelSize,
+    Thresholds,
+    first_pass,
+    make_inference,
+    resolve_language,
+    select_primary_languages,
+    single_language,
+)
+
+# Number of rows converted to Python strings at a time
+BATCH_SIZE = 4096
+
+ColumnLike = Any  # pa.Array | pa.ChunkedArray | np.ndarray
+
+
+class ColumnDetection(NamedTuple):
+    """Per-row detection results, aligned with the input column.
+
+    Rows that are null, empty or could not be detected are null in both arrays. When a single expected language is
+    given, rows are assigned it without inference and their confidence is null.
+    """
+
+    language: "pa.DictionaryArray[Any, Any]"  # dictionary<int32, string>
+    confidence: "pa.Array[Any]"  # float32; the probability of the final language
+
+
+def _to_arrow(column: ColumnLike) -> "pa.ChunkedArray[Any]":
+    """Return the column as an Arrow chunked array, without copying Arrow input.
+
+    Chunks are kept as they are (e.g. as read from Parquet): batches are sliced or gathered across chunk boundaries,
+    so only the rows of one batch are ever materialized.
+    """
+    if isinstance(column, pa.ChunkedArray):
+        return cast("pa.ChunkedArray[Any]", column)
+    if isinstance(column, pa.Array):
+        return pa.chunked_array([cast("pa.Array[Any]", column)])
+    return pa.chunked_array([pa.array(cast("np.ndarray[Any, Any]", np.asarray(column)), from_pandas=True)])
+
+
+def _document_groups(document_ids: ColumnLike | None, length: int) -> list[npt.NDArray[np.intp]]:
+    """Return one array of row indices per document, in order of first appearance, preserving row order."""
+    if document_ids is None:
+        return [np.arange(length)]
+    ids = _to_arrow(document_ids)
+    if len(ids) != length:
+        raise ValueError(f"document_ids has {len(ids)} rows but values has {length}")
+    # The chunks of the encoded column share one dictionary, so their indices are comparable
+    encoded = pc.dictionary_encode(ids, null_encoding="encode")  # pyright: ignore[reportUnknownMemberType]
+    chunks = cast("list[pa.DictionaryArray[Any, Any]]", encoded.chunks)
+    codes = np.concatenate(
+        [chunk.indices.to_numpy(zero_copy_only=False) for chunk in chunks] or [np.zeros(0, dtype=np.int32)]
+    )
+    order = np.argsort(codes, kind="stable")
+    boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+    return np.split(order, boundaries)
+
+
+def detect_column(
+    values: ColumnLike,
+    document_ids: ColumnLike | None = None,
+    *,
+    languages: Sequence[Language] | None = None,
+    model: ModelSize = ModelSize.SMALL,
+    context_correction: bool = True,
+    backend: Backend | None = None,
+) -> ColumnDetection:
+    """Detect the language of each row of a string column, with context correction per document.
+
+    Rows are converted to Python strings in batches of `BATCH_SIZE`, and only ambiguous rows keep their probability
+    distribution until correction, so memory stays proportional to the number of rows rather than to the number of
+    Python objects the list-based API would build.
+
+    Args:
+        values: An Arrow string array (or chunked array), or a NumPy array of strings; nulls are allowed.
+        document_ids: Optional column of the same length; rows with the same id form one document for context
+            correction. Without it, the whole column is one document.
+        languages: Optional sequence of expected languages to bias detection towards.
+        model: Size of model to use (small uses less memory, large may be more accurate).
+        context_correction: Whether to apply context correction; if False, returns raw fast-langdetect results.
+        backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+
+    Returns:
+        A `ColumnDetection` with a dictionary-encoded language array and a float32 confidence array.
+    """
+    column = _to_arrow(values)
+    with metrics.track_call("detect_column", len(column)):
+        return _detect_column(column, document_ids, languages, model, context_correction, backend)
+
+
+def _detect_column(
+    column: "pa.ChunkedArray[Any]",
+    document_ids: ColumnLike | None,
+    languages: Sequence[Language] | None,
+    model: ModelSize,
+    context_correction: bool,
+    backend: Backend | None,
+) -> ColumnDetection:
+    length = len(column)
+    thresholds = Thresholds.from_module()
+
+    vocabulary: dict[Language, int] = {}
+    language_ids = np.zeros(length, dtype=np.int32)
+    confidences = np.zeros(length, dtype=np.float32)
+    valid = np.zeros(length, dtype=np.bool_)
+    scored = np.zeros(length, dtype=np.bool_)
+
+    def language_id(language: Language) -> int:
+        return vocabulary.setdefault(language, len(vocabulary))
+
+    infer = make_inference(model, backend, languages)
+    only = single_language(languages)
+
+    for rows in _document_groups(document_ids, length):
+        # When only one language is specified and it's the only possible result
+        if only is not None:
+            # Null, empty and whitespace-only rows stay null, as they do when they are inferred
+            text = pc.utf8_trim_whitespace(column.take(rows))  # pyright: ignore[reportUnknownMemberType]
+            lengths = pc.utf8_length(text)  # pyright: ignore[reportUnknownMemberType]
+            non_empty = pc.greater(lengths, pa.scalar(0))  # pyright: ignore[reportUnknownMemberType]
+            present = rows[cast("pa.ChunkedArray[Any]", non_empty).fill_null(pa.scalar(False)).to_numpy()]
+            language_ids[present] = language_id(only)
+            valid[present] = True
+            continue
+
+        language_counts: dict[Language, int] = {}
+        confident_language_counts: dict[Language, int] = {}
+        ambiguous: list[tuple[int, FirstPassResult]] = []
+        contiguous = len(rows) == length  # the whole column: slice instead of gathering rows
+
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch_rows = rows[start : start + BATCH_SIZE]
+            batch = column.slice(start, len(batch_rows)) if contiguous else column.take(batch_rows)
+            sentences = [text or "" for text in batch.to_pylist()]
+            for result in first_pass(sentences, infer, languages, thresholds):
+                row = int(batch_rows[result.index])
+                lang = result.detection.language
+                language_ids[row] = language_id(lang)
+                confidences[row] = result.detection.confidence
+                valid[row] = True
+                scored[row] = True
+                language_counts[lang] = language_counts.get(lang, 0) + 1
+                if result.detection.is_ambiguous:
+                    if context_correction:
+                        ambiguous.append((row, result))
+                else:
+                    confident_language_counts[lang] = confident_language_counts.get(lang, 0) + 1
+
+        if not ambiguous:
+            continue
+
+        total = sum(language_counts.values())
+        primary_languages = select_primary_languages(
+            language_counts, confident_language_counts, total, languages, thresholds
+        )
+        for row, result in ambiguous:
+            final = resolve_language(
+                result.sentence, result.detection, result.probabilities, primary_languages, thresholds
+            )
+            if final != result.detection.language:
+                language_ids[row] = language_id(final)
+                confidences[row] = result.probabilities.get(final, 0.0)
+
+    dictionary = pa.array(list(vocabulary), type=pa.string())
+    indices = pa.array(language_ids, type=pa.int32(), mask=~valid)
+    return ColumnDetection(
+        language=pa.DictionaryArray.from_arrays(indices, dictionary),  # pyright: ignore[reportUnknownMemberType]
+        confidence=pa.array(confidences, type=pa.float32(), mask=~scored),
+    )
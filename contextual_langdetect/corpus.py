@@ -0,0 +1,309 @@
+"""Checkpointed, resumable detection over large line-oriented corpora.
+
+A corpus is a text file with one sentence per line, in documents separated by blank lines. `detect_corpus` writes one
+line per input line to the output file: the language of the sentence, or an empty line for blank lines and sentences
+that could not be detected. Each document is resolved with its own context; documents longer than
+`max_document_lines` are resolved in segments of that many lines, so memory use stays bounded.
+
+Every `checkpoint_lines` lines, at the next segment boundary, the output is flushed to disk and a JSON checkpoint is
+written atomically next to it, recording the input and output positions, the corpus totals and the statistics of the
+document in progress. With `resume=True` a run truncates the output to the checkpointed position and continues from
+the recorded input offset, so an interrupted job produces the same output, with no repeated or missing lines, as one
+that ran through.
+
+With `columnar_path`, the detected sentences are also written, with their document, line, confidence and ambiguity,
+to a directory of language-partitioned Arrow IPC files (see `contextual_langdetect.partitioned`), from which
+`read_language` extracts one language without a full pass.
+
+Example:
+    >>> detect_corpus("corpus.txt", "languages.txt", checkpoint_path="languages.ckpt", resume=True)
+"""
+
+import json
+import os
+from collections import Counter
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from contextual_langdetect.backends import Backend
+from contextual_langdetect.detection import (
+    Language,
+    ModelSize,
+    Thresholds,
+    first_pass,
+    make_inference,
+    resolve_first_pass,
+    single_language,
+)
+
+if TYPE_CHECKING:
+    from contextual_langdetect.partitioned import PartitionedWriter
+
+# Format version of checkpoint files
+CHECKPOINT_VERSION = 1
+
+# Input lines processed between checkpoints
+DEFAULT_CHECKPOINT_LINES = 100_000
+
+# Lines resolved together; longer documents are resolved in segments of this many lines
+DEFAULT_MAX_DOCUMENT_LINES = 10_000
+
+
+# Integer fields of a checkpoint
+_POSITION_FIELDS = ("input_offset", "input_lines", "output_offset", "stats_offset", "documents", "document_line")
+
+
+@dataclass(frozen=True)
+class CorpusCheckpoint:
+    """Where a corpus run has got to: everything needed to continue it without repeating or losing output."""
+
+    options: Mapping[str, Any]  # the run's settings; a run only resumes from a checkpoint with the same ones
+    input_offset: int = 0  # bytes of input consumed
+    input_lines: int = 0
+    output_offset: int = 0  # bytes of output written
+    stats_offset: int = 0  # bytes of per-document statistics written
+    documents: int = 0  # documents completed
+    document_line: int = 0  # input line number of the first line of the document in progress, or 0 between documents
+    document_counts: Mapping[Language, int] = field(default_factory=lambda: {})  # languages of that document so far
+    language_counts: Mapping[Language, int] = field(default_factory=lambda: {})  # languages of the corpus so far
+    columnar_parts: int = 0  # columnar output parts written
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {"version": CHECKPOINT_VERSION, **asdict(self)}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CorpusCheckpoint":
+        """Inverse of `to_dict`.
+
+        Raises:
+            ValueError: If the data has a different format version.
+        """
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"unsupported checkpoint version: {data.get('version')!r}")
+        return cls(
+            options=dict(data["options"]),
+            document_counts={str(lang): int(count) for lang, count in data["document_counts"].items()},
+            language_counts={str(lang): int(count) for lang, count in data["language_counts"].items()},
+            columnar_parts=int(data.get("columnar_parts", 0)),
+            **{name: int(data[name]) for name in _POSITION_FIELDS},
+        )
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Write the checkpoint to `path` atomically: readers see either the previous checkpoint or this one."""
+        path = Path(path)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        temporary.replace(path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> "CorpusCheckpoint":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def _sync(file: IO[bytes] | None) -> int:
+    """Flush `file` to disk and return its size."""
+    if file is None:
+        return 0
+    file.flush()
+    os.fsync(file.fileno())
+    return file.tell()
+
+
+def _open_output(path: Path, offset: int, resume: bool) -> IO[bytes]:
+    """Open an output file for appending at `offset`, discarding anything written after it by an interrupted run."""
+    if not resume:
+        return open(path, "wb")
+    f = open(path, "r+b") if path.exists() else open(path, "w+b")
+    f.truncate(offset)
+    f.seek(offset)
+    return f
+
+
+def detect_corpus(
+    input_path: str | os.PathLike[str],
+    output_path: str | os.PathLike[str],
+    *,
+    stats_path: str | os.PathLike[str] | None = None,
+    checkpoint_path: str | os.PathLike[str] | None = None,
+    resume: bool = False,
+    checkpoint_lines: int = DEFAULT_CHECKPOINT_LINES,
+    max_document_lines: int = DEFAULT_MAX_DOCUMENT_LINES,
+    languages: Sequence[Language] | None = None,
+    model: ModelSize = ModelSize.SMALL,
+    context_correction: bool = True,
+    backend: Backend | None = None,
+    columnar_path: str | os.PathLike[str] | None = None,
+    on_checkpoint: Callable[[CorpusCheckpoint], None] | None = None,
+) -> CorpusCheckpoint:
+    """Detect the language of every line of a corpus, checkpointing so that an interrupted run can be resumed.
+
+    Args:
+        input_path: The corpus: UTF-8 text, one sentence per line, documents separated by blank lines.
+        output_path: File to write one language code per input line to.
+        stats_path: If given, file to append one JSON line per document to, with its first line number, line count
+            and language counts.
+        checkpoint_path: If given, file to write checkpoints to.
+        resume: Continue from the checkpoint at `checkpoint_path`, if there is one, instead of starting over.
+        checkpoint_lines: Number of input lines between checkpoints.
+        max_document_lines: Number of lines resolved together; longer documents are resolved in segments.
+        languages: Optional sequence of expected languages to bias detection towards.
+        model: Size of model to use (small uses less memory, large may be more accurate).
+        context_correction: Whether to apply context correction; if False, writes raw fast-langdetect results.
+        backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+        columnar_path: If given, directory to also write the detected sentences to as language-partitioned Arrow
+            IPC files; requires pyarrow. Read them back with `contextual_langdetect.partitioned.read_language`.
+        on_checkpoint: If given, called with each checkpoint after it is written, and with the final state.
+
+    Returns:
+        The final state of the run, including the corpus language counts.
+
+    Raises:
+        ValueError: If the checkpoint to resume from was made with different options, or for a shorter input.
+    """
+    if checkpoint_lines < 1 or max_document_lines < 1:
+        raise ValueError("checkpoint_lines and max_document_lines must be positive")
+    input_path, output_path = Path(input_path), Path(output_path)
+    options = {
+        "input": str(input_path.resolve()),
+        "stats": str(Path(stats_path).resolve()) if stats_path is not None else None,
+        "max_document_lines": max_document_lines,
+        "languages": list(languages) if languages else None,
+        "model": model.value,
+        "context_correction": context_correction,
+    }
+    if columnar_path is not None:
+        options["columnar"] = str(Path(columnar_path).resolve())
+    state = CorpusCheckpoint(options)
+    resuming = resume and checkpoint_path is not None and Path(checkpoint_path).exists()
+    if resuming:
+        assert checkpoint_path is not None
+        state = CorpusCheckpoint.load(checkpoint_path)
+        if state.options != options:
+            raise ValueError(f"checkpoint {checkpoint_path} was made with different options: {dict(state.options)}")
+        if input_path.stat().st_size < state.input_offset:
+            raise ValueError(f"{input_path} is shorter than when checkpoint {checkpoint_path} was made")
+
+    thresholds = Thresholds.from_module()
+    expected = list(languages) if languages else None
+    document_counts: Counter[Language] = Counter(state.document_counts)
+    language_counts: Counter[Language] = Counter(state.language_counts)
+    documents, document_line = state.documents, state.document_line
+    input_offset, input_lines = state.input_offset, state.input_lines
+    segment: list[str] = []
+    segment_line = 0  # input line number of the first line of the segment
+    since_checkpoint = 0
+    columnar: "PartitionedWriter | None" = None
+    if columnar_path is not None:
+        from contextual_langdetect import partitioned  # requires pyarrow
+
+        # Parts written after the checkpoint, or by an earlier run, would repeat rows
+        partitioned.remove_parts(columnar_path, state.columnar_parts)
+        columnar = partitioned.PartitionedWriter(columnar_path, first_part=state.columnar_parts)
+
+    infer = make_inference(model, backend, expected)
+    only = single_language(expected)
+
+    def resolve_segment() -> None:
+        if only is not None:
+            resolved = dict.fromkeys(range(len(segment)), only)
+            if columnar is not None:
+                for index in range(len(segment)):
+                    add_row(index, only, None, False)
+        else:
+            results = first_pass(segment, infer, expected, thresholds)
+            final = resolve_first_pass(results, expected, context_correction, thresholds)
+            resolved = {result.index: language for result, language in zip(results, final)}
+            if columnar is not None:
+                for result, language in zip(results, final):
+                    detection = result.detection
+                    confidence = (
+                        detection.confidence
+                        if language == detection.language
+                        else result.probabilities.get(language, 0.0)
+                    )
+                    add_row(result.index, language, confidence, detection.is_ambiguous)
+        labels = [resolved.get(index, "") for index in range(len(segment))]
+        output.write("".join(f"{label}\n" for label in labels).encode("utf-8"))
+        counts = Counter(label for label in labels if label)
+        document_counts.update(counts)
+        language_counts.update(counts)
+        segment.clear()
+
+    def add_row(index: int, language: Language, confidence: float | None, ambiguous: bool) -> None:
+        assert columnar is not None
+        line = segment_line + index
+        columnar.add(documents, line, line - document_line, language, confidence, ambiguous)
+
+    def end_document(last_line: int) -> None:
+        nonlocal documents, document_line
+        if document_line and stats is not None:
+            lines = last_line - document_line + 1
+            record = {"line": document_line, "lines": lines, "languages": dict(document_counts)}
+            stats.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        if document_line:
+            documents += 1
+        document_line = 0
+        document_counts.clear()
+
+    def checkpoint() -> CorpusCheckpoint:
+        nonlocal state
+        state = replace(
+            state,
+            input_offset=input_offset,
+            input_lines=input_lines,
+            output_offset=_sync(output),
+            stats_offset=_sync(stats),
+            documents=documents,
+            document_line=document_line,
+            document_counts=dict(document_counts),
+            language_counts=dict(language_counts),
+            columnar_parts=columnar.close_part() if columnar is not None else 0,
+        )
+        if checkpoint_path is not None:
+            state.save(checkpoint_path)
+        if on_checkpoint is not None:
+            on_checkpoint(state)
+        return state
+
+    output = _open_output(output_path, state.output_offset, resuming)
+    stats = _open_output(Path(stats_path), state.stats_offset, resuming) if stats_path is not None else None
+    try:
+        with open(input_path, "rb") as source:
+            source.seek(input_offset)
+            for raw in source:
+                text = raw.decode("utf-8", "replace").strip()
+                if text:
+                    if not segment:
+                        segment_line = input_lines + 1
+                    segment.append(text)
+                    if not document_line:
+                        document_line = input_lines + 1
+                input_offset += len(raw)
+                input_lines += 1
+                since_checkpoint += 1
+                if not text:
+                    if segment:
+                        resolve_segment()
+                    end_document(input_lines - 1)
+                    output.write(b"\n")
+                elif len(segment) >= max_document_lines:
+                    resolve_segment()
+                # Checkpoints are only taken between segments, when all input read so far has been written
+                if since_checkpoint >= checkpoint_lines and not segment:
+                    checkpoint()
+                    since_checkpoint = 0
+        if segment:
+            resolve_segment()
+        end_document(input_lines)
+        return checkpoint()
+    finally:
+        output.close()
+        if stats is not None:
+            stats.close()
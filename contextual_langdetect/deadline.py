@@ -0,0 +1,76 @@
+"""Time budgets for detection calls, with graceful degradation when the budget runs low."""
+
+import time
+from collections.abc import Callable
+from enum import IntEnum
+
+# Language assigned to sentences that were not analyzed before the deadline
+UNKNOWN_LANGUAGE = "unknown"
+
+
+class Degradation(IntEnum):
+    """How much work was skipped to meet a deadline. Each level includes the ones below it."""
+
+    NONE = 0
+    NO_DISTRIBUTION = 1  # ambiguous sentences are corrected without the multilingual probability distribution
+    SMALL_MODEL = 2  # the small model is used even if the large one was requested
+    NO_CORRECTION = 3  # context correction is skipped; first-pass languages are returned
+    UNKNOWN = 4  # sentences not reached before the deadline are labeled UNKNOWN_LANGUAGE
+
+
+class Deadline:
+    """A time budget for one detection call, and a record of the degradation applied to meet it.
+
+    Pass a fresh `Deadline` as the `deadline=` argument of `contextual_detect` or an aggregate helper. After each
+    sentence the call projects the time needed for the rest of the document from the time spent per sentence so far;
+    while the projection exceeds the remaining budget it steps down to the next cheaper level (skip the distribution,
+    then the large model). Once the budget is spent, context correction is skipped and the remaining sentences are
+    labeled `UNKNOWN_LANGUAGE`. Levels only ever increase during a call.
+
+    Example:
+        >>> deadline = Deadline(0.050)  # 50 ms
+        >>> languages = contextual_detect(sentences, model=ModelSize.LARGE, deadline=deadline)
+        >>> deadline.degradation
+        <Degradation.NO_DISTRIBUTION: 1>
+    """
+
+    def __init__(self, seconds: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        """Start a budget of `seconds` from now, as measured by `clock`."""
+        self._clock = clock
+        self.start = clock()
+        self.expires_at = self.start + seconds
+        self.degradation = Degradation.NONE
+        self._level_start = (self.start, 0)  # (time, sentences done) when the current level began
+
+    def remaining(self) -> float:
+        """Seconds left in the budget; negative once it is spent."""
+        return self.expires_at - self._clock()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def degrade(self, level: Degradation) -> Degradation:
+        """Raise the degradation to at least `level`, and return the current level."""
+        self.degradation = max(self.degradation, level)
+        return self.degradation
+
+    def step(self, done: int, total: int) -> Degradation:
+        """Return the level at which to process the next sentence, after `done` of `total` sentences.
+
+        Steps down one level when the time per sentence measured at the current level, projected over the remaining
+        sentences, exceeds the remaining budget.
+        """
+        now = self._clock()
+        remaining = self.expires_at - now
+        if remaining <= 0:
+            self.degradation = Degradation.UNKNOWN
+            return self.degradation
+
+        level_time, level_done = self._level_start
+        if self.degradation < Degradation.SMALL_MODEL and done > level_done:
+            per_sentence = (now - level_time) / (done - level_done)
+            if per_sentence * (total - done) > remaining:
+                self.degradation = Degradation(self.degradation + 1)
+                self._level_start = (now, done)
+        return self.degradation
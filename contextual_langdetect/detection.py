@@ -1,34 +1,23 @@
 """Language detection and processing functionality."""
 
+import time
 from collections import Counter
-from collections.abc import Sequence
-from dataclasses import dataclass
-from enum import Enum
-
-import fast_langdetect
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from dataclasses import dataclass, replace
+from typing import Any
 
+from contextual_langdetect import memo, metrics
+from contextual_langdetect.backends import Backend, default_backend, score_labels
+from contextual_langdetect.deadline import UNKNOWN_LANGUAGE, Deadline, Degradation
 from contextual_langdetect.exceptions import LanguageDetectionError
-
-
-class ModelSize(str, Enum):
-    """Size of the language detection model to use."""
-
-    SMALL = "small"  # Uses low memory mode
-    LARGE = "large"  # Uses full memory mode
-
-
-# Type aliases
-Language = str
-LangProbabilities = dict[str, float]  # language code -> probability
-
-
-@dataclass
-class DetectionResult:
-    """Result of language detection including confidence."""
-
-    language: Language
-    confidence: float
-    is_ambiguous: bool = False
+from contextual_langdetect.normalize import TextNormalizer
+from contextual_langdetect.progress import PROGRESS_INTERVAL, CancellationToken, ProgressCallback, ProgressReporter
+from contextual_langdetect.rules import RuleTable, default_rules
+from contextual_langdetect.short_inputs import ShortInputPolicy
+from contextual_langdetect.types import DetectionResult as DetectionResult
+from contextual_langdetect.types import LangProbabilities as LangProbabilities
+from contextual_langdetect.types import Language as Language
+from contextual_langdetect.types import ModelSize as ModelSize
 
 
 @dataclass
@@ -75,13 +64,19 @@ LANGUAGE_BIAS_BOOST_FACTOR = 1.2  # Boost factor for specified languages in bias
 MIN_BIASED_PROBABILITY = 0.4  # Minimum probability for biased language to override detection
 MIN_ALTERNATIVE_PROBABILITY = 0.3  # Minimum probability to consider alternative language
 
+# Detected sentences from which document-level correction uses the NumPy implementation, when NumPy is installed
+VECTORIZED_MIN_SENTENCES = 10_000
+
 
-def detect_language(text: str, model: ModelSize = ModelSize.SMALL) -> DetectionResult:
+def detect_language(
+    text: str, model: ModelSize = ModelSize.SMALL, *, backend: Backend | None = None
+) -> DetectionResult:
     """Detect the language of the given text.
 
     Args:
         text: The text to detect the language of.
         model: Size of model to use (small uses less memory, large may be more accurate).
+        backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
 
     Returns:
         DetectionResult with detected language and confidence score.
@@ -92,20 +87,31 @@ def detect_language(text: str, model: ModelSize = ModelSize.SMALL) -> DetectionR
     if not text or not text.strip():
         raise ValueError("Empty or whitespace-only text provided")
 
-    result = fast_langdetect.detect(text, low_memory=(model == ModelSize.SMALL))
-    confidence: float = result["score"]
+    registry = metrics.get_registry()
+    start = time.perf_counter() if registry is not None else 0.0
+    language, confidence = (backend or default_backend(model)).predict(text)
+    if registry is not None:
+        registry.observe("inference_seconds", time.perf_counter() - start, model=model.value)
+        metrics.record_call(registry, "detect_language", 1)
 
-    return DetectionResult(
-        language=result["lang"], confidence=confidence, is_ambiguous=confidence < CONFIDENCE_THRESHOLD
-    )
+    return DetectionResult(language=language, confidence=confidence, is_ambiguous=confidence < CONFIDENCE_THRESHOLD)
 
 
-def get_language_probabilities(text: str, model: ModelSize = ModelSize.SMALL) -> LangProbabilities:
+def get_language_probabilities(
+    text: str,
+    model: ModelSize = ModelSize.SMALL,
+    *,
+    backend: Backend | None = None,
+    labels: Sequence[Language] | None = None,
+) -> LangProbabilities:
     """Get probability distribution for languages in the text.
 
     Args:
         text: The text to analyze
         model: Size of model to use (small uses less memory, large may be more accurate).
+        backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+        labels: If given, return the probabilities of these languages only, scored directly rather than taken from
+            the top-5 list, so that an expected language is found even when it ranks lower.
 
     Returns:
         Dictionary mapping language codes to confidence scores
@@ -116,102 +122,235 @@ def get_language_probabilities(text: str, model: ModelSize = ModelSize.SMALL) ->
     if not text or not text.strip():
         raise ValueError("Empty or whitespace-only text provided")
 
-    result = fast_langdetect.detect_multilingual(text, low_memory=(model == ModelSize.SMALL))
-    return {item["lang"]: float(item["score"]) for item in result}
+    registry = metrics.get_registry()
+    start = time.perf_counter() if registry is not None else 0.0
+    scorer = backend or default_backend(model)
+    probabilities = score_labels(scorer, text, labels) if labels else scorer.top_k(text)
+    if registry is not None:
+        registry.observe("inference_seconds", time.perf_counter() - start, model=model.value)
+        metrics.record_call(registry, "get_language_probabilities", 1)
+    return probabilities
 
 
-def contextual_detect(
-    sentences: Sequence[str],
-    languages: Sequence[Language] | None = None,
+@dataclass(frozen=True)
+class Thresholds:
+    """Tuning parameters for context-aware detection.
+
+    The defaults mirror the module-level constants. `Thresholds.from_module()` reads the constants at call time, so
+    callers that patch them (e.g. in tests) still see their values.
+    """
+
+    confidence: float = CONFIDENCE_THRESHOLD
+    primary_language: float = PRIMARY_LANGUAGE_THRESHOLD
+    bias_boost_factor: float = LANGUAGE_BIAS_BOOST_FACTOR
+    min_biased_probability: float = MIN_BIASED_PROBABILITY
+    min_alternative_probability: float = MIN_ALTERNATIVE_PROBABILITY
+
+    @classmethod
+    def from_module(cls) -> "Thresholds":
+        """Return thresholds populated from the current values of the module-level constants."""
+        return cls(
+            confidence=CONFIDENCE_THRESHOLD,
+            primary_language=PRIMARY_LANGUAGE_THRESHOLD,
+            bias_boost_factor=LANGUAGE_BIAS_BOOST_FACTOR,
+            min_biased_probability=MIN_BIASED_PROBABILITY,
+            min_alternative_probability=MIN_ALTERNATIVE_PROBABILITY,
+        )
+
+
+@dataclass(frozen=True)
+class FirstPassResult:
+    """First-pass result for a sentence that could be detected."""
+
+    sentence: str
+    detection: DetectionResult
+    probabilities: LangProbabilities
+    index: int  # position of the sentence in the input sequence
+
+
+# Function that returns the detection and probability distribution for a single sentence
+InferenceFunction = Callable[[str], tuple[DetectionResult, LangProbabilities]]
+
+
+def make_inference(
     model: ModelSize = ModelSize.SMALL,
-    context_correction: bool = True,
-) -> list[Language]:
-    """Process a document, detecting the language of each sentence with context awareness.
+    backend: Backend | None = None,
+    languages: Sequence[Language] | None = None,
+    *,
+    thresholds: Thresholds | None = None,
+    distribution: bool = True,
+) -> InferenceFunction:
+    """Return the first-pass inference function: `detect_language` and `get_language_probabilities` for a sentence.
 
     Args:
-        sentences: The sentences to process.
-        languages: Optional sequence of expected languages to bias detection towards.
-                  If provided, ambiguous detections will be biased towards these languages.
         model: Size of model to use (small uses less memory, large may be more accurate).
-        context_correction: Whether to apply context correction; if False, returns raw fast-langdetect results.
-
-    Returns:
-        List of detected language codes for each sentence.
-
-    Raises:
-        LanguageDetectionError: If language detection fails or is ambiguous and cannot be resolved.
+        backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+        languages: If given, the distribution holds the probabilities of these languages only, scored directly.
+        thresholds: If given, detections are ambiguous below `thresholds.confidence` rather than
+            `CONFIDENCE_THRESHOLD`.
+        distribution: If false, the distribution is not queried and holds only the detected language.
     """
-    # When only one language is specified and it's the only possible result
-    if languages and len(languages) == 1:
-        return [languages[0] for _ in sentences]
-
-    # Step 1: First Pass - Analyze each sentence independently
-    first_pass_results: list[tuple[str, DetectionResult, dict[str, float]]] = []
+    labels = list(languages) if languages else None
+
+    def infer(sentence: str) -> tuple[DetectionResult, LangProbabilities]:
+        detection = detect_language(sentence, model=model, backend=backend)
+        if thresholds is not None:
+            is_ambiguous = detection.confidence < thresholds.confidence
+            if is_ambiguous != detection.is_ambiguous:
+                detection = replace(detection, is_ambiguous=is_ambiguous)
+        if not distribution:
+            return detection, {detection.language: detection.confidence}
+        return detection, get_language_probabilities(sentence, model=model, backend=backend, labels=labels)
+
+    return infer
+
+
+def single_language(languages: Sequence[Language] | None) -> Language | None:
+    """Return the expected language if exactly one is given: then it is the only possible result, without inference."""
+    return languages[0] if languages and len(languages) == 1 else None
+
+
+def deduplicated(infer: InferenceFunction) -> InferenceFunction:
+    """Wrap `infer` so that each distinct sentence is inferred only once; for use within a single call."""
+    results: dict[str, tuple[DetectionResult, LangProbabilities]] = {}
+
+    def infer_once(sentence: str) -> tuple[DetectionResult, LangProbabilities]:
+        result = results.get(sentence)
+        if result is None:
+            result = results[sentence] = infer(sentence)
+        return result
+
+    return infer_once
+
+
+def bias_detection(
+    detection: DetectionResult,
+    language_probs: LangProbabilities,
+    languages: Sequence[Language],
+    thresholds: Thresholds,
+) -> tuple[DetectionResult, LangProbabilities]:
+    """Bias a single detection towards the expected languages."""
+    biased_probs: dict[str, float] = {}
+    # Keep only languages from the languages list, with a boost factor
+    for lang in languages:
+        if lang in language_probs:
+            biased_probs[lang] = language_probs[lang] * thresholds.bias_boost_factor
+
+    # If we have biased probabilities, normalize them
+    if not biased_probs:
+        return detection, language_probs
+
+    total = sum(biased_probs.values())
+    if total > 0:  # Avoid division by zero
+        biased_probs = {k: v / total for k, v in biased_probs.items()}
+
+    # If the highest biased probability is different from the original detection
+    biased_best_lang, biased_best_prob = max(biased_probs.items(), key=lambda x: x[1])
+    if biased_best_lang != detection.language:
+        # Only override if the biased language has a reasonable probability
+        if biased_best_prob > thresholds.min_biased_probability:
+            detection = DetectionResult(
+                language=biased_best_lang,
+                confidence=biased_best_prob,
+                is_ambiguous=biased_best_prob < thresholds.confidence,
+            )
+
+    # Update language_probs with the biased values
+    return detection, biased_probs
+
+
+def first_pass(
+    sentences: Sequence[str],
+    infer: InferenceFunction,
+    languages: Sequence[Language] | None,
+    thresholds: Thresholds,
+    offset: int = 0,
+) -> list[FirstPassResult]:
+    """Step 1: Analyze each sentence independently, skipping sentences that cannot be detected.
+
+    Result indices count from `offset`, for callers that pass a slice of a document.
+    """
+    first_pass_results: list[FirstPassResult] = []
 
-    for sentence in sentences:
+    for index, sentence in enumerate(sentences):
         try:
-            # Standard detection
-            detection = detect_language(sentence, model=model)
-
-            # Get full probability distribution
-            language_probs = get_language_probabilities(sentence, model=model)
+            # Standard detection and full probability distribution
+            detection, language_probs = infer(sentence)
 
             # If languages are specified, bias probabilities towards those languages
             if languages:
-                biased_probs: dict[str, float] = {}
-                # Keep only languages from the languages list, with a boost factor
-                for lang in languages:
-                    if lang in language_probs:
-                        biased_probs[lang] = language_probs[lang] * LANGUAGE_BIAS_BOOST_FACTOR
-
-                # If we have biased probabilities, normalize them
-                if biased_probs:
-                    # Normalize the biased probabilities
-                    total = sum(biased_probs.values())
-                    if total > 0:  # Avoid division by zero
-                        biased_probs = {k: v / total for k, v in biased_probs.items()}
-
-                    # If the highest biased probability is different from the original detection
-                    if biased_probs:
-                        best_item = max(biased_probs.items(), key=lambda x: x[1])
-                        biased_best_lang: str = best_item[0]
-                        biased_best_prob: float = best_item[1]
-
-                        if biased_best_lang != detection.language:
-                            # Only override if the biased language has a reasonable probability
-                            if biased_best_prob > MIN_BIASED_PROBABILITY:
-                                detection = DetectionResult(
-                                    language=biased_best_lang,
-                                    confidence=biased_best_prob,
-                                    is_ambiguous=biased_best_prob < CONFIDENCE_THRESHOLD,
-                                )
-
-                # Update language_probs with the biased values
-                if biased_probs:
-                    language_probs = biased_probs
+                detection, language_probs = bias_detection(detection, language_probs, languages, thresholds)
 
             # Store results (sentence, detection, probabilities)
-            first_pass_results.append((sentence, detection, language_probs))
+            first_pass_results.append(FirstPassResult(sentence, detection, language_probs, offset + index))
 
         except (LanguageDetectionError, ValueError):
             # Skip problematic sentences (empty, invalid, or detection failures)
             continue
 
-    # If context correction is disabled, just return raw results from fast-langdetect
-    if not context_correction:
-        return [detection.language for _, detection, _ in first_pass_results]
+    registry = metrics.get_registry()
+    if registry is not None:
+        registry.inc("sentences_detected_total", len(first_pass_results))
+        registry.inc(
+            "sentences_ambiguous_total", sum(1 for result in first_pass_results if result.detection.is_ambiguous)
+        )
+
+    return first_pass_results
 
-    # Step 2: Find document-level language statistics
+
+def first_pass_with_progress(
+    sentences: Sequence[str],
+    infer: InferenceFunction,
+    languages: Sequence[Language] | None,
+    thresholds: Thresholds,
+    progress: ProgressCallback | None = None,
+    cancel: CancellationToken | None = None,
+) -> tuple[list[FirstPassResult], int]:
+    """Step 1 in intervals of `PROGRESS_INTERVAL` sentences, reporting progress and stopping early if cancelled.
+
+    Returns the first-pass results and the number of leading sentences that were processed.
+    """
+    if progress is None and cancel is None:
+        return first_pass(sentences, infer, languages, thresholds), len(sentences)
+
+    reporter = ProgressReporter(len(sentences), progress)
+    first_pass_results: list[FirstPassResult] = []
+    done = 0
+    while done < len(sentences) and not (cancel is not None and cancel.cancelled):
+        end = min(done + PROGRESS_INTERVAL, len(sentences))
+        first_pass_results.extend(first_pass(sentences[done:end], infer, languages, thresholds, offset=done))
+        done = end
+        reporter.report(done)
+    if not sentences:
+        reporter.report(0)
+    return first_pass_results, done
+
+
+def count_languages(
+    first_pass_results: Sequence[FirstPassResult],
+) -> tuple[dict[Language, int], dict[Language, int]]:
+    """Step 2: Count all detections and confident detections of each language, in order of first appearance."""
     language_counts: dict[Language, int] = {}
     confident_language_counts: dict[Language, int] = {}
 
-    for _, detection, _ in first_pass_results:
-        lang = detection.language
+    for result in first_pass_results:
+        lang = result.detection.language
         language_counts[lang] = language_counts.get(lang, 0) + 1
 
-        if not detection.is_ambiguous:
+        if not result.detection.is_ambiguous:
             confident_language_counts[lang] = confident_language_counts.get(lang, 0) + 1
 
+    return language_counts, confident_language_counts
+
+
+def select_primary_languages(
+    language_counts: Mapping[Language, int],
+    confident_language_counts: Mapping[Language, int],
+    total: int,
+    languages: Sequence[Language] | None,
+    thresholds: Thresholds,
+) -> list[Language]:
+    """Step 3: Find the primary languages from document-level statistics over `total` detected sentences."""
     # Step 3: Document-level language assessment - find primary languages
     primary_languages: list[Language] = []
 
@@ -221,7 +360,7 @@ def contextual_detect(
     # Otherwise determine primary languages from detection statistics
     elif confident_language_counts:
         # Get languages with significant presence (>10% of sentences or at least 1)
-        threshold = max(1, len(first_pass_results) * PRIMARY_LANGUAGE_THRESHOLD)
+        threshold = max(1, total * thresholds.primary_language)
         primary_languages = [lang for lang, count in confident_language_counts.items() if count >= threshold]
 
     # Fallback if no confident detections or not enough primary languages
@@ -230,57 +369,499 @@ def contextual_detect(
         most_common_lang = max(language_counts.items(), key=lambda x: x[1])[0]
         primary_languages = [most_common_lang]
 
-    # Step 4: Process sentences with context awareness
-    final_languages: list[Language] = []
+    return primary_languages
+
+
+@dataclass(frozen=True)
+class DocumentStatistics:
+    """Step 2 statistics of a document, or of a shard of one, that can be merged and serialized.
+
+    Counts are kept in order of first appearance, which `select_primary_languages` uses to break ties; merging keeps
+    the order of the left operand, then the new languages of the right one. Statistics merged in document order give
+    the same primary languages as the whole document.
+    """
+
+    language_counts: Mapping[Language, int]
+    confident_language_counts: Mapping[Language, int]
+    total: int  # number of detected sentences
+
+    @classmethod
+    def from_results(cls, first_pass_results: Sequence[FirstPassResult]) -> "DocumentStatistics":
+        """Count the languages of first-pass results."""
+        language_counts, confident_language_counts = count_languages(first_pass_results)
+        return cls(language_counts, confident_language_counts, len(first_pass_results))
+
+    def merge(self, other: "DocumentStatistics") -> "DocumentStatistics":
+        """Return the statistics of this document followed by `other`."""
+
+        def add(a: Mapping[Language, int], b: Mapping[Language, int]) -> dict[Language, int]:
+            counts = dict(a)
+            for lang, count in b.items():
+                counts[lang] = counts.get(lang, 0) + count
+            return counts
+
+        return DocumentStatistics(
+            add(self.language_counts, other.language_counts),
+            add(self.confident_language_counts, other.confident_language_counts),
+            self.total + other.total,
+        )
+
+    def __add__(self, other: "DocumentStatistics") -> "DocumentStatistics":
+        return self.merge(other)
+
+    def primary_languages(
+        self, languages: Sequence[Language] | None = None, thresholds: Thresholds | None = None
+    ) -> list[Language]:
+        """Step 3: Find the primary languages from these statistics."""
+        return select_primary_languages(
+            self.language_counts,
+            self.confident_language_counts,
+            self.total,
+            languages,
+            thresholds if thresholds is not None else Thresholds.from_module(),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "language_counts": dict(self.language_counts),
+            "confident_language_counts": dict(self.confident_language_counts),
+            "total": self.total,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "DocumentStatistics":
+        """Inverse of `to_dict`."""
+        return cls(
+            {str(lang): int(count) for lang, count in data["language_counts"].items()},
+            {str(lang): int(count) for lang, count in data["confident_language_counts"].items()},
+            int(data["total"]),
+        )
+
+
+def find_primary_languages(
+    first_pass_results: Sequence[FirstPassResult],
+    languages: Sequence[Language] | None,
+    thresholds: Thresholds,
+) -> list[Language]:
+    """Steps 2 and 3: Compute document-level language statistics and find the primary languages."""
+    language_counts, confident_language_counts = count_languages(first_pass_results)
+    return select_primary_languages(
+        language_counts, confident_language_counts, len(first_pass_results), languages, thresholds
+    )
+
 
-    for sentence, detection, probs in first_pass_results:
-        detected_lang = detection.language
-
-        # If detection is ambiguous, try to resolve with context
-        if detection.is_ambiguous and primary_languages:
-            # Special case handling for common misdetections
-
-            # Case 1: Wu Chinese (wuu) is often misdetected as Chinese sentences
-            if detected_lang == "wuu" and "zh" in primary_languages:
-                detected_lang = "zh"
-
-            # Case 2: Some Chinese sentences are misdetected as Japanese without kana
-            elif detected_lang == "ja" and "zh" in primary_languages:
-                # Check if the text contains Japanese kana characters
-                has_kana = any(
-                    0x3040 <= ord(char) <= 0x30FF
-                    for char in sentence  # Hiragana & Katakana ranges
-                )
-                if not has_kana:
-                    detected_lang = "zh"
-
-            # If not handled by special cases, use standard probability-based approach
-            else:
-                # Find the primary language with highest probability
-                best_lang: str | None = None
-                best_score = 0.0
-
-                for lang in primary_languages:
-                    lang_str = str(lang)  # Language is already str, but keep for clarity
-                    score = probs.get(lang_str, 0.0)
-                    if score > best_score:
-                        best_score = score
-                        best_lang = lang
-
-                # If we found a match with reasonable probability, use it
-                if best_lang is not None and best_score > MIN_ALTERNATIVE_PROBABILITY:
-                    detected_lang = best_lang
-
-        final_languages.append(detected_lang)
+def resolve_language(
+    sentence: str,
+    detection: DetectionResult,
+    probs: LangProbabilities,
+    primary_languages: Sequence[Language],
+    thresholds: Thresholds,
+    rules: RuleTable | None = None,
+) -> Language:
+    """Step 4: Resolve the language of a single sentence using the document's primary languages.
+
+    Commonly confused languages are resolved by the first matching rule of `rules` (default: `default_rules()`);
+    other ambiguous sentences take the primary language that the model rates most likely.
+    """
+    detected_lang = detection.language
+
+    # Only ambiguous detections are resolved with context
+    if not detection.is_ambiguous or not primary_languages:
+        return detected_lang
+
+    # Special case handling for common misdetections
+    rule = (rules if rules is not None else default_rules()).lookup(detected_lang, frozenset(primary_languages))
+    if rule is not None:
+        if rule.keep is not None and rule.keep(sentence):
+            return detected_lang
+        _record_correction(rule.name)
+        return rule.target
+
+    # If not handled by special cases, use standard probability-based approach
+    # Find the primary language with highest probability
+    best_lang: str | None = None
+    best_score = 0.0
+
+    for lang in primary_languages:
+        score = probs.get(lang, 0.0)
+        if score > best_score:
+            best_score = score
+            best_lang = lang
+
+    # If we found a match with reasonable probability, use it
+    if best_lang is not None and best_score > thresholds.min_alternative_probability:
+        if best_lang != detected_lang:
+            _record_correction("primary_language")
+        return best_lang
+
+    return detected_lang
+
+
+def _record_correction(rule: str) -> None:
+    registry = metrics.get_registry()
+    if registry is not None:
+        registry.inc("corrections_total", rule=rule)
+
+
+def resolve_languages_in_windows(
+    first_pass_results: Sequence[FirstPassResult],
+    window: int,
+    languages: Sequence[Language] | None,
+    thresholds: Thresholds,
+    rules: RuleTable | None = None,
+) -> list[Language]:
+    """Steps 2-4 with a local context: resolve each sentence using the primary languages of its neighborhood.
+
+    The neighborhood of a sentence is the `window` detected sentences on each side of it, plus the sentence itself.
+    Language counts are maintained as sliding counters, so moving the window costs O(1) per sentence and a full
+    pass is O(n) for any window size. Ties between equally frequent languages are broken by order of entry into the
+    window.
+    """
+    if window < 0:
+        raise ValueError("window must be non-negative")
+
+    language_counts: dict[Language, int] = {}
+    confident_language_counts: dict[Language, int] = {}
+
+    def add(counts: dict[Language, int], lang: Language) -> None:
+        counts[lang] = counts.get(lang, 0) + 1
+
+    def remove(counts: dict[Language, int], lang: Language) -> None:
+        counts[lang] -= 1
+        if not counts[lang]:
+            del counts[lang]
+
+    final_languages: list[Language] = []
+    start = end = 0  # the window is first_pass_results[start:end]
+    for i, result in enumerate(first_pass_results):
+        while end < min(len(first_pass_results), i + window + 1):
+            entering = first_pass_results[end].detection
+            add(language_counts, entering.language)
+            if not entering.is_ambiguous:
+                add(confident_language_counts, entering.language)
+            end += 1
+        while start < i - window:
+            leaving = first_pass_results[start].detection
+            remove(language_counts, leaving.language)
+            if not leaving.is_ambiguous:
+                remove(confident_language_counts, leaving.language)
+            start += 1
+
+        if not result.detection.is_ambiguous:
+            final_languages.append(result.detection.language)
+            continue
+        primary_languages = select_primary_languages(
+            language_counts, confident_language_counts, end - start, languages, thresholds
+        )
+        final_languages.append(
+            resolve_language(
+                result.sentence, result.detection, result.probabilities, primary_languages, thresholds, rules
+            )
+        )
 
     return final_languages
 
 
+def assign_short_inputs(
+    short_inputs: ShortInputPolicy,
+    short: Sequence[int],
+    first_pass_results: Sequence[FirstPassResult],
+    resolved: Sequence[Language],
+    unknown: Sequence[int] = (),
+) -> list[Language]:
+    """Merge the resolved languages of the detected sentences with those the policy assigns to the short ones.
+
+    Sentences at the `unknown` indices were not reached before a deadline, and are labeled `UNKNOWN_LANGUAGE`.
+    """
+    detected = {result.index: language for result, language in zip(first_pass_results, resolved)}
+    assigned = {**detected, **short_inputs.assign(short, detected), **dict.fromkeys(unknown, UNKNOWN_LANGUAGE)}
+    return [assigned[index] for index in sorted(assigned)]
+
+
+def resolve_first_pass(
+    first_pass_results: Sequence[FirstPassResult],
+    languages: Sequence[Language] | None,
+    context_correction: bool,
+    thresholds: Thresholds,
+    window: int | None = None,
+    rules: RuleTable | None = None,
+) -> list[Language]:
+    """Steps 2-4: Resolve the language of each first-pass result with document (or `window`) context."""
+    # If context correction is disabled, just return raw results from fast-langdetect
+    if not context_correction:
+        return [result.detection.language for result in first_pass_results]
+
+    # Local context: the primary languages of each sentence's neighborhood
+    if window is not None:
+        return resolve_languages_in_windows(first_pass_results, window, languages, thresholds, rules)
+
+    # Large documents: the same steps over arrays, if NumPy is available
+    if len(first_pass_results) >= VECTORIZED_MIN_SENTENCES:
+        try:
+            from contextual_langdetect.vectorized import resolve_document
+        except ImportError:
+            pass
+        else:
+            return resolve_document(first_pass_results, languages, thresholds, rules)
+
+    # Steps 2 and 3: Find the document's primary languages
+    primary_languages = find_primary_languages(first_pass_results, languages, thresholds)
+
+    # Step 4: Process sentences with context awareness
+    return [
+        resolve_language(result.sentence, result.detection, result.probabilities, primary_languages, thresholds, rules)
+        for result in first_pass_results
+    ]
+
+
+def run_contextual_detection(
+    sentences: Sequence[str],
+    infer: InferenceFunction,
+    languages: Sequence[Language] | None,
+    context_correction: bool,
+    thresholds: Thresholds,
+    window: int | None = None,
+    short_inputs: ShortInputPolicy | None = None,
+    rules: RuleTable | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: CancellationToken | None = None,
+) -> list[Language]:
+    """Run the full context-aware pipeline with the given inference functions, thresholds and correction rules.
+
+    If `cancel` is set during the first pass, only the sentences processed so far are resolved, with each other's
+    context; `cancel.processed` records how many.
+    """
+    # When only one language is specified and it's the only possible result
+    only = single_language(languages)
+    if only is not None:
+        if cancel is not None:
+            cancel.processed = len(sentences)
+        return [only for _ in sentences]
+
+    # Step 1: First Pass - Analyze each sentence independently, except short ones that take their language from context
+    short = short_inputs.inherited(sentences) if short_inputs is not None else []
+    if short:
+        skipped = set(short)
+        detect_indices = [index for index in range(len(sentences)) if index not in skipped]
+        results, done = first_pass_with_progress(
+            [sentences[index] for index in detect_indices], infer, languages, thresholds, progress, cancel
+        )
+        first_pass_results = [replace(result, index=detect_indices[result.index]) for result in results]
+        # Short sentences inherit from the detected ones, so a cancelled call keeps those up to the next undetected one
+        processed = len(sentences) if done == len(detect_indices) else detect_indices[done] if done else 0
+        short = [index for index in short if index < processed]
+    else:
+        first_pass_results, processed = first_pass_with_progress(
+            sentences, infer, languages, thresholds, progress, cancel
+        )
+    if cancel is not None:
+        cancel.processed = processed
+
+    resolved = resolve_first_pass(first_pass_results, languages, context_correction, thresholds, window, rules)
+    if short_inputs is not None and short:
+        return assign_short_inputs(short_inputs, short, first_pass_results, resolved)
+    return resolved
+
+
+def run_detection_with_deadline(
+    sentences: Sequence[str],
+    languages: Sequence[Language] | None,
+    model: ModelSize,
+    context_correction: bool,
+    backend: Backend | None,
+    thresholds: Thresholds,
+    deadline: Deadline,
+    window: int | None = None,
+    short_inputs: ShortInputPolicy | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: CancellationToken | None = None,
+    normalized: bool = False,
+) -> list[Language]:
+    """Run the context-aware pipeline within `deadline`, degrading as described by `Degradation`.
+
+    If `normalized`, the sentences have been normalized already, and the default backends are used with
+    fast-langdetect's own normalization turned off.
+    """
+    only = single_language(languages)
+    if only is not None:
+        if cancel is not None:
+            cancel.processed = len(sentences)
+        return [only for _ in sentences]
+
+    short = short_inputs.inherited(sentences) if short_inputs is not None else []
+    skipped = set(short)
+    detect_indices = [index for index in range(len(sentences)) if index not in skipped]
+    inferences: dict[tuple[ModelSize, bool], InferenceFunction] = {}
+
+    def infer(sentence: str, level: Degradation) -> tuple[DetectionResult, LangProbabilities]:
+        # A caller-supplied backend has a single model, so SMALL_MODEL only changes the default backend
+        key = (ModelSize.SMALL if level >= Degradation.SMALL_MODEL else model, level < Degradation.NO_DISTRIBUTION)
+        inference = inferences.get(key)
+        if inference is None:
+            level_model, distribution = key
+            level_backend = backend
+            if level_backend is None and normalized:
+                level_backend = default_backend(level_model, normalize_input=False)
+            inference = inferences[key] = make_inference(
+                level_model, level_backend, languages, distribution=distribution
+            )
+        return inference(sentence)
+
+    # Step 1: First pass, one sentence at a time so the level can change between sentences
+    first_pass_results: list[FirstPassResult] = []
+    unknown: list[int] = []  # indices of the sentences not reached in time
+    processed = len(sentences)
+    reporter = ProgressReporter(len(detect_indices), progress)
+    for done, index in enumerate(detect_indices):
+        if cancel is not None and cancel.cancelled:
+            processed = index if done else 0
+            short = [short_index for short_index in short if short_index < processed]
+            break
+        level = deadline.step(done, len(detect_indices))
+        if level >= Degradation.UNKNOWN:
+            unknown = list(range(index, len(sentences)))
+            short = [short_index for short_index in short if short_index < index]
+            break
+        first_pass_results.extend(
+            first_pass([sentences[index]], lambda text: infer(text, level), languages, thresholds, index)
+        )
+        if (done + 1) % PROGRESS_INTERVAL == 0:
+            reporter.report(done + 1)
+    else:
+        if not detect_indices or len(detect_indices) % PROGRESS_INTERVAL:
+            reporter.report(len(detect_indices))
+    if cancel is not None:
+        cancel.processed = processed
+
+    # Steps 2-4, unless the budget is spent
+    if context_correction and deadline.expired:
+        deadline.degrade(Degradation.NO_CORRECTION)
+    correct = context_correction and deadline.degradation < Degradation.NO_CORRECTION
+    resolved = resolve_first_pass(first_pass_results, languages, correct, thresholds, window)
+    if short_inputs is not None and short:
+        return assign_short_inputs(short_inputs, short, first_pass_results, resolved, unknown)
+    return resolved + [UNKNOWN_LANGUAGE] * len(unknown)
+
+
+def contextual_detect(
+    sentences: Sequence[str],
+    languages: Sequence[Language] | None = None,
+    model: ModelSize = ModelSize.SMALL,
+    context_correction: bool = True,
+    backend: Backend | None = None,
+    window: int | None = None,
+    deadline: Deadline | None = None,
+    short_inputs: ShortInputPolicy | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: CancellationToken | None = None,
+    normalizer: TextNormalizer | None = None,
+) -> list[Language]:
+    """Process a document, detecting the language of each sentence with context awareness.
+
+    Args:
+        sentences: The sentences to process.
+        languages: Optional sequence of expected languages to bias detection towards.
+                  If provided, ambiguous detections will be biased towards these languages.
+        model: Size of model to use (small uses less memory, large may be more accurate).
+        context_correction: Whether to apply context correction; if False, returns raw fast-langdetect results.
+        backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+        window: If given, correct each sentence using the primary languages of the `window` sentences on each side of
+            it, instead of those of the whole document. Useful for long code-switched documents.
+        deadline: If given, a time budget to stay within, degrading the analysis as it runs low. The level applied is
+            recorded in `deadline.degradation`; sentences not reached in time are labeled "unknown".
+        short_inputs: If given, sentences that the policy considers too short to detect are assigned a language from
+            their context instead of the model; `short_inputs.inherited(sentences)` lists them.
+        progress: If given, called with a `Progress` (sentences inferred, total and throughput) every
+            `PROGRESS_INTERVAL` sentences and when inference finishes.
+        cancel: If given, a token that stops the call early once cancelled. Only the sentences processed by then are
+            returned, corrected with each other's context; `cancel.processed` records how many.
+        normalizer: If given, each sentence is normalized with it, once and in bulk, before inference, and the
+            normalized text is what is inferred, deduplicated and memoized. The default backend is then used with
+            fast-langdetect's own normalization turned off.
+
+    Returns:
+        List of detected language codes for each sentence.
+
+    Raises:
+        LanguageDetectionError: If language detection fails or is ambiguous and cannot be resolved.
+    """
+    with metrics.track_call("contextual_detect", len(sentences)):
+        thresholds = Thresholds.from_module()
+        inference_backend = backend
+        if normalizer is not None:
+            sentences = normalizer.normalize_batch(sentences)
+            if backend is None:
+                inference_backend = default_backend(model, normalize_input=False)
+        document_memo = memo.get_document_memo()
+        key: Hashable = None
+        if document_memo is not None:
+            key = (
+                memo.document_digest(sentences),
+                tuple(languages) if languages else None,
+                model,
+                context_correction,
+                inference_backend if inference_backend is not None else default_backend(model),
+                window,
+                short_inputs,
+                thresholds,
+                default_rules(),
+                normalizer,
+            )
+            cached = document_memo.get(key)
+            if cached is not None:
+                if cancel is not None:
+                    cancel.processed = len(sentences)
+                return cached
+
+        if deadline is not None:
+            result = run_detection_with_deadline(
+                sentences,
+                languages,
+                model,
+                context_correction,
+                backend,
+                thresholds,
+                deadline,
+                window,
+                short_inputs,
+                progress,
+                cancel,
+                normalized=normalizer is not None,
+            )
+        else:
+            infer = make_inference(model, inference_backend, languages)
+            result = run_contextual_detection(
+                sentences,
+                infer=deduplicated(infer) if normalizer is not None else infer,
+                languages=languages,
+                context_correction=context_correction,
+                thresholds=thresholds,
+                window=window,
+                short_inputs=short_inputs,
+                progress=progress,
+                cancel=cancel,
+            )
+
+        # Results degraded to meet a deadline, or cut short by cancellation, are not remembered
+        complete = cancel is None or cancel.processed == len(sentences)
+        if document_memo is not None and complete and (deadline is None or deadline.degradation == Degradation.NONE):
+            document_memo.put(key, result)
+        return result
+
+
 def count_by_language(
     sentences: Sequence[str],
     languages: Sequence[Language] | None = None,
     model: ModelSize = ModelSize.SMALL,
     context_correction: bool = True,
+    backend: Backend | None = None,
+    window: int | None = None,
+    deadline: Deadline | None = None,
+    short_inputs: ShortInputPolicy | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: CancellationToken | None = None,
+    normalizer: TextNormalizer | None = None,
 ) -> Counter[Language]:
     """
     Given a batch of sentences, return a Counter mapping language codes to the number of sentences assigned to each
@@ -291,16 +872,38 @@ def count_by_language(
         languages: Optional sequence of expected languages to bias detection towards.
         model: Size of model to use (small uses less memory, large may be more accurate).
         context_correction: Whether to apply context correction; if False, returns raw fast-langdetect results.
+        backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+        window: If given, correct each sentence using the primary languages of the `window` sentences on each side of
+            it, instead of those of the whole document. Useful for long code-switched documents.
+        deadline: If given, a time budget to stay within, degrading the analysis as it runs low. The level applied is
+            recorded in `deadline.degradation`; sentences not reached in time are labeled "unknown".
+        short_inputs: If given, sentences that the policy considers too short to detect are assigned a language from
+            their context instead of the model; `short_inputs.inherited(sentences)` lists them.
+        progress: If given, called with a `Progress` (sentences inferred, total and throughput) every
+            `PROGRESS_INTERVAL` sentences and when inference finishes.
+        cancel: If given, a token that stops the call early once cancelled. Only the sentences processed by then are
+            returned, corrected with each other's context; `cancel.processed` records how many.
+        normalizer: If given, each sentence is normalized with it, once and in bulk, before inference, and the
+            normalized text is what is inferred, deduplicated and memoized. The default backend is then used with
+            fast-langdetect's own normalization turned off.
 
     Returns:
         Counter mapping language codes to sentence counts.
     """
-    detected = contextual_detect(
-        sentences,
-        languages=languages,
-        model=model,
-        context_correction=context_correction,
-    )
+    with metrics.track_call("count_by_language", len(sentences)):
+        detected = contextual_detect(
+            sentences,
+            languages=languages,
+            model=model,
+            context_correction=context_correction,
+            backend=backend,
+            window=window,
+            deadline=deadline,
+            short_inputs=short_inputs,
+            progress=progress,
+            cancel=cancel,
+            normalizer=normalizer,
+        )
     return Counter(detected)
 
 
@@ -309,6 +912,13 @@ def get_languages_by_count(
     languages: Sequence[Language] | None = None,
     model: ModelSize = ModelSize.SMALL,
     context_correction: bool = True,
+    backend: Backend | None = None,
+    window: int | None = None,
+    deadline: Deadline | None = None,
+    short_inputs: ShortInputPolicy | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: CancellationToken | None = None,
+    normalizer: TextNormalizer | None = None,
 ) -> list[tuple[Language, int]]:
     """
     Given a batch of sentences, return a list of (language, count) tuples sorted by decreasing count,
@@ -319,11 +929,38 @@ def get_languages_by_count(
         languages: Optional sequence of expected languages to bias detection towards.
         model: Size of model to use (small uses less memory, large may be more accurate).
         context_correction: Whether to apply context correction; if False, returns raw fast-langdetect results.
+        backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+        window: If given, correct each sentence using the primary languages of the `window` sentences on each side of
+            it, instead of those of the whole document. Useful for long code-switched documents.
+        deadline: If given, a time budget to stay within, degrading the analysis as it runs low. The level applied is
+            recorded in `deadline.degradation`; sentences not reached in time are labeled "unknown".
+        short_inputs: If given, sentences that the policy considers too short to detect are assigned a language from
+            their context instead of the model; `short_inputs.inherited(sentences)` lists them.
+        progress: If given, called with a `Progress` (sentences inferred, total and throughput) every
+            `PROGRESS_INTERVAL` sentences and when inference finishes.
+        cancel: If given, a token that stops the call early once cancelled. Only the sentences processed by then are
+            returned, corrected with each other's context; `cancel.processed` records how many.
+        normalizer: If given, each sentence is normalized with it, once and in bulk, before inference, and the
+            normalized text is what is inferred, deduplicated and memoized. The default backend is then used with
+            fast-langdetect's own normalization turned off.
 
     Returns:
         List of (language, count) tuples sorted by decreasing count.
     """
-    counts = count_by_language(sentences, languages=languages, model=model, context_correction=context_correction)
+    with metrics.track_call("get_languages_by_count", len(sentences)):
+        counts = count_by_language(
+            sentences,
+            languages=languages,
+            model=model,
+            context_correction=context_correction,
+            backend=backend,
+            window=window,
+            deadline=deadline,
+            short_inputs=short_inputs,
+            progress=progress,
+            cancel=cancel,
+            normalizer=normalizer,
+        )
     return sorted(counts.items(), key=lambda x: x[1], reverse=True)
 
 
@@ -332,6 +969,13 @@ def get_majority_language(
     languages: Sequence[Language] | None = None,
     model: ModelSize = ModelSize.SMALL,
     context_correction: bool = True,
+    backend: Backend | None = None,
+    window: int | None = None,
+    deadline: Deadline | None = None,
+    short_inputs: ShortInputPolicy | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: CancellationToken | None = None,
+    normalizer: TextNormalizer | None = None,
 ) -> Language | None:
     """
     Given a batch of sentences, return the language code with the highest count
@@ -342,11 +986,38 @@ def get_majority_language(
         languages: Optional sequence of expected languages to bias detection towards.
         model: Size of model to use (small uses less memory, large may be more accurate).
         context_correction: Whether to apply context correction; if False, returns raw fast-langdetect results.
+        backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+        window: If given, correct each sentence using the primary languages of the `window` sentences on each side of
+            it, instead of those of the whole document. Useful for long code-switched documents.
+        deadline: If given, a time budget to stay within, degrading the analysis as it runs low. The level applied is
+            recorded in `deadline.degradation`; sentences not reached in time are labeled "unknown".
+        short_inputs: If given, sentences that the policy considers too short to detect are assigned a language from
+            their context instead of the model; `short_inputs.inherited(sentences)` lists them.
+        progress: If given, called with a `Progress` (sentences inferred, total and throughput) every
+            `PROGRESS_INTERVAL` sentences and when inference finishes.
+        cancel: If given, a token that stops the call early once cancelled. Only the sentences processed by then are
+            returned, corrected with each other's context; `cancel.processed` records how many.
+        normalizer: If given, each sentence is normalized with it, once and in bulk, before inference, and the
+            normalized text is what is inferred, deduplicated and memoized. The default backend is then used with
+            fast-langdetect's own normalization turned off.
 
     Returns:
         The majority language code, or None if there are no sentences.
     """
-    counts = count_by_language(sentences, languages=languages, model=model, context_correction=context_correction)
+    with metrics.track_call("get_majority_language", len(sentences)):
+        counts = count_by_language(
+            sentences,
+            languages=languages,
+            model=model,
+            context_correction=context_correction,
+            backend=backend,
+            window=window,
+            deadline=deadline,
+            short_inputs=short_inputs,
+            progress=progress,
+            cancel=cancel,
+            normalizer=normalizer,
+        )
     if not counts:
         return None
     return max(counts.items(), key=lambda x: x[1])[0]
@@ -0,0 +1,314 @@
+"""Reusable detector object with precompiled configuration."""
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Executor
+from dataclasses import dataclass, replace
+
+from contextual_langdetect import metrics
+from contextual_langdetect.backends import Backend, default_backend
+from contextual_langdetect.detection import (
+    DetectionResult,
+    LangProbabilities,
+    Language,
+    ModelSize,
+    Thresholds,
+    deduplicated,
+    make_inference,
+    run_contextual_detection,
+)
+from contextual_langdetect.exceptions import LanguageDetectionError
+from contextual_langdetect.normalize import TextNormalizer
+from contextual_langdetect.parallel import map_documents
+from contextual_langdetect.progress import CancellationToken, ProgressCallback
+from contextual_langdetect.rules import RuleTable, default_rules
+from contextual_langdetect.short_inputs import ShortInputPolicy
+
+
+@dataclass(frozen=True)
+class DetectorStats:
+    """Snapshot of a detector's instrumentation counters."""
+
+    calls: int = 0
+    sentences: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    inference_seconds: float = 0.0
+
+
+# Cache key: sentence text, and whether its distribution is restricted to the expected languages
+_CacheKey = tuple[str, bool]
+
+
+class _LRUCache:
+    """A small thread-safe LRU cache mapping sentence text to first-pass inference results."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._data: OrderedDict[_CacheKey, tuple[DetectionResult, LangProbabilities]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: _CacheKey) -> tuple[DetectionResult, LangProbabilities] | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: _CacheKey, value: tuple[DetectionResult, LangProbabilities]) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class Detector:
+    """A language detector that is configured once and reused across calls.
+
+    The module-level functions re-read their configuration on every call. A `Detector` resolves the model size,
+    expected languages and thresholds when it is constructed, and can optionally cache per-sentence inference results
+    and collect instrumentation counters. Instances are thread-safe, so a long-lived service can share one warm
+    instance between threads.
+
+    Example:
+        >>> detector = Detector(languages=["zh", "en"], cache_size=10_000)
+        >>> detector.contextual_detect(["你好。", "How are you?"])
+        ['zh', 'en']
+    """
+
+    def __init__(
+        self,
+        model: ModelSize = ModelSize.SMALL,
+        languages: Sequence[Language] | None = None,
+        *,
+        thresholds: Thresholds | None = None,
+        backend: Backend | None = None,
+        window: int | None = None,
+        short_inputs: ShortInputPolicy | None = None,
+        rules: RuleTable | None = None,
+        normalizer: TextNormalizer | None = None,
+        cache_size: int = 0,
+        collect_stats: bool = False,
+    ) -> None:
+        """Create a detector.
+
+        Args:
+            model: Size of model to use (small uses less memory, large may be more accurate).
+            languages: Optional sequence of expected languages to bias detection towards.
+            thresholds: Tuning parameters; defaults to the current values of the module-level constants.
+            backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+            window: If given, correct each sentence using the primary languages of the `window` sentences on each
+                side of it, instead of those of the whole document.
+            short_inputs: If given, sentences that the policy considers too short to detect are assigned a language
+                from their context instead of the model.
+            rules: Correction rules for commonly confused languages; defaults to the current `default_rules()`.
+            normalizer: If given, text is normalized with it before inference, and the normalized text is the cache
+                key; the default backend is then used with fast-langdetect's own normalization turned off.
+            cache_size: Maximum number of sentences whose inference results are cached; 0 disables the cache.
+            collect_stats: Whether to record call, sentence, cache and inference-time counters.
+        """
+        if cache_size < 0:
+            raise ValueError("cache_size must be non-negative")
+        if window is not None and window < 0:
+            raise ValueError("window must be non-negative")
+        self.model = model
+        self.languages: tuple[Language, ...] = tuple(dict.fromkeys(languages or ()))
+        self.thresholds = thresholds if thresholds is not None else Thresholds.from_module()
+        if backend is None:
+            backend = default_backend(model) if normalizer is None else default_backend(model, normalize_input=False)
+        self.backend: Backend = backend
+        self._inference = make_inference(model, backend, thresholds=self.thresholds)
+        self._restricted_inference = make_inference(model, backend, self.languages, thresholds=self.thresholds)
+        self.window = window
+        self.short_inputs = short_inputs
+        self.rules = rules if rules is not None else default_rules()
+        self.normalizer = normalizer
+        self._cache = _LRUCache(cache_size) if cache_size else None
+        self._collect_stats = collect_stats
+        self._stats = DetectorStats()
+        self._stats_lock = threading.Lock()
+        self._warm = False
+        self._warm_lock = threading.Lock()
+
+    @property
+    def stats(self) -> DetectorStats:
+        """A snapshot of the instrumentation counters (all zero unless `collect_stats` was set)."""
+        with self._stats_lock:
+            return self._stats
+
+    def clear_cache(self) -> None:
+        """Discard all cached inference results."""
+        if self._cache is not None:
+            self._cache.clear()
+
+    def warm_up(self) -> None:
+        """Load the model now rather than on first use.
+
+        fast-langdetect loads models lazily and without locking; loading once under a lock keeps concurrent first
+        calls from each loading their own copy. Backends that fail the warm-up prediction are left to fail on use.
+        """
+        if self._warm:
+            return
+        with self._warm_lock:
+            if not self._warm:
+                try:
+                    self.backend.predict("warm up")
+                except LanguageDetectionError:
+                    pass
+                self._warm = True
+
+    def detect(self, text: str) -> DetectionResult:
+        """Detect the language of the given text.
+
+        Raises:
+            ValueError: If the text is empty or invalid.
+        """
+        with metrics.track_call("Detector.detect", 1):
+            detection, _ = self._infer(self._normalize(text))
+        self._record(calls=1, sentences=1)
+        # A copy, since the cached result is shared with later calls
+        return replace(detection)
+
+    def probabilities(self, text: str) -> LangProbabilities:
+        """Get the probability distribution for languages in the text.
+
+        Raises:
+            ValueError: If the text is empty or invalid.
+        """
+        with metrics.track_call("Detector.probabilities", 1):
+            _, probs = self._infer(self._normalize(text))
+        self._record(calls=1, sentences=1)
+        return dict(probs)
+
+    def contextual_detect(
+        self,
+        sentences: Sequence[str],
+        context_correction: bool = True,
+        *,
+        progress: ProgressCallback | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> list[Language]:
+        """Detect the language of each sentence with context awareness.
+
+        See `contextual_langdetect.contextual_detect` for the algorithm, and for `progress` and `cancel`. With a
+        normalizer, the sentences are normalized together before inference, and repeated ones are inferred once.
+        """
+        self._record(calls=1, sentences=len(sentences))
+        with metrics.track_call("Detector.contextual_detect", len(sentences)):
+            infer = self._infer_in_context
+            if self.normalizer is not None:
+                sentences = self.normalizer.normalize_batch(sentences)
+                infer = deduplicated(infer)
+            return run_contextual_detection(
+                sentences,
+                infer=infer,
+                languages=self.languages,
+                context_correction=context_correction,
+                thresholds=self.thresholds,
+                window=self.window,
+                short_inputs=self.short_inputs,
+                rules=self.rules,
+                progress=progress,
+                cancel=cancel,
+            )
+
+    def contextual_detect_many(
+        self,
+        documents: Iterable[Sequence[str]],
+        context_correction: bool = True,
+        *,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> list[list[Language]]:
+        """Run `contextual_detect` on each document concurrently, on a thread pool that shares this detector.
+
+        See `contextual_langdetect.parallel.contextual_detect_many`.
+        """
+        self.warm_up()
+        return map_documents(
+            lambda sentences: self.contextual_detect(sentences, context_correction=context_correction),
+            documents,
+            max_workers=max_workers,
+            executor=executor,
+        )
+
+    def count_by_language(self, sentences: Sequence[str], context_correction: bool = True) -> Counter[Language]:
+        """Return a Counter mapping language codes to the number of sentences assigned to each language."""
+        return Counter(self.contextual_detect(sentences, context_correction=context_correction))
+
+    def get_languages_by_count(
+        self, sentences: Sequence[str], context_correction: bool = True
+    ) -> list[tuple[Language, int]]:
+        """Return (language, count) tuples sorted by decreasing count."""
+        counts = self.count_by_language(sentences, context_correction=context_correction)
+        return sorted(counts.items(), key=lambda x: x[1], reverse=True)
+
+    def get_majority_language(self, sentences: Sequence[str], context_correction: bool = True) -> Language | None:
+        """Return the language code with the highest count, or None if there are no sentences."""
+        counts = self.count_by_language(sentences, context_correction=context_correction)
+        if not counts:
+            return None
+        return max(counts.items(), key=lambda x: x[1])[0]
+
+    def _normalize(self, text: str) -> str:
+        return self.normalizer.normalize(text) if self.normalizer is not None else text
+
+    def _infer_in_context(self, text: str) -> tuple[DetectionResult, LangProbabilities]:
+        """Like `_infer`, but with the distribution restricted to the expected languages, if any."""
+        return self._infer(text, restricted=bool(self.languages))
+
+    def _infer(self, text: str, restricted: bool = False) -> tuple[DetectionResult, LangProbabilities]:
+        """Return the detection and probability distribution for a sentence, consulting the cache first."""
+        if not text or not text.strip():
+            raise ValueError("Empty or whitespace-only text provided")
+
+        registry = metrics.get_registry()
+        if self._cache is not None:
+            cached = self._cache.get((text, restricted))
+            if registry is not None:
+                registry.inc("cache_requests_total", cache="detector", result="miss" if cached is None else "hit")
+            if cached is not None:
+                self._record(cache_hits=1)
+                return cached
+
+        self.warm_up()
+        start = time.perf_counter()
+        value = (self._restricted_inference if restricted else self._inference)(text)
+        elapsed = time.perf_counter() - start
+        if self._cache is not None:
+            self._cache.put((text, restricted), value)
+            self._record(cache_misses=1, inference_seconds=elapsed)
+        else:
+            self._record(inference_seconds=elapsed)
+        return value
+
+    def _record(
+        self,
+        *,
+        calls: int = 0,
+        sentences: int = 0,
+        cache_hits: int = 0,
+        cache_misses: int = 0,
+        inference_seconds: float = 0.0,
+    ) -> None:
+        if not self._collect_stats:
+            return
+        with self._stats_lock:
+            s = self._stats
+            self._stats = DetectorStats(
+                calls=s.calls + calls,
+                sentences=s.sentences + sentences,
+                cache_hits=s.cache_hits + cache_hits,
+                cache_misses=s.cache_misses + cache_misses,
+                inference_seconds=s.inference_seconds + inference_seconds,
+            )
@@ -11,3 +11,9 @@ class LanguageDetectionError(ContextualLangDetectError):
     """Exception raised when language detection fails or is ambiguous."""
 
     pass
+
+
+class ModelVerificationError(ContextualLangDetectError):
+    """Exception raised when a local model file does not match its expected hash."""
+
+    pass
@@ -0,0 +1,108 @@
+"""Optional memo of whole-document results, for services that see the same documents repeatedly.
+
+The memo is disabled by default. Once enabled with `enable_document_memo()`, `contextual_detect` (and so the
+aggregate helpers built on it) returns the stored languages of a document it has already processed with the same
+options, instead of running the pipeline again. Documents are keyed by a 128-bit BLAKE2 digest of their sentences,
+and results are stored as one byte per sentence, so the memo holds no sentence text.
+
+Example:
+    >>> memo = enable_document_memo(maxsize=10_000)
+    >>> get_majority_language(sentences)  # runs the pipeline
+    >>> get_majority_language(sentences)  # returns the stored result
+"""
+
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+
+from contextual_langdetect import metrics
+from contextual_langdetect.types import Language
+
+# Number of documents a memo holds by default
+DEFAULT_MAXSIZE = 1024
+
+
+def document_digest(sentences: Sequence[str]) -> bytes:
+    """Return a 128-bit digest of the sentence sequence; sentence boundaries are part of the digest."""
+    digest = hashlib.blake2b(digest_size=16)
+    for sentence in sentences:
+        data = sentence.encode("utf-8", "surrogatepass")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.digest()
+
+
+class _CompactLanguages:
+    """A list of languages stored as indices into its distinct languages, one byte each where possible."""
+
+    __slots__ = ("vocabulary", "codes")
+
+    def __init__(self, languages: Sequence[Language]) -> None:
+        ids: dict[Language, int] = {}
+        codes = [ids.setdefault(language, len(ids)) for language in languages]
+        self.vocabulary = tuple(ids)
+        self.codes = bytes(codes) if len(ids) <= 256 else array("H", codes)
+
+    def expand(self) -> list[Language]:
+        vocabulary = self.vocabulary
+        return [vocabulary[code] for code in self.codes]
+
+
+class DocumentMemo:
+    """A thread-safe LRU map from document keys to per-sentence languages, holding at most `maxsize` documents."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, _CompactLanguages] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> list[Language] | None:
+        """Return a new list of the languages stored for `key`, or None."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+        registry = metrics.get_registry()
+        if registry is not None:
+            registry.inc("cache_requests_total", cache="document", result="miss" if value is None else "hit")
+        return value.expand() if value is not None else None
+
+    def put(self, key: Hashable, languages: Sequence[Language]) -> None:
+        value = _CompactLanguages(languages)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_memo: DocumentMemo | None = None
+
+
+def enable_document_memo(maxsize: int = DEFAULT_MAXSIZE) -> DocumentMemo:
+    """Start memoizing document results in a new memo of `maxsize` documents, and return it."""
+    global _memo
+    _memo = DocumentMemo(maxsize)
+    return _memo
+
+
+def disable_document_memo() -> None:
+    """Stop memoizing document results, and discard the memo."""
+    global _memo
+    _memo = None
+
+
+def get_document_memo() -> DocumentMemo | None:
+    """Return the active memo, or None if memoization is disabled."""
+    return _memo
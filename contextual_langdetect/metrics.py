@@ -0,0 +1,263 @@
+"""Optional in-process metrics for detection workloads, rendered in the Prometheus text exposition format.
+
+Metrics are disabled by default; instrumented code then only pays for a `None` check. Enable them with
+`enable_metrics()`, and expose `MetricsRegistry.render()` from an existing web application or with `serve_metrics()`.
+
+Example:
+    >>> registry = enable_metrics()
+    >>> contextual_detect(sentences)
+    >>> print(registry.render())
+"""
+
+import bisect
+import threading
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+PREFIX = "contextual_langdetect_"
+
+# Upper bounds, in seconds, of the inference latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.1, 1.0)
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """Name, type and help text of a metric."""
+
+    name: str
+    type: str  # "counter" or "histogram"
+    help: str
+    buckets: tuple[float, ...] = ()
+
+
+METRICS: dict[str, MetricSpec] = {
+    spec.name: spec
+    for spec in [
+        MetricSpec("calls_total", "counter", "Calls per public entry point."),
+        MetricSpec("sentences_total", "counter", "Sentences passed to each public entry point."),
+        MetricSpec(
+            "inference_seconds", "histogram", "Model inference latency per call, by model.", DEFAULT_LATENCY_BUCKETS
+        ),
+        MetricSpec("sentences_detected_total", "counter", "Sentences that passed the first detection pass."),
+        MetricSpec("sentences_ambiguous_total", "counter", "First-pass detections below the confidence threshold."),
+        MetricSpec("sentences_inherited_total", "counter", "Short sentences assigned from context without inference."),
+        MetricSpec("corrections_total", "counter", "Context corrections that changed a language, by rule."),
+        MetricSpec("cache_requests_total", "counter", "Cache lookups, by cache and result (hit or miss)."),
+        MetricSpec(
+            "scheduler_wait_seconds",
+            "histogram",
+            "Time work waited in the scheduler queue, by priority class.",
+            DEFAULT_LATENCY_BUCKETS,
+        ),
+    ]
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class _Histogram:
+    buckets: tuple[float, ...]
+    counts: list[int] = field(default_factory=lambda: [])
+    sum: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _format_labels(labels: Labels, extra: Sequence[tuple[str, str]] = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    escaped = ((key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for key, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """A thread-safe collection of counters and histograms."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], _Histogram] = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, str]) -> tuple[str, Labels]:
+        if name not in METRICS:
+            raise KeyError(f"Unknown metric: {name}")
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Increment a counter."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record an observation in a histogram."""
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(METRICS[name].buckets)
+            histogram.observe(value)
+
+    def value(self, name: str, **labels: str) -> float:
+        """Return the value of a counter, or the number of observations of a histogram."""
+        key = self._key(name, labels)
+        with self._lock:
+            if key in self._histograms:
+                return float(self._histograms[key].count)
+            return self._counters.get(key, 0.0)
+
+    def reset(self) -> None:
+        """Discard all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Render all recorded metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            for spec in METRICS.values():
+                full_name = PREFIX + spec.name
+                if spec.type == "counter":
+                    series = sorted(
+                        (labels, value) for (name, labels), value in self._counters.items() if name == spec.name
+                    )
+                    if not series:
+                        continue
+                    lines.append(f"# HELP {full_name} {spec.help}")
+                    lines.append(f"# TYPE {full_name} counter")
+                    for labels, value in series:
+                        lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+                else:
+                    histograms = sorted(
+                        ((labels, h) for (name, labels), h in self._histograms.items() if name == spec.name),
+                        key=lambda item: item[0],
+                    )
+                    if not histograms:
+                        continue
+                    lines.append(f"# HELP {full_name} {spec.help}")
+                    lines.append(f"# TYPE {full_name} histogram")
+                    for labels, histogram in histograms:
+                        cumulative = 0
+                        for bound, count in zip(histogram.buckets, histogram.counts, strict=True):
+                            cumulative += count
+                            le = _format_labels(labels, [("le", _format_value(bound))])
+                            lines.append(f"{full_name}_bucket{le} {cumulative}")
+                        le = _format_labels(labels, [("le", "+Inf")])
+                        lines.append(f"{full_name}_bucket{le} {histogram.count}")
+                        lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                        lines.append(f"{full_name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+_registry: MetricsRegistry | None = None
+_current_entry_point: ContextVar[str | None] = ContextVar("contextual_langdetect_entry_point", default=None)
+
+
+def enable_metrics(registry: MetricsRegistry | None = None) -> MetricsRegistry:
+    """Start recording metrics into `registry` (a new one if not given), and return it."""
+    global _registry
+    _registry = registry if registry is not None else MetricsRegistry()
+    return _registry
+
+
+def disable_metrics() -> None:
+    """Stop recording metrics."""
+    global _registry
+    _registry = None
+
+
+def get_registry() -> MetricsRegistry | None:
+    """Return the active registry, or None if metrics are disabled."""
+    return _registry
+
+
+def record_call(registry: MetricsRegistry, entry_point: str, sentences: int) -> None:
+    """Count a call to a leaf entry point, unless it was made from inside a tracked call."""
+    if _current_entry_point.get() is None:
+        registry.inc("calls_total", entry_point=entry_point)
+        registry.inc("sentences_total", sentences, entry_point=entry_point)
+
+
+@contextmanager
+def track_call(entry_point: str, sentences: int) -> Generator[None]:
+    """Count a call to a public entry point, and the sentences passed to it.
+
+    Calls made from inside another tracked call (e.g. `count_by_language` calling `contextual_detect`) are attributed
+    only to the outermost entry point.
+    """
+    registry = _registry
+    if registry is None or _current_entry_point.get() is not None:
+        yield
+        return
+    record_call(registry, entry_point, sentences)
+    token = _current_entry_point.set(entry_point)
+    try:
+        yield
+    finally:
+        _current_entry_point.reset(token)
+
+
+@contextmanager
+def attribute_to(entry_point: str) -> Generator[None]:
+    """Attribute the calls made inside the block to `entry_point`, without counting a call to it.
+
+    For work done on another thread on behalf of an entry point that was already counted, e.g. by scheduler workers.
+    """
+    token = _current_entry_point.set(entry_point)
+    try:
+        yield
+    finally:
+        _current_entry_point.reset(token)
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1", registry: MetricsRegistry | None = None) -> "ThreadingHTTPServer":
+    """Serve the active (or given) registry at `http://host:port/metrics` from a daemon thread.
+
+    Returns the server; call `shutdown()` on it to stop serving.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            target = registry if registry is not None else _registry
+            if self.path.split("?")[0] != "/metrics" or target is None:
+                self.send_error(404)
+                return
+            body = target.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
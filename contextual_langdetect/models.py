@@ -0,0 +1,86 @@
+"""Local model files, with hash verification that is recorded so later starts can skip it."""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from contextual_langdetect.exceptions import ModelVerificationError
+
+# Suffix appended to a model's path to name its verification sidecar
+SIDECAR_SUFFIX = ".verified"
+
+_CHUNK_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class LocalModel:
+    """A fastText model file on local disk, optionally with its expected SHA-256 hex digest."""
+
+    path: Path
+    sha256: str | None = None
+
+
+def sidecar_path(path: Path) -> Path:
+    """Return the path of the verification sidecar of the model at `path`."""
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+def file_sha256(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _fingerprint(path: Path) -> dict[str, int]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def verify_model(model: LocalModel) -> bool:
+    """Check a local model against its expected hash, hashing it only if it changed since it was last verified.
+
+    A successful verification is recorded in a JSON sidecar next to the model (`<model>.verified`) with the hash and
+    the file's size and modification time. Later calls that find a matching sidecar return without reading the
+    model. If the sidecar cannot be written (e.g. on a read-only filesystem), the model is simply hashed again next
+    time.
+
+    Returns:
+        True if the file was hashed, False if a matching sidecar made hashing unnecessary or no hash was given.
+
+    Raises:
+        FileNotFoundError: If the model file does not exist.
+        ModelVerificationError: If the file's hash does not match.
+    """
+    path = model.path
+    if not path.is_file():
+        raise FileNotFoundError(f"Model file not found: {path}")
+    if model.sha256 is None:
+        return False
+
+    expected = model.sha256.lower()
+    fingerprint = _fingerprint(path)
+    sidecar = sidecar_path(path)
+    try:
+        recorded = json.loads(sidecar.read_text(encoding="utf-8"))
+        if recorded == {"sha256": expected, **fingerprint}:
+            return False
+    except (OSError, ValueError):
+        pass
+
+    actual = file_sha256(path)
+    if actual != expected:
+        raise ModelVerificationError(f"SHA-256 of {path} is {actual}, expected {expected}")
+
+    try:
+        # Write to a temporary file and rename, so concurrent starts never read a partial sidecar
+        temporary = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+        temporary.write_text(json.dumps({"sha256": expected, **fingerprint}), encoding="utf-8")
+        temporary.replace(sidecar)
+    except OSError:
+        pass
+    return True
@@ -0,0 +1,73 @@
+"""Text normalization applied once per sentence, in bulk, ahead of inference.
+
+`TextNormalizer` cleans sentences before they reach the model: it removes control and zero-width characters,
+collapses runs of whitespace (including newlines) to single spaces, and optionally strips URLs and emoji and
+lowercases. Pass one as `normalizer=` to `contextual_detect`, the aggregate helpers or `Detector`: every sentence is
+normalized once, before the first pass, and the normalized text is what is inferred, cached, deduplicated and
+memoized. The default fast-langdetect backend is then used with fast-langdetect's own per-call normalization turned
+off, since `Lowercase.UPPERCASE` applies the same rule.
+
+Example:
+    >>> normalizer = TextNormalizer(strip_urls=True)
+    >>> normalizer.normalize("  CHECK THIS OUT\\n https://example.com  ")
+    'check this out'
+"""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import Enum
+
+# C0 and C1 controls other than whitespace, and invisible characters that carry no text: zero-width space, word
+# joiner, the byte order mark and the bidirectional embedding controls. Zero-width (non-)joiners are kept, since
+# several scripts need them.
+_CONTROL = re.compile("[\x00-\x08\x0e-\x1f\x7f-\x84\x86-\x9f\u200b\u202a-\u202e\u2066-\u2069\u2060\ufeff]")
+_WHITESPACE = re.compile(r"\s+")
+_URL = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+_EMOJI_CHAR = "[\U0001f000-\U0001faff\u2600-\u27bf\u2b00-\u2bff]"
+_EMOJI = re.compile(f"{_EMOJI_CHAR}[\ufe0f\u20e3]?(?:\u200d{_EMOJI_CHAR}[\ufe0f]?)*")
+_UPPER = re.compile("[A-Z]")
+_LETTER = re.compile("[A-Za-z]")
+
+
+class Lowercase(str, Enum):
+    """When `TextNormalizer` lowercases a sentence."""
+
+    NEVER = "never"
+    UPPERCASE = "uppercase"  # text that is all or mostly (>80% of Latin letters) uppercase, as fast-langdetect does
+    ALWAYS = "always"
+
+
+@dataclass(frozen=True)
+class TextNormalizer:
+    """Cleans sentences before inference. Instances are immutable and can be shared across threads."""
+
+    lowercase: Lowercase = Lowercase.UPPERCASE
+    strip_urls: bool = False
+    strip_emoji: bool = False
+
+    def normalize(self, text: str) -> str:
+        """Return the normalized text; may be empty if the text had nothing else."""
+        if self.strip_urls:
+            text = _URL.sub(" ", text)
+        if self.strip_emoji:
+            text = _EMOJI.sub(" ", text)
+        text = _WHITESPACE.sub(" ", _CONTROL.sub("", text)).strip()
+        if self.lowercase == Lowercase.ALWAYS or (self.lowercase == Lowercase.UPPERCASE and _mostly_uppercase(text)):
+            text = text.lower()
+        return text
+
+    def normalize_batch(self, texts: Iterable[str]) -> list[str]:
+        """Normalize each text, normalizing repeated texts only once."""
+        normalized: dict[str, str] = {}
+        return [
+            normalized[text] if text in normalized else normalized.setdefault(text, self.normalize(text))
+            for text in texts
+        ]
+
+
+def _mostly_uppercase(text: str) -> bool:
+    """fast-langdetect's test for text it lowercases, which it would otherwise tend to detect as Japanese."""
+    if text.isupper():
+        return True
+    return len(text) > 5 and len(_UPPER.findall(text)) > 0.8 * len(_LETTER.findall(text))
@@ -0,0 +1,80 @@
+"""Concurrent detection of many documents on a thread pool that shares one model.
+
+Each document is processed by one thread; all threads share the same backend, so the model is loaded once and
+never copied per thread. How far this scales depends on the interpreter: fastText inference holds the GIL on the
+standard CPython build, so threads mainly help on the free-threaded build (3.13t and later) and when the pipeline
+overlaps with I/O. `benchmarks/thread_scaling.py` measures both.
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TypeVar
+
+from contextual_langdetect.backends import Backend, FastLangDetectBackend, default_backend
+from contextual_langdetect.detection import Language, ModelSize, contextual_detect
+
+T = TypeVar("T")
+
+
+def map_documents(
+    fn: Callable[[Sequence[str]], T],
+    documents: Iterable[Sequence[str]],
+    *,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[T]:
+    """Apply `fn` to each document on `executor`, or on a new thread pool of `max_workers` threads.
+
+    Results are returned in the order of `documents`. The first exception raised by `fn` is re-raised.
+    """
+    if executor is not None:
+        return list(executor.map(fn, documents))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="contextual-langdetect") as pool:
+        return list(pool.map(fn, documents))
+
+
+def contextual_detect_many(
+    documents: Iterable[Sequence[str]],
+    languages: Sequence[Language] | None = None,
+    model: ModelSize = ModelSize.SMALL,
+    context_correction: bool = True,
+    backend: Backend | None = None,
+    window: int | None = None,
+    *,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[list[Language]]:
+    """Run `contextual_detect` on each document concurrently, sharing one model between threads.
+
+    Args:
+        documents: The documents to process, each a sequence of sentences. Context correction is applied within
+            each document.
+        languages: Optional sequence of expected languages to bias detection towards.
+        model: Size of model to use (small uses less memory, large may be more accurate).
+        context_correction: Whether to apply context correction; if False, returns raw fast-langdetect results.
+        backend: Inference backend to use instead of the default fast-langdetect backend for `model`. It must be
+            safe to call from several threads.
+        window: If given, correct each sentence using the primary languages of the `window` sentences on each side of
+            it, instead of those of the whole document.
+        max_workers: Number of threads of the pool created for this call (default: as `ThreadPoolExecutor`).
+        executor: An existing executor to submit to instead of creating a pool; `max_workers` is then ignored.
+
+    Returns:
+        One list of language codes per document, in order, as `contextual_detect` returns them.
+    """
+    shared = backend if backend is not None else default_backend(model)
+    if isinstance(shared, FastLangDetectBackend):
+        # Load the model before the threads start, so they don't each load a copy
+        shared.load()
+
+    def detect(sentences: Sequence[str]) -> list[Language]:
+        return contextual_detect(
+            sentences,
+            languages=languages,
+            model=model,
+            context_correction=context_correction,
+            backend=shared,
+            window=window,
+        )
+
+    return map_documents(detect, documents, max_workers=max_workers, executor=executor)
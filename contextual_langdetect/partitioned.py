@@ -0,0 +1,235 @@
+"""Columnar detection output, partitioned by language so that one language can be read without a full scan.
+
+A `PartitionedWriter` writes rows (document, line, offset, language, confidence, ambiguous) to a directory of Arrow
+IPC files, `part-00000.arrow`, `part-00001.arrow` and so on. Rows are buffered per language, so every record batch
+holds a single language, and each part has a JSON sidecar (`part-00000.arrow.json`) that lists the batches of each
+language. `read_language` memory-maps the parts and reads only the listed batches: extracting "all Japanese sentences"
+is a range read of those batches, not a pass over the whole output.
+
+Parts are closed at checkpoints, which lets `detect_corpus` resume a columnar run: the parts written before the last
+checkpoint are kept and later ones discarded.
+
+This module requires the optional `pyarrow` dependency (`pip install contextual-langdetect[arrow]`).
+
+Example:
+    >>> detect_corpus("corpus.txt", "languages.txt", columnar_path="languages.arrow.d")
+    >>> read_language("languages.arrow.d", "ja").column("line")
+"""
+
+import json
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError as e:  # pragma: no cover - exercised only without the optional dependency
+    raise ImportError(
+        "contextual_langdetect.partitioned requires pyarrow: pip install 'contextual-langdetect[arrow]'"
+    ) from e
+
+from contextual_langdetect.types import Language
+
+# Format version of part sidecars
+INDEX_VERSION = 1
+
+# Rows of one language buffered before they are written as a record batch
+DEFAULT_BATCH_ROWS = 65_536
+
+SCHEMA = pa.schema(
+    [
+        pa.field("document", pa.int64(), nullable=False),  # 0-based document number in the corpus
+        pa.field("line", pa.int64(), nullable=False),  # 1-based line number in the corpus
+        pa.field("offset", pa.int32(), nullable=False),  # 0-based line number within the document
+        pa.field("language", pa.string(), nullable=False),
+        pa.field("confidence", pa.float32()),  # probability of the final language; null if not inferred
+        pa.field("ambiguous", pa.bool_(), nullable=False),  # whether the model's detection was ambiguous
+    ]
+)
+
+
+def part_path(directory: str | os.PathLike[str], part: int) -> Path:
+    return Path(directory) / f"part-{part:05}.arrow"
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".json")
+
+
+def _part_number(path: Path) -> int | None:
+    stem = path.name.removesuffix(".json").removesuffix(".arrow")
+    prefix, _, number = stem.partition("-")
+    return int(number) if prefix == "part" and number.isdigit() else None
+
+
+def remove_parts(directory: str | os.PathLike[str], first: int = 0) -> None:
+    """Delete the parts numbered `first` and later, and their sidecars, e.g. those of an interrupted run."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return
+    for path in directory.iterdir():
+        number = _part_number(path)
+        if number is not None and number >= first:
+            path.unlink()
+
+
+class _Buffer:
+    """Rows of one language that have not been written yet."""
+
+    def __init__(self) -> None:
+        self.document: list[int] = []
+        self.line: list[int] = []
+        self.offset: list[int] = []
+        self.confidence: list[float | None] = []
+        self.ambiguous: list[bool] = []
+
+    def __len__(self) -> int:
+        return len(self.line)
+
+    def to_batch(self, language: Language) -> pa.RecordBatch:
+        return pa.record_batch(  # pyright: ignore[reportUnknownMemberType]
+            [
+                pa.array(self.document, pa.int64()),
+                pa.array(self.line, pa.int64()),
+                pa.array(self.offset, pa.int32()),
+                pa.array([language] * len(self), pa.string()),
+                pa.array(self.confidence, pa.float32()),
+                pa.array(self.ambiguous, pa.bool_()),
+            ],
+            schema=SCHEMA,
+        )
+
+
+class PartitionedWriter:
+    """Writes detection rows to a directory of language-partitioned Arrow IPC parts.
+
+    Not thread-safe. Rows are visible to readers once the part that holds them is closed, by `close_part` or `close`.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike[str], *, first_part: int = 0, batch_rows: int = DEFAULT_BATCH_ROWS
+    ) -> None:
+        if batch_rows < 1:
+            raise ValueError("batch_rows must be positive")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.parts = first_part  # number of parts closed, including those of earlier runs
+        self.batch_rows = batch_rows
+        self._buffers: dict[Language, _Buffer] = {}
+        self._writer: ipc.RecordBatchFileWriter | None = None
+        self._batches: dict[Language, list[int]] = {}
+        self._rows: dict[Language, int] = {}
+        self._batch_count = 0
+
+    def add(
+        self,
+        document: int,
+        line: int,
+        offset: int,
+        language: Language,
+        confidence: float | None,
+        ambiguous: bool,
+    ) -> None:
+        """Add the row of one detected sentence."""
+        buffer = self._buffers.get(language)
+        if buffer is None:
+            buffer = self._buffers[language] = _Buffer()
+        buffer.document.append(document)
+        buffer.line.append(line)
+        buffer.offset.append(offset)
+        buffer.confidence.append(confidence)
+        buffer.ambiguous.append(ambiguous)
+        if len(buffer) >= self.batch_rows:
+            self._write(language)
+
+    def _write(self, language: Language) -> None:
+        buffer = self._buffers.pop(language)
+        if self._writer is None:
+            self._writer = ipc.new_file(str(part_path(self.directory, self.parts)), SCHEMA)
+        self._writer.write_batch(buffer.to_batch(language))  # pyright: ignore[reportUnknownMemberType]
+        self._batches.setdefault(language, []).append(self._batch_count)
+        self._rows[language] = self._rows.get(language, 0) + len(buffer)
+        self._batch_count += 1
+
+    def close_part(self) -> int:
+        """Write the buffered rows and close the current part, if it has any rows; return the number of parts."""
+        for language in sorted(self._buffers):
+            self._write(language)
+        if self._writer is None:
+            return self.parts
+        self._writer.close()
+        part = part_path(self.directory, self.parts)
+        with open(part, "rb") as f:
+            os.fsync(f.fileno())
+        index = {
+            "version": INDEX_VERSION,
+            "rows": sum(self._rows.values()),
+            "languages": {
+                language: {"batches": self._batches[language], "rows": self._rows[language]}
+                for language in sorted(self._batches)
+            },
+        }
+        # The sidecar marks the part as complete, so it is written atomically, after the part is on disk
+        path = _index_path(part)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+            f.flush()
+            os.fsync(f.fileno())
+        temporary.replace(path)
+        self.parts += 1
+        self._writer = None
+        self._batches.clear()
+        self._rows.clear()
+        self._batch_count = 0
+        return self.parts
+
+    def close(self) -> int:
+        """Close the current part; return the number of parts."""
+        return self.close_part()
+
+
+def _indexes(directory: str | os.PathLike[str]) -> list[tuple[Path, dict[str, Any]]]:
+    """The closed parts of a directory and their sidecars, in part order."""
+    indexes: list[tuple[Path, dict[str, Any]]] = []
+    for part in sorted(Path(directory).glob("part-*.arrow")):
+        index_path = _index_path(part)
+        if not index_path.exists():  # a part that was being written when a run stopped
+            continue
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        if index.get("version") != INDEX_VERSION:
+            raise ValueError(f"unsupported index version in {index_path}: {index.get('version')!r}")
+        indexes.append((part, index))
+    return indexes
+
+
+def language_counts(directory: str | os.PathLike[str]) -> dict[Language, int]:
+    """Return the number of rows of each language, from the sidecars alone."""
+    counts: dict[Language, int] = {}
+    for _, index in _indexes(directory):
+        for language, entry in index["languages"].items():
+            counts[language] = counts.get(language, 0) + int(entry["rows"])
+    return counts
+
+
+def read_language(
+    directory: str | os.PathLike[str], language: Language, columns: Sequence[str] | None = None
+) -> pa.Table:
+    """Return the rows of one language, in corpus order, reading only the record batches that hold them.
+
+    Args:
+        directory: A directory written by `PartitionedWriter` (e.g. `detect_corpus(columnar_path=...)`).
+        language: The language to read.
+        columns: If given, the columns to return; defaults to all of `SCHEMA`.
+    """
+    batches: list[pa.RecordBatch] = []
+    for part, index in _indexes(directory):
+        entry = index["languages"].get(language)
+        if entry is None:
+            continue
+        reader = ipc.open_file(pa.memory_map(str(part)))
+        batches.extend(reader.get_batch(i) for i in entry["batches"])
+    table = pa.Table.from_batches(batches, schema=SCHEMA)
+    return table.select(list(columns)) if columns is not None else table
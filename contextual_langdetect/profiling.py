@@ -0,0 +1,189 @@
+"""Timing and profiling support for the command-line tools.
+
+`Timings` separates model load time from inference time and records per-line latencies. `profile()` writes either a
+cProfile dump, for `pstats` or snakeviz, or a collapsed-stack file, for `flamegraph.pl` or speedscope.
+"""
+
+import cProfile
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+
+from rich.console import Console
+from rich.table import Table
+
+from contextual_langdetect.backends import default_backend
+from contextual_langdetect.exceptions import LanguageDetectionError
+from contextual_langdetect.types import ModelSize
+
+# Profile file suffixes that select the sampling profiler's collapsed-stack output instead of a cProfile dump
+COLLAPSED_SUFFIXES = (".folded", ".collapsed")
+
+# Interval between stack samples, in seconds
+SAMPLE_INTERVAL = 0.001
+
+
+@dataclass(frozen=True)
+class LineTiming:
+    """Time spent on one input line."""
+
+    line_number: int
+    text: str
+    seconds: float
+
+
+@dataclass
+class Timings:
+    """Wall-clock timings of a tool run: model loading, named phases, and each input line."""
+
+    model_load_seconds: dict[ModelSize, float] = field(default_factory=lambda: {})
+    phase_seconds: dict[str, float] = field(default_factory=lambda: {})
+    lines: list[LineTiming] = field(default_factory=lambda: [])
+
+    def load_model(self, model: ModelSize) -> None:
+        """Load `model` now and record how long it took, so later phases measure inference only."""
+        start = time.perf_counter()
+        try:
+            default_backend(model).predict("warm up")
+        except LanguageDetectionError:
+            pass
+        self.model_load_seconds[model] = self.model_load_seconds.get(model, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None]:
+        """Time the enclosed block as the phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def line(self, line_number: int, text: str) -> Generator[None]:
+        """Time the enclosed block as the processing of one input line."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.lines.append(LineTiming(line_number, text, time.perf_counter() - start))
+
+    def percentiles(self) -> dict[str, float]:
+        """Return the min, p50, p90, p99 and max per-line latency in seconds (empty if no lines were timed)."""
+        if not self.lines:
+            return {}
+        seconds = sorted(line.seconds for line in self.lines)
+        result = {"min": seconds[0]}
+        if len(seconds) > 1:
+            quantiles = statistics.quantiles(seconds, n=100, method="inclusive")
+            result.update(p50=quantiles[49], p90=quantiles[89], p99=quantiles[98])
+        result["max"] = seconds[-1]
+        return result
+
+    def slowest(self, n: int = 10) -> list[LineTiming]:
+        """Return the `n` slowest lines, slowest first."""
+        return sorted(self.lines, key=lambda line: line.seconds, reverse=True)[:n]
+
+    def print(self, console: Console, slowest: int = 10) -> None:
+        """Print a timing report."""
+        summary = Table(title="Timings", show_header=True)
+        summary.add_column("Phase")
+        summary.add_column("Time", justify="right")
+        for model, seconds in self.model_load_seconds.items():
+            summary.add_row(f"load {model.value} model", f"{seconds * 1e3:.1f} ms")
+        for name, seconds in self.phase_seconds.items():
+            summary.add_row(name, f"{seconds * 1e3:.1f} ms")
+        console.print(summary)
+
+        if not self.lines:
+            return
+        distribution = Table(title=f"Per-line latency ({len(self.lines)} lines)", show_header=True)
+        percentiles = self.percentiles()
+        for name in percentiles:
+            distribution.add_column(name, justify="right")
+        distribution.add_row(*(f"{seconds * 1e6:.0f} µs" for seconds in percentiles.values()))
+        console.print(distribution)
+
+        slow = Table(title="Slowest lines", show_header=True)
+        slow.add_column("#", style="dim", justify="right")
+        slow.add_column("Time", justify="right")
+        slow.add_column("Text")
+        for line in self.slowest(slowest):
+            slow.add_row(str(line.line_number), f"{line.seconds * 1e6:.0f} µs", line.text[:60])
+        console.print(slow)
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler:
+    """A sampling profiler that counts the stacks of one thread, for collapsed-stack (flame graph) output.
+
+    Samples are taken from a background thread, which only runs when the profiled thread releases the GIL. A native
+    call that holds the GIL, such as fastText inference, is only seen at the switch points around it (every 5 ms by
+    default, `sys.getswitchinterval()`), so its time is undersampled or missed entirely. For native-heavy workloads,
+    use the cProfile mode (any path not ending in `.folded` or `.collapsed`), which times each call to the model.
+    """
+
+    def __init__(self, thread_id: int | None = None, interval: float = SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # pyright: ignore[reportPrivateUsage]
+            labels: list[str] = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def write(self, path: Path) -> None:
+        """Write the samples in collapsed-stack format: one `root;...;leaf count` line per distinct stack."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profile(path: Path) -> Generator[None]:
+    """Profile the enclosed block and write the result to `path`.
+
+    Paths ending in `.folded` or `.collapsed` get collapsed stacks from a sampling profiler; any other path gets a
+    cProfile dump that `pstats.Stats(path)` can load.
+    """
+    if path.suffix in COLLAPSED_SUFFIXES:
+        sampler = StackSampler()
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            sampler.write(path)
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
@@ -0,0 +1,80 @@
+"""Progress reporting and cooperative cancellation for long detection calls.
+
+Pass `progress=` to receive a `Progress` after every `PROGRESS_INTERVAL` sentences, and `cancel=` to be able to
+stop a call from another thread. A cancelled call stops at the next interval and returns the languages of the
+sentences it has processed so far, corrected with their context; `CancellationToken.processed` tells how many.
+
+Example:
+    >>> token = CancellationToken()
+    >>> languages = contextual_detect(sentences, progress=print, cancel=token)  # token.cancel() from elsewhere
+    >>> rest = sentences[token.processed :]
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+# Sentences inferred between progress reports and cancellation checks
+PROGRESS_INTERVAL = 256
+
+
+@dataclass(frozen=True)
+class Progress:
+    """How far a call has got: `done` of `total` sentences inferred, `elapsed` seconds after it started."""
+
+    done: int
+    total: int
+    elapsed: float
+
+    @property
+    def fraction(self) -> float:
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def sentences_per_second(self) -> float:
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def remaining_seconds(self) -> float | None:
+        """Estimated time to finish at the throughput so far, or None before any sentence is done."""
+        rate = self.sentences_per_second
+        return (self.total - self.done) / rate if rate else None
+
+
+ProgressCallback = Callable[[Progress], None]
+
+
+class CancellationToken:
+    """A flag that asks a detection call to stop early, and a record of how much of its input it processed.
+
+    `cancel()` may be called from any thread. Use a fresh token for each call: after the call, `processed` is the
+    length of the prefix of the input sentences that the returned languages cover (all of them, unless cancelled).
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self.processed: int | None = None
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class ProgressReporter:
+    """Calls a progress callback with the elapsed time and throughput of a call that has `total` sentences to do."""
+
+    def __init__(
+        self, total: int, callback: ProgressCallback | None, *, clock: Callable[[], float] = time.perf_counter
+    ) -> None:
+        self.total = total
+        self._callback = callback
+        self._clock = clock
+        self._start = clock()
+
+    def report(self, done: int) -> None:
+        if self._callback is not None:
+            self._callback(Progress(done, self.total, self._clock() - self._start))
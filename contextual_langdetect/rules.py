@@ -0,0 +1,140 @@
+"""Context-correction rules for languages that the model commonly confuses with each other.
+
+Step 4 of context-aware detection looks up the rule for an ambiguous sentence by its detected language and the
+document's primary languages. Lookups are cached by (detected language, primary-language set), so the cost per
+sentence does not grow with the number of rules in a table.
+
+Example:
+    >>> register_rules(*confusable("uk", "ru"))
+    >>> contextual_detect(sentences)  # ambiguous "uk" sentences in a Russian document are now corrected to "ru"
+    >>> Detector(rules=DEFAULT_RULES.extend(CLOSELY_RELATED_RULES))  # also id/ms, hr/sr/bs, no/da and gl/pt
+"""
+
+import itertools
+import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+from contextual_langdetect.types import Language
+
+# Hiragana and katakana
+_KANA = re.compile("[\u3040-\u30ff]")
+
+# Number of (detected language, primary-language set) lookups a table remembers before starting over
+MAX_COMPILED_LOOKUPS = 4096
+
+
+def has_kana(sentence: str) -> bool:
+    """Return whether the sentence contains Japanese kana."""
+    return _KANA.search(sentence) is not None
+
+
+@dataclass(frozen=True)
+class CorrectionRule:
+    """Resolve an ambiguous detection of `detected` to `target` when `target` is a primary language of the document.
+
+    Unless `override_primary` is set, the rule does not apply when `detected` is itself a primary language. If `keep`
+    returns true for a sentence, its detected language is kept and no other correction is applied to it. `name`
+    labels the rule in metrics, and defaults to "<detected>_as_<target>".
+    """
+
+    detected: Language
+    target: Language
+    name: str = ""
+    keep: Callable[[str], bool] | None = None
+    override_primary: bool = False
+
+    def __post_init__(self) -> None:
+        if not self.name:
+            object.__setattr__(self, "name", f"{self.detected}_as_{self.target}")
+
+
+def confusable(*languages: Language) -> list[CorrectionRule]:
+    """Return rules that resolve an ambiguous detection of any of `languages` to another one that is primary."""
+    return [CorrectionRule(detected, target) for detected, target in itertools.permutations(languages, 2)]
+
+
+class RuleTable:
+    """An ordered, immutable collection of correction rules, indexed by detected language.
+
+    When several rules apply to a sentence, the one that comes first wins. `extend` returns a new table, so a table
+    can be shared between threads and detectors.
+    """
+
+    def __init__(self, rules: Iterable[CorrectionRule] = ()) -> None:
+        self.rules = tuple(rules)
+        self._by_detected: dict[Language, list[CorrectionRule]] = {}
+        for rule in self.rules:
+            self._by_detected.setdefault(rule.detected, []).append(rule)
+        self._compiled: dict[tuple[Language, frozenset[Language]], CorrectionRule | None] = {}
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __iter__(self) -> Iterator[CorrectionRule]:
+        return iter(self.rules)
+
+    def extend(self, rules: Iterable[CorrectionRule]) -> "RuleTable":
+        """Return a table with `rules` after the rules of this one."""
+        return RuleTable([*self.rules, *rules])
+
+    def lookup(self, detected: Language, primary_languages: frozenset[Language]) -> CorrectionRule | None:
+        """Return the rule that applies to an ambiguous detection of `detected`, if any."""
+        key = (detected, primary_languages)
+        try:
+            return self._compiled[key]
+        except KeyError:
+            pass
+        rule = next(
+            (
+                rule
+                for rule in self._by_detected.get(detected, ())
+                if rule.target in primary_languages and (rule.override_primary or detected not in primary_languages)
+            ),
+            None,
+        )
+        if len(self._compiled) >= MAX_COMPILED_LOOKUPS:
+            self._compiled.clear()
+        self._compiled[key] = rule
+        return rule
+
+
+DEFAULT_RULES = RuleTable(
+    [
+        # Wu Chinese (wuu) is often misdetected for Chinese sentences
+        CorrectionRule("wuu", "zh", override_primary=True),
+        # Some Chinese sentences are misdetected as Japanese; Japanese text almost always has kana
+        CorrectionRule("ja", "zh", "ja_without_kana_as_zh", keep=has_kana, override_primary=True),
+    ]
+)
+
+# Closely related languages that the model confuses in short sentences. Not part of the defaults: these rules apply
+# before the probability-based choice of a primary language, and when several languages of a group are primary the
+# target is the first one listed, not the most likely one. Opt in with `Detector(rules=...)` or
+# `set_default_rules(DEFAULT_RULES.extend(CLOSELY_RELATED_RULES))`.
+CLOSELY_RELATED_RULES = RuleTable(
+    [
+        *confusable("id", "ms"),
+        *confusable("hr", "sr", "bs"),
+        *confusable("no", "da"),
+        *confusable("gl", "pt"),
+    ]
+)
+
+_default_rules = DEFAULT_RULES
+
+
+def default_rules() -> RuleTable:
+    """Return the rule table used when none is given explicitly."""
+    return _default_rules
+
+
+def set_default_rules(rules: RuleTable) -> None:
+    """Replace the rule table used when none is given explicitly."""
+    global _default_rules
+    _default_rules = rules
+
+
+def register_rules(*rules: CorrectionRule) -> None:
+    """Add rules to the default table, after the existing ones."""
+    set_default_rules(default_rules().extend(rules))
@@ -0,0 +1,323 @@
+"""Priority scheduling of detection work, so that interactive requests do not wait behind bulk documents.
+
+A `Scheduler` runs inference on its own worker threads. Each submitted document is split into chunks of sentences
+that are queued by priority class, and workers always take the next chunk of the most urgent class that has work.
+A bulk document therefore yields to interactive requests between chunks instead of holding a worker for its whole
+length; it is resolved with full document context once its last chunk is done. Priority is strict, so bulk work
+only runs while no interactive work is queued.
+
+Example:
+    >>> with Scheduler(workers=2) as scheduler:
+    ...     backfill = scheduler.submit(document, Priority.BULK)
+    ...     scheduler.contextual_detect(["Is this English?"])  # runs between the document's chunks
+    ...     languages = backfill.result()
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field, replace
+from enum import IntEnum
+from types import TracebackType
+
+from contextual_langdetect import metrics
+from contextual_langdetect.backends import Backend, FastLangDetectBackend, default_backend
+from contextual_langdetect.detection import (
+    FirstPassResult,
+    Language,
+    ModelSize,
+    Thresholds,
+    first_pass,
+    make_inference,
+    resolve_first_pass,
+    single_language,
+)
+
+# Sentences per unit of work; a queued interactive request waits for at most one chunk per busy worker
+DEFAULT_CHUNK_SIZE = 64
+
+# Number of recent wait times kept per class for the percentiles in `QueueStats`
+WAIT_SAMPLES = 1024
+
+
+class Priority(IntEnum):
+    """Scheduling class of a request. Lower values are served first."""
+
+    INTERACTIVE = 0  # latency-sensitive requests, e.g. single chat messages
+    BULK = 1  # throughput work such as backfills of whole documents
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    """Snapshot of one priority class: queue depth, request counts, and how long chunks waited to start."""
+
+    queued_chunks: int = 0
+    submitted: int = 0
+    completed: int = 0
+    cancelled: int = 0  # requests whose future was cancelled before they completed
+    wait_p50: float = 0.0  # seconds, over the last WAIT_SAMPLES chunks
+    wait_p99: float = 0.0
+    max_wait: float = 0.0  # seconds, since the scheduler started
+
+
+class _Job:
+    """A submitted document and the first-pass results of its chunks so far."""
+
+    def __init__(
+        self,
+        sentences: list[str],
+        languages: Sequence[Language] | None,
+        context_correction: bool,
+        window: int | None,
+        chunks: int,
+    ) -> None:
+        self.sentences = sentences
+        self.languages = languages
+        self.context_correction = context_correction
+        self.window = window
+        self.future: Future[list[Language]] = Future()
+        self.results: list[list[FirstPassResult]] = [[] for _ in range(chunks)]
+        self.remaining = chunks
+        self.lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class _Chunk:
+    job: _Job
+    number: int
+    start: int
+    end: int
+    enqueued: float
+
+
+@dataclass
+class _ClassState:
+    queue: deque[_Chunk] = field(default_factory=lambda: deque())
+    submitted: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    waits: deque[float] = field(default_factory=lambda: deque(maxlen=WAIT_SAMPLES))
+    max_wait: float = 0.0
+
+    def snapshot(self) -> QueueStats:
+        waits = sorted(self.waits)
+
+        def percentile(q: float) -> float:
+            return waits[min(len(waits) - 1, int(q * len(waits)))] if waits else 0.0
+
+        return QueueStats(
+            queued_chunks=len(self.queue),
+            submitted=self.submitted,
+            completed=self.completed,
+            cancelled=self.cancelled,
+            wait_p50=percentile(0.50),
+            wait_p99=percentile(0.99),
+            max_wait=self.max_wait,
+        )
+
+
+class Scheduler:
+    """Worker threads that run detection requests in priority order, chunk by chunk.
+
+    All workers share one backend; a fast-langdetect model is loaded before they start. Call `close()` (or use the
+    scheduler as a context manager) to finish the queued work and stop the workers.
+    """
+
+    def __init__(
+        self,
+        model: ModelSize = ModelSize.SMALL,
+        *,
+        backend: Backend | None = None,
+        thresholds: Thresholds | None = None,
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a scheduler and start its workers.
+
+        Args:
+            model: Size of model to use (small uses less memory, large may be more accurate).
+            backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+            thresholds: Tuning parameters; defaults to the current values of the module-level constants.
+            workers: Number of worker threads.
+            chunk_size: Number of sentences inferred per unit of work.
+            clock: Time source for wait statistics.
+        """
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.model = model
+        self.backend: Backend = backend if backend is not None else default_backend(model)
+        self.thresholds = thresholds if thresholds is not None else Thresholds.from_module()
+        self.chunk_size = chunk_size
+        self._clock = clock
+        self._classes = {priority: _ClassState() for priority in Priority}
+        self._condition = threading.Condition()
+        self._closed = False
+
+        if isinstance(self.backend, FastLangDetectBackend):
+            self.backend.load()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"contextual-langdetect-scheduler-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        sentences: Sequence[str],
+        priority: Priority = Priority.INTERACTIVE,
+        *,
+        languages: Sequence[Language] | None = None,
+        context_correction: bool = True,
+        window: int | None = None,
+    ) -> Future[list[Language]]:
+        """Queue a document for `contextual_detect`, and return a future of its languages.
+
+        Cancelling the future drops the document's remaining chunks, and counts it in `QueueStats.cancelled`
+        instead of `completed`.
+
+        Raises:
+            RuntimeError: If the scheduler has been closed.
+        """
+        sentences = list(sentences)
+        starts = range(0, len(sentences), self.chunk_size)
+        job = _Job(sentences, languages, context_correction, window, len(starts))
+        now = self._clock()
+        chunks = [_Chunk(job, number, start, start + self.chunk_size, now) for number, start in enumerate(starts)]
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("cannot submit to a closed scheduler")
+            state = self._classes[priority]
+            state.submitted += 1
+            only = single_language(languages)
+            if not chunks or only is not None:
+                # Nothing to do, or the only possible result; no inference needed
+                state.completed += 1
+                job.future.set_result([only] * len(sentences) if only is not None else [])
+            else:
+                state.queue.extend(chunks)
+                self._condition.notify(len(chunks))
+        # Outside the lock, since the callback takes it and runs at once if the future is already done
+        job.future.add_done_callback(lambda _: self._drop(job, priority))
+
+        registry = metrics.get_registry()
+        if registry is not None:
+            metrics.record_call(registry, "Scheduler.submit", len(sentences))
+        return job.future
+
+    def contextual_detect(
+        self,
+        sentences: Sequence[str],
+        priority: Priority = Priority.INTERACTIVE,
+        *,
+        languages: Sequence[Language] | None = None,
+        context_correction: bool = True,
+        window: int | None = None,
+    ) -> list[Language]:
+        """Submit a document and wait for its languages. See `contextual_langdetect.contextual_detect`."""
+        return self.submit(
+            sentences, priority, languages=languages, context_correction=context_correction, window=window
+        ).result()
+
+    def stats(self) -> dict[Priority, QueueStats]:
+        """Return a snapshot of the queue depth, request counts and wait times of each priority class."""
+        with self._condition:
+            return {priority: state.snapshot() for priority, state in self._classes.items()}
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting work; workers exit once the queued work is done. With `wait`, block until they have."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self) -> "Scheduler":
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def _next_chunk(self) -> tuple[_Chunk, Priority] | None:
+        """Wait for and dequeue the next chunk of the most urgent class, or return None once closed and drained."""
+        with self._condition:
+            while True:
+                for priority, state in self._classes.items():  # in priority order
+                    if state.queue:
+                        chunk = state.queue.popleft()
+                        wait = self._clock() - chunk.enqueued
+                        state.waits.append(wait)
+                        state.max_wait = max(state.max_wait, wait)
+                        registry = metrics.get_registry()
+                        if registry is not None:
+                            registry.observe("scheduler_wait_seconds", wait, priority=priority.name.lower())
+                        return chunk, priority
+                if self._closed:
+                    return None
+                self._condition.wait()
+
+    def _work(self) -> None:
+        while (item := self._next_chunk()) is not None:
+            self._run(*item)
+
+    def _run(self, chunk: _Chunk, priority: Priority) -> None:
+        job = chunk.job
+        if job.future.done():  # cancelled, or an earlier chunk failed
+            return
+        try:
+            with metrics.attribute_to("Scheduler.submit"):
+                results = first_pass(
+                    job.sentences[chunk.start : chunk.end],
+                    make_inference(self.model, self.backend, job.languages, thresholds=self.thresholds),
+                    job.languages,
+                    self.thresholds,
+                )
+            job.results[chunk.number] = [replace(result, index=chunk.start + result.index) for result in results]
+            with job.lock:
+                job.remaining -= 1
+                if job.remaining:
+                    return
+            # Steps 2-4, with the context of the whole document
+            first_pass_results = [result for results in job.results for result in results]
+            languages = resolve_first_pass(
+                first_pass_results, job.languages, job.context_correction, self.thresholds, job.window
+            )
+        except Exception as e:
+            self._settle(job, priority, exception=e)
+        else:
+            self._settle(job, priority, languages)
+
+    def _drop(self, job: _Job, priority: Priority) -> None:
+        """Remove the queued chunks of a job that was cancelled or failed, and count the cancellation."""
+        if not job.future.cancelled() and job.future.exception() is None:
+            return
+        with self._condition:
+            state = self._classes[priority]
+            state.queue = deque(chunk for chunk in state.queue if chunk.job is not job)
+            if job.future.cancelled():
+                state.cancelled += 1
+
+    def _settle(
+        self,
+        job: _Job,
+        priority: Priority,
+        languages: list[Language] | None = None,
+        exception: BaseException | None = None,
+    ) -> None:
+        try:
+            if exception is not None:
+                job.future.set_exception(exception)
+            else:
+                job.future.set_result(languages or [])
+        except InvalidStateError:  # cancelled meanwhile, or another chunk failed first
+            return
+        with self._condition:
+            self._classes[priority].completed += 1
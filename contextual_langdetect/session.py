@@ -0,0 +1,183 @@
+"""Incremental context-aware detection for documents that are edited a few sentences at a time."""
+
+from collections.abc import Sequence
+
+from contextual_langdetect import metrics
+from contextual_langdetect.backends import Backend
+from contextual_langdetect.detection import (
+    FirstPassResult,
+    Language,
+    ModelSize,
+    Thresholds,
+    first_pass,
+    make_inference,
+    resolve_language,
+    select_primary_languages,
+    single_language,
+)
+
+
+class DocumentSession:
+    """A document whose per-sentence languages are kept up to date as it is edited.
+
+    The session keeps each sentence's first-pass result and the document's language counts. An edit re-infers only
+    the inserted or changed sentences and updates the counts; other sentences are re-resolved only if the document's
+    primary languages change, and never re-inferred.
+
+    The final languages match `contextual_detect` on the same sentences, except that sentences which cannot be
+    detected (e.g. empty ones) keep their position, with a language of `None`. Ties between equally frequent
+    languages may be broken differently after edits that remove every occurrence of a language.
+
+    Example:
+        >>> session = DocumentSession(["你好。", "很好。", "How are you?"])
+        >>> session.replace(2, 3, ["我很好。"])  # returns {index: new language} for sentences whose language changed
+        {2: 'zh'}
+    """
+
+    def __init__(
+        self,
+        sentences: Sequence[str] = (),
+        languages: Sequence[Language] | None = None,
+        model: ModelSize = ModelSize.SMALL,
+        backend: Backend | None = None,
+    ) -> None:
+        """Create a session and detect the initial sentences.
+
+        Args:
+            sentences: The initial sentences of the document.
+            languages: Optional sequence of expected languages to bias detection towards.
+            model: Size of model to use (small uses less memory, large may be more accurate).
+            backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+        """
+        self.expected_languages = list(languages) if languages else None
+        self.model = model
+        self.backend = backend
+        self.thresholds = Thresholds.from_module()
+
+        self._sentences: list[str] = []
+        self._results: list[FirstPassResult | None] = []
+        self._final: list[Language | None] = []
+        self._language_counts: dict[Language, int] = {}
+        self._confident_language_counts: dict[Language, int] = {}
+        self._detected = 0
+        self._primary_languages: list[Language] = []
+        self.replace(0, 0, sentences)
+
+    @property
+    def sentences(self) -> list[str]:
+        """The current sentences of the document."""
+        return list(self._sentences)
+
+    @property
+    def languages(self) -> list[Language | None]:
+        """The final language of each sentence, or None for sentences that could not be detected."""
+        return list(self._final)
+
+    @property
+    def primary_languages(self) -> list[Language]:
+        """The document's current primary languages."""
+        return list(self._primary_languages)
+
+    def __len__(self) -> int:
+        return len(self._sentences)
+
+    def insert(self, index: int, sentences: Sequence[str]) -> dict[int, Language | None]:
+        """Insert sentences before `index`. Returns the sentences whose final language changed."""
+        return self.replace(index, index, sentences)
+
+    def remove(self, start: int, end: int) -> dict[int, Language | None]:
+        """Remove the sentences in `[start, end)`. Returns the sentences whose final language changed."""
+        return self.replace(start, end, ())
+
+    def update(self, index: int, sentence: str) -> dict[int, Language | None]:
+        """Change the sentence at `index`. Returns the sentences whose final language changed."""
+        return self.replace(index, index + 1, [sentence])
+
+    def replace(self, start: int, end: int, sentences: Sequence[str]) -> dict[int, Language | None]:
+        """Replace the sentences in `[start, end)` with `sentences`.
+
+        Only the new sentences are run through the model.
+
+        Returns:
+            A mapping from (post-edit) sentence index to final language, for each sentence whose final language
+            differs from the language at that position before the edit. Inserted sentences are always included;
+            removed sentences are not.
+        """
+        if not 0 <= start <= end <= len(self._sentences):
+            raise IndexError(f"invalid range [{start}, {end}) for a document of {len(self._sentences)} sentences")
+
+        old_final = self._final
+        with metrics.track_call("DocumentSession.replace", len(sentences)):
+            new_results = self._infer(sentences)
+
+        for result in self._results[start:end]:
+            self._count(result, -1)
+        for result in new_results:
+            self._count(result, +1)
+
+        self._sentences[start:end] = sentences
+        self._results[start:end] = new_results
+
+        primary_languages = self._find_primary_languages()
+        if primary_languages != self._primary_languages:
+            # The context changed: re-resolve every sentence (without re-running inference)
+            self._primary_languages = primary_languages
+            self._final = [self._resolve(result) for result in self._results]
+        else:
+            self._final = old_final[:start] + [self._resolve(result) for result in new_results] + old_final[end:]
+
+        # Map each post-edit index to the pre-edit index of the same position
+        shift = (end - start) - len(sentences)
+        changes: dict[int, Language | None] = {}
+        for index, language in enumerate(self._final):
+            if index < start:
+                old_index = index
+            elif index < start + len(sentences):
+                old_index = index if index < end else None
+            else:
+                old_index = index + shift
+            if old_index is None or old_final[old_index] != language:
+                changes[index] = language
+        return changes
+
+    def _infer(self, sentences: Sequence[str]) -> list[FirstPassResult | None]:
+        results: list[FirstPassResult | None] = [None] * len(sentences)
+        if single_language(self.expected_languages) is not None:
+            # The only possible result; no inference needed
+            return results
+
+        infer = make_inference(self.model, self.backend, self.expected_languages, thresholds=self.thresholds)
+        for result in first_pass(sentences, infer, self.expected_languages, self.thresholds):
+            results[result.index] = result
+        return results
+
+    def _count(self, result: FirstPassResult | None, delta: int) -> None:
+        if result is None:
+            return
+        self._detected += delta
+        counters = [self._language_counts]
+        if not result.detection.is_ambiguous:
+            counters.append(self._confident_language_counts)
+        lang = result.detection.language
+        for counts in counters:
+            counts[lang] = counts.get(lang, 0) + delta
+            if not counts[lang]:
+                del counts[lang]
+
+    def _find_primary_languages(self) -> list[Language]:
+        return select_primary_languages(
+            self._language_counts,
+            self._confident_language_counts,
+            self._detected,
+            self.expected_languages,
+            self.thresholds,
+        )
+
+    def _resolve(self, result: FirstPassResult | None) -> Language | None:
+        if self.expected_languages and len(self.expected_languages) == 1:
+            return self.expected_languages[0]
+        if result is None:
+            return None
+        return resolve_language(
+            result.sentence, result.detection, result.probabilities, self._primary_languages, self.thresholds
+        )
@@ -0,0 +1,88 @@
+"""Two-pass context-aware detection for documents that are split into shards across processes or machines."""
+
+from collections.abc import Sequence
+
+from contextual_langdetect import metrics
+from contextual_langdetect.backends import Backend
+from contextual_langdetect.detection import (
+    DocumentStatistics,
+    FirstPassResult,
+    Language,
+    ModelSize,
+    Thresholds,
+    first_pass,
+    make_inference,
+    resolve_language,
+    single_language,
+)
+
+
+class DocumentShard:
+    """One shard of a document that is detected in two passes, with statistics reduced across all shards.
+
+    Constructing a shard runs the first pass (the model) on its sentences and keeps the results locally. Only the
+    shard's `statistics`, a few integers per language, need to leave the worker; the reduced statistics are sent back
+    and `resolve` applies context correction with the document's global primary languages.
+
+    Merging the statistics of all shards in document order and resolving each shard gives the same languages as
+    `contextual_detect` on the whole document.
+
+    Example:
+        >>> shards = [DocumentShard(part) for part in parts]  # on each worker
+        >>> statistics = sum((shard.statistics for shard in shards[1:]), shards[0].statistics)  # reduce
+        >>> languages = [lang for shard in shards for lang in shard.resolve(statistics)]  # on each worker
+    """
+
+    def __init__(
+        self,
+        sentences: Sequence[str],
+        languages: Sequence[Language] | None = None,
+        model: ModelSize = ModelSize.SMALL,
+        backend: Backend | None = None,
+        thresholds: Thresholds | None = None,
+    ) -> None:
+        """Run the first pass on a shard's sentences.
+
+        Args:
+            sentences: The sentences of this shard.
+            languages: Optional sequence of expected languages to bias detection towards. Use the same value on
+                every shard.
+            model: Size of model to use (small uses less memory, large may be more accurate).
+            backend: Inference backend to use instead of the default fast-langdetect backend for `model`.
+            thresholds: Tuning parameters; defaults to the current values of the module-level constants.
+        """
+        self.sentences = list(sentences)
+        self.expected_languages = list(languages) if languages else None
+        self.thresholds = thresholds if thresholds is not None else Thresholds.from_module()
+        self._results: list[FirstPassResult] = []
+        self.statistics = DocumentStatistics({}, {}, 0)
+
+        # When only one language is specified and it's the only possible result
+        if single_language(self.expected_languages) is not None:
+            return
+
+        infer = make_inference(model, backend, self.expected_languages, thresholds=self.thresholds)
+        with metrics.track_call("DocumentShard", len(self.sentences)):
+            self._results = first_pass(self.sentences, infer, self.expected_languages, self.thresholds)
+        self.statistics = DocumentStatistics.from_results(self._results)
+
+    def resolve(self, statistics: DocumentStatistics | None = None) -> list[Language]:
+        """Return the final language of each detected sentence of this shard.
+
+        Args:
+            statistics: The statistics of the whole document; defaults to this shard's own statistics.
+
+        Returns:
+            List of language codes, as `contextual_detect` returns for this shard's sentences.
+        """
+        only = single_language(self.expected_languages)
+        if only is not None:
+            return [only for _ in self.sentences]
+        stats = statistics if statistics is not None else self.statistics
+        primary_languages = stats.primary_languages(self.expected_languages, self.thresholds)
+        return [
+            resolve_language(
+                result.sentence, result.detection, result.probabilities, primary_languages, self.thresholds
+            )
+            for result in self._results
+        ]
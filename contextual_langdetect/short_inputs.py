@@ -0,0 +1,90 @@
+"""A fast path that assigns very short sentences ("ok", "yes", emoji, numbers) from context instead of the model.
+
+fastText rarely gives a confident answer for one or two tokens, and context correction then replaces the answer
+with a language of the document anyway; a `ShortInputPolicy` skips the model call for such sentences.
+"""
+
+import re
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from enum import Enum
+
+from contextual_langdetect import metrics
+from contextual_langdetect.types import Language
+
+# A run of letters or digits, except that each CJK ideograph or kana counts as a token of its own
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_TOKEN = re.compile(rf"[{_CJK}]|[^\W{_CJK}]+")
+
+
+class InheritFrom(str, Enum):
+    """Where a short sentence takes its language from."""
+
+    NEIGHBORS = "neighbors"  # the nearest preceding detected sentence, or the following one at the start
+    PRIMARY = "primary"  # the most common language of the detected sentences
+
+
+@dataclass(frozen=True)
+class ShortInputPolicy:
+    """Which sentences count as too short to detect, and how they are assigned a language instead.
+
+    A sentence is short if, once stripped, it has at most `max_chars` characters, at most `max_tokens` tokens, or
+    no letters at all (emoji, numbers, punctuation). Tokens are runs of letters or digits, with each CJK ideograph
+    or kana counted separately. Empty sentences are not short; they are skipped as before.
+
+    Example:
+        >>> policy = ShortInputPolicy(max_tokens=2)
+        >>> contextual_detect(["Bonjour à tous.", "ok", "Merci beaucoup !"], short_inputs=policy)
+        ['fr', 'fr', 'fr']
+        >>> policy.inherited(["Bonjour à tous.", "ok", "Merci beaucoup !"])
+        [1]
+    """
+
+    max_chars: int = 3
+    max_tokens: int = 1
+    inherit_from: InheritFrom = InheritFrom.NEIGHBORS
+
+    def is_short(self, text: str) -> bool:
+        stripped = text.strip()
+        if not stripped:
+            return False
+        if len(stripped) <= self.max_chars:
+            return True
+        tokens = _TOKEN.findall(stripped)
+        return len(tokens) <= self.max_tokens or not any(char.isalpha() for token in tokens for char in token)
+
+    def inherited(self, sentences: Sequence[str]) -> list[int]:
+        """Return the indices of the sentences that a call with this policy assigns from context.
+
+        If every non-empty sentence is short there is no context to inherit from, so all of them are detected as usual.
+        """
+        short = [index for index, sentence in enumerate(sentences) if self.is_short(sentence)]
+        if len(short) == sum(1 for sentence in sentences if sentence.strip()):
+            return []
+        return short
+
+    def assign(self, short: Sequence[int], detected: Mapping[int, Language]) -> dict[int, Language]:
+        """Return the language of each short sentence, given the languages of the detected ones.
+
+        `detected` maps sentence indices to languages in increasing index order. Short sentences are left out of the
+        result if no sentence was detected.
+        """
+        if not detected:
+            return {}
+        assigned: dict[int, Language] = {}
+        if self.inherit_from == InheritFrom.PRIMARY:
+            primary = Counter(detected.values()).most_common(1)[0][0]
+            assigned = dict.fromkeys(short, primary)
+        else:
+            indices = list(detected)
+            position = 0  # number of detected sentences before the current short one
+            for index in short:
+                while position < len(indices) and indices[position] < index:
+                    position += 1
+                assigned[index] = detected[indices[max(position - 1, 0)]]
+
+        registry = metrics.get_registry()
+        if registry is not None:
+            registry.inc("sentences_inherited_total", len(assigned))
+        return assigned
@@ -0,0 +1,25 @@
+"""Core types shared by the detection pipeline and the inference backends."""
+
+from dataclasses import dataclass
+from enum import Enum
+
+
+class ModelSize(str, Enum):
+    """Size of the language detection model to use."""
+
+    SMALL = "small"  # Uses low memory mode
+    LARGE = "large"  # Uses full memory mode
+
+
+# Type aliases
+Language = str
+LangProbabilities = dict[str, float]  # language code -> probability
+
+
+@dataclass
+class DetectionResult:
+    """Result of language detection including confidence."""
+
+    language: Language
+    confidence: float
+    is_ambiguous: bool = False
@@ -0,0 +1,119 @@
+"""Steps 2-4 of context-aware detection over NumPy arrays, for very large documents.
+
+`resolve_document` gives the same results as the per-sentence loop of `resolve_first_pass`, including the
+corrections recorded in metrics, but works on integer language ids: language counts are `bincount`s, correction
+rules are looked up once per detected language and applied with masks, and the primary language of each ambiguous
+sentence is a row-wise argmax over a probability matrix with one column per primary language. `resolve_first_pass`
+switches to it for documents of at least `VECTORIZED_MIN_SENTENCES` detected sentences when NumPy is installed.
+
+This module requires the optional `numpy` dependency (`pip install contextual-langdetect[numpy]`).
+"""
+
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as e:  # pragma: no cover - exercised only without the optional dependency
+    raise ImportError(
+        "contextual_langdetect.vectorized requires numpy: pip install 'contextual-langdetect[numpy]'"
+    ) from e
+
+from contextual_langdetect import metrics
+from contextual_langdetect.detection import FirstPassResult, Language, Thresholds, select_primary_languages
+from contextual_langdetect.rules import RuleTable, default_rules
+
+
+def _counts(ids: npt.NDArray[np.intp], vocabulary: Sequence[Language]) -> dict[Language, int]:
+    """Count the ids, keyed by language in order of first appearance in `ids`."""
+    counts = np.bincount(ids, minlength=len(vocabulary))
+    first = np.full(len(vocabulary), len(ids), dtype=np.intp)
+    np.minimum.at(first, ids, np.arange(len(ids)))
+    present = np.flatnonzero(counts)
+    order: list[int] = present[np.argsort(first[present])].tolist()
+    return {vocabulary[i]: int(counts[i]) for i in order}
+
+
+def resolve_document(
+    first_pass_results: Sequence[FirstPassResult],
+    languages: Sequence[Language] | None,
+    thresholds: Thresholds,
+    rules: RuleTable | None = None,
+) -> list[Language]:
+    """Steps 2-4 with document context: the vectorized equivalent of `resolve_first_pass` without a window."""
+    # Language ids, in order of first appearance. Reading the Python objects is the bulk of the remaining cost, so
+    # each field is read in one comprehension and mapped with C-level iteration.
+    detections = [result.detection for result in first_pass_results]
+    detected_languages = [detection.language for detection in detections]
+    vocabulary = list(dict.fromkeys(detected_languages))
+    ids = {language: i for i, language in enumerate(vocabulary)}
+    detected = np.fromiter(map(ids.__getitem__, detected_languages), dtype=np.intp, count=len(detections))
+    ambiguous = np.fromiter([detection.is_ambiguous for detection in detections], dtype=np.bool_, count=len(detections))
+
+    # Steps 2 and 3: document statistics and primary languages. Ids are numbered in order of first appearance, so
+    # the counts of all detections are already in that order.
+    language_counts = np.bincount(detected, minlength=len(vocabulary)).tolist()
+    primary_languages = select_primary_languages(
+        dict(zip(vocabulary, language_counts)),
+        _counts(detected[~ambiguous], vocabulary),
+        len(detected),
+        languages,
+        thresholds,
+    )
+    if not primary_languages or not ambiguous.any():
+        return detected_languages
+
+    final = detected.copy()
+    registry = metrics.get_registry()
+
+    def language_id(language: Language) -> int:
+        if language not in ids:
+            ids[language] = len(ids)
+            vocabulary.append(language)
+        return ids[language]
+
+    def record(rule: str, count: int) -> None:
+        if registry is not None and count:
+            registry.inc("corrections_total", count, rule=rule)
+
+    # Step 4, special cases: the rule for each detected language, applied to its ambiguous sentences
+    table = rules if rules is not None else default_rules()
+    primary_set = frozenset(primary_languages)
+    unresolved = ambiguous.copy()  # ambiguous sentences that no rule applies to
+    ambiguous_ids: list[int] = np.flatnonzero(np.bincount(detected[ambiguous])).tolist()
+    for lang_id in ambiguous_ids:
+        rule = table.lookup(vocabulary[lang_id], primary_set)
+        if rule is None:
+            continue
+        rows = np.flatnonzero(ambiguous & (detected == lang_id))
+        unresolved[rows] = False
+        if rule.keep is not None:
+            keep = rule.keep
+            kept = np.fromiter((keep(first_pass_results[row].sentence) for row in rows.tolist()), np.bool_, len(rows))
+            rows = rows[~kept]
+        final[rows] = language_id(rule.target)
+        record(rule.name, len(rows))
+
+    # Step 4, otherwise: the primary language that the model rates most likely, if likely enough
+    rows = np.flatnonzero(unresolved)
+    if len(rows):
+        row_list: list[int] = rows.tolist()
+        distributions = [first_pass_results[row].probabilities for row in row_list]
+        probabilities = np.empty((len(rows), len(primary_languages)), dtype=np.float64)
+        for column, lang in enumerate(primary_languages):
+            probabilities[:, column] = np.fromiter(
+                [distribution.get(lang, 0.0) for distribution in distributions], dtype=np.float64, count=len(rows)
+            )
+        best = probabilities.argmax(axis=1)  # the first of equal maxima, as the loop keeps the first
+        best_score = probabilities[np.arange(len(rows)), best]
+        accepted = (best_score > 0.0) & (best_score > thresholds.min_alternative_probability)
+        primary_ids = np.array([language_id(lang) for lang in primary_languages], dtype=np.intp)
+        rows, best_ids = rows[accepted], primary_ids[best[accepted]]
+        record("primary_language", int(np.count_nonzero(best_ids != detected[rows])))
+        final[rows] = best_ids
+
+    # Most sentences keep their detected language; only patch the corrected ones
+    corrected: list[int] = np.flatnonzero(final != detected).tolist()
+    for row in corrected:
+        detected_languages[row] = vocabulary[final[row]]
+    return detected_languages
@@ -4,6 +4,8 @@ class LangDetectResult(TypedDict):
     lang: str
     score: float
 
+class DetectError(Exception): ...
+
 class LangDetectConfig:
     def __init__(
         self,
@@ -25,6 +27,17 @@ class LangDetectConfig:
         threshold: float = 0.0,
     ) -> list[LangDetectResult]: ...
 
+class LangDetector:
+    def __init__(self, config: LangDetectConfig | None = None) -> None: ...
+    def detect(self, text: str, low_memory: bool = True) -> LangDetectResult: ...
+    def detect_multilingual(
+        self,
+        text: str,
+        low_memory: bool = False,
+        k: int = 5,
+        threshold: float = 0.0,
+    ) -> list[LangDetectResult]: ...
+
 def detect(
     text: str,
     *,
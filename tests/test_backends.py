@@ -0,0 +1,169 @@
+"""Tests for inference backends."""
+
+from unittest.mock import patch
+
+import fast_langdetect
+import pytest
+
+from contextual_langdetect.backends import (
+    Backend,
+    FastLangDetectBackend,
+    LabelScorer,
+    TableBackend,
+    default_backend,
+    score_labels,
+)
+from contextual_langdetect.detection import (
+    LangProbabilities,
+    Language,
+    ModelSize,
+    contextual_detect,
+    detect_language,
+    get_language_probabilities,
+    get_majority_language,
+)
+from contextual_langdetect.detector import Detector
+from contextual_langdetect.exceptions import LanguageDetectionError
+
+TABLE = {
+    "你好": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "Hello": {"en": 0.95},
+    "Short": {"en": 0.60, "zh": 0.30},
+}
+
+
+def test_backends_satisfy_protocol() -> None:
+    assert isinstance(TableBackend(TABLE), Backend)
+    assert isinstance(FastLangDetectBackend(), Backend)
+
+
+def test_default_backend_is_shared() -> None:
+    assert default_backend(ModelSize.LARGE) is default_backend(ModelSize.LARGE)
+    assert default_backend(ModelSize.SMALL).model == ModelSize.SMALL
+
+
+def test_table_backend_predictions() -> None:
+    backend = TableBackend(TABLE)
+    assert backend.predict("很好") == ("ja", 0.55)
+    assert backend.top_k("很好", k=1) == {"ja": 0.55}
+    assert list(backend.top_k("很好")) == ["ja", "zh"]
+    assert backend.predict_batch(["你好", "Hello"]) == [("zh", 0.95), ("en", 0.95)]
+    assert backend.top_k_batch(["Short"]) == [{"en": 0.60, "zh": 0.30}]
+    assert backend.calls == 6
+
+
+def test_table_backend_is_deterministic_on_ties() -> None:
+    backend = TableBackend({"x": {"sr": 0.4, "bs": 0.4, "hr": 0.2}})
+    assert backend.predict("x") == ("bs", 0.4)
+
+
+def test_table_backend_missing_text() -> None:
+    with pytest.raises(LanguageDetectionError):
+        TableBackend(TABLE).predict("unknown")
+    assert TableBackend(TABLE, default={"und": 0.1}).predict("unknown") == ("und", 0.1)
+
+
+def test_fast_langdetect_backend_wraps_prediction_errors() -> None:
+    with patch("fast_langdetect.detect", side_effect=fast_langdetect.DetectError("Language detection failed")):
+        with pytest.raises(LanguageDetectionError):
+            FastLangDetectBackend().predict("Hello")
+    error = fast_langdetect.DetectError("Multilingual detection failed.")
+    with patch("fast_langdetect.detect_multilingual", side_effect=error):
+        with pytest.raises(LanguageDetectionError):
+            FastLangDetectBackend().top_k("Hello")
+
+
+def test_model_load_failures_propagate() -> None:
+    with patch("fast_langdetect.detect", side_effect=fast_langdetect.DetectError("Failed to load model")):
+        with pytest.raises(fast_langdetect.DetectError, match="Failed to load model"):
+            contextual_detect(["Hello", "你好"])
+        with pytest.raises(fast_langdetect.DetectError, match="Failed to load model"):
+            get_majority_language(["Hello"])
+
+
+def test_detection_functions_accept_backend() -> None:
+    backend = TableBackend(TABLE)
+    result = detect_language("Short", backend=backend)
+    assert result.language == "en"
+    assert result.is_ambiguous
+    assert contextual_detect(list(TABLE), backend=backend) == ["zh", "zh", "en", "en"]
+    assert contextual_detect(list(TABLE), backend=backend, context_correction=False) == ["zh", "ja", "en", "en"]
+    assert get_majority_language(["你好", "很好", "Hello"], backend=backend) == "zh"
+
+
+def test_contextual_detect_skips_backend_failures() -> None:
+    assert contextual_detect(["你好", "unknown", "Hello"], backend=TableBackend(TABLE)) == ["zh", "en"]
+
+
+def test_detector_with_backend() -> None:
+    detector = Detector(backend=TableBackend(TABLE))
+    assert detector.contextual_detect(list(TABLE)) == ["zh", "zh", "en", "en"]
+
+
+# "ms" ranks sixth, so it is missing from a top-5 list
+MALAY = {"Apa khabar?": {"jv": 0.30, "id": 0.20, "su": 0.15, "en": 0.10, "tl": 0.08, "ms": 0.07}}
+
+
+class TopKOnlyBackend:
+    """A backend without `score_labels`."""
+
+    def __init__(self, backend: TableBackend) -> None:
+        self.backend = backend
+
+    def predict(self, text: str) -> tuple[Language, float]:
+        return self.backend.predict(text)
+
+    def predict_batch(self, texts: list[str]) -> list[tuple[Language, float]]:
+        return self.backend.predict_batch(texts)
+
+    def top_k(self, text: str, k: int = 5) -> LangProbabilities:
+        return self.backend.top_k(text, k)
+
+    def top_k_batch(self, texts: list[str], k: int = 5) -> list[LangProbabilities]:
+        return self.backend.top_k_batch(texts, k)
+
+
+def test_fast_langdetect_backend_scores_every_label() -> None:
+    result = [{"lang": lang, "score": score} for lang, score in MALAY["Apa khabar?"].items()]
+
+    def detect_multilingual(text: str, *, low_memory: bool, k: int, threshold: float = 0.0) -> list[dict[str, object]]:
+        return result if k == -1 else result[:k]
+
+    with patch("fast_langdetect.detect_multilingual", side_effect=detect_multilingual) as mock_detect:
+        # Found in the top-k list: one query
+        assert FastLangDetectBackend().score_labels("Apa khabar?", ["id", "en"]) == {"id": 0.20, "en": 0.10}
+        assert [call.kwargs["k"] for call in mock_detect.call_args_list] == [5]
+        # "ms" ranks sixth: the whole vocabulary is ranked, without a threshold
+        assert FastLangDetectBackend().score_labels("Apa khabar?", ["ms", "zh", "en"]) == {"en": 0.10, "ms": 0.07}
+        assert [call.kwargs["k"] for call in mock_detect.call_args_list] == [5, 5, -1]
+    assert mock_detect.call_args.kwargs["threshold"] == 0.0
+
+
+def test_expected_languages_with_low_probabilities_are_kept() -> None:
+    # The model rates zh at about 0.0001 for this Wu sentence, yet it is in the top-5 list the bias step used to read
+    assert "zh" in FastLangDetectBackend().score_labels("侬好。", ["zh", "en"])
+    assert contextual_detect(["你好。", "侬好。", "我很好。"], languages=["zh", "en"]) == ["zh", "zh", "zh"]
+
+
+def test_score_labels_falls_back_to_top_k() -> None:
+    backend = TopKOnlyBackend(TableBackend(MALAY))
+    assert isinstance(TableBackend(MALAY), LabelScorer)
+    assert not isinstance(backend, LabelScorer)
+    assert score_labels(TableBackend(MALAY), "Apa khabar?", ["ms", "en"]) == {"en": 0.10, "ms": 0.07}
+    assert score_labels(backend, "Apa khabar?", ["ms", "en"]) == {"en": 0.10}
+    assert get_language_probabilities("Apa khabar?", backend=backend, labels=["ms"]) == {}
+
+
+def test_expected_language_outside_top_k_is_scored() -> None:
+    backend = TableBackend(MALAY)
+    assert get_language_probabilities("Apa khabar?", backend=backend, labels=["ms", "zh"]) == {"ms": 0.07}
+    assert contextual_detect(["Apa khabar?"], languages=["ms", "zh"], backend=backend) == ["ms"]
+    assert contextual_detect(["Apa khabar?"], languages=["ms", "zh"], backend=TopKOnlyBackend(backend)) == ["jv"]
+    assert Detector(languages=["ms", "zh"], backend=backend).contextual_detect(["Apa khabar?"]) == ["ms"]
+
+
+def test_detector_caches_restricted_and_full_distributions_separately() -> None:
+    detector = Detector(languages=["ms", "zh"], backend=TableBackend(MALAY), cache_size=10)
+    assert detector.contextual_detect(["Apa khabar?"]) == ["ms"]
+    assert len(detector.probabilities("Apa khabar?")) == 5
@@ -0,0 +1,92 @@
+"""Tests for detection over Arrow and NumPy columns."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+
+from contextual_langdetect import columnar  # noqa: E402
+from contextual_langdetect.backends import TableBackend  # noqa: E402
+from contextual_langdetect.columnar import detect_column  # noqa: E402
+from contextual_langdetect.detection import contextual_detect  # noqa: E402
+
+BACKEND = TableBackend(
+    {
+        "你好": {"zh": 0.95},
+        "很好": {"ja": 0.55, "zh": 0.35},
+        "侬好": {"wuu": 0.60, "zh": 0.30},
+        "Hello": {"en": 0.95},
+        "Short": {"en": 0.60, "zh": 0.30},
+        "Bonjour": {"fr": 0.95},
+        "Salut": {"en": 0.50, "fr": 0.45},
+    }
+)
+
+
+def test_detect_column_matches_contextual_detect() -> None:
+    sentences = ["你好", "很好", "Hello", "Short", "侬好"]
+    result = detect_column(pa.array(sentences), backend=BACKEND)
+    assert result.language.to_pylist() == contextual_detect(sentences, backend=BACKEND)
+    assert result.language.type == pa.dictionary(pa.int32(), pa.string())
+    assert result.confidence.type == pa.float32()
+    confidences = result.confidence.to_pylist()
+    assert confidences[0] == pytest.approx(0.95)
+    # Corrected rows report the probability of the corrected language
+    assert confidences[4] == pytest.approx(0.30)
+
+
+def test_detect_column_nulls_and_empty_rows() -> None:
+    result = detect_column(pa.chunked_array([["你好", None], ["", "Hello"]]), backend=BACKEND)
+    assert result.language.to_pylist() == ["zh", None, None, "en"]
+    assert result.confidence.null_count == 2
+
+
+def test_detect_column_groups_by_document() -> None:
+    # "Salut" is corrected to French in the French document, but stays English in the English one
+    values = pa.array(["Bonjour", "Hello", "Salut", "Bonjour", "Salut", "Hello"])
+    document_ids = pa.array([1, 2, 1, 1, 2, 2])
+    result = detect_column(values, document_ids, backend=BACKEND)
+    assert result.language.to_pylist() == ["fr", "en", "fr", "fr", "en", "en"]
+
+
+def test_detect_column_keeps_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(columnar, "BATCH_SIZE", 2)  # batches that straddle chunk boundaries
+    values = ["Bonjour", "Hello", "Salut", "Bonjour", "Salut", "Hello", "你好"]
+    document_ids = [1, 2, 1, 1, 2, 2, 1]
+    chunked = pa.chunked_array([values[:1], values[1:4], [], values[4:]])
+    assert columnar._to_arrow(chunked) is chunked  # pyright: ignore[reportPrivateUsage]
+
+    expected = detect_column(pa.array(values), pa.array(document_ids), backend=BACKEND)
+    result = detect_column(chunked, pa.chunked_array([document_ids[:3], document_ids[3:]]), backend=BACKEND)
+    assert result.language.to_pylist() == expected.language.to_pylist() == ["fr", "en", "fr", "fr", "en", "en", "zh"]
+    assert detect_column(chunked, backend=BACKEND).language.to_pylist() == contextual_detect(values, backend=BACKEND)
+
+
+def test_detect_column_single_language_skips_empty_rows() -> None:
+    values = pa.chunked_array([["你好", None], ["", "  ", "Hello"]])
+    result = detect_column(values, languages=["zh"], backend=BACKEND)
+    assert result.language.to_pylist() == ["zh", None, None, None, "zh"]
+    assert result.confidence.null_count == 5
+
+
+def test_detect_column_numpy_input() -> None:
+    values = np.array(["你好", "很好", None], dtype=object)
+    document_ids = np.array(["a", "a", "b"], dtype=object)
+    result = detect_column(values, document_ids, backend=BACKEND)
+    assert result.language.to_pylist() == ["zh", "zh", None]
+
+
+def test_detect_column_without_correction() -> None:
+    result = detect_column(pa.array(["你好", "很好"]), context_correction=False, backend=BACKEND)
+    assert result.language.to_pylist() == ["zh", "ja"]
+
+
+def test_detect_column_single_language() -> None:
+    result = detect_column(pa.array(["a", None, "b"]), languages=["en"])
+    assert result.language.to_pylist() == ["en", None, "en"]
+    assert result.confidence.null_count == 3
+
+
+def test_detect_column_length_mismatch() -> None:
+    with pytest.raises(ValueError, match="rows"):
+        detect_column(pa.array(["a"]), pa.array([1, 2]), backend=BACKEND)
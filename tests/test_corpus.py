@@ -0,0 +1,150 @@
+"""Tests for checkpointed corpus detection."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.corpus import CorpusCheckpoint, detect_corpus
+from contextual_langdetect.detection import Language
+
+TABLE = {
+    "中文": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "English": {"en": 0.95},
+    "Bonjour": {"fr": 0.90},
+}
+
+CORPUS = "中文\n很好\n中文\n\nEnglish\nBonjour\n\n\n很好\n中文\n???\n中文\n很好\n中文\n\nEnglish\n"
+
+
+class Interrupted(Exception):
+    pass
+
+
+class InterruptingBackend(TableBackend):
+    """A table backend that fails, as a killed process would stop, on its `after`th prediction."""
+
+    def __init__(self, after: int) -> None:
+        super().__init__(TABLE)
+        self.after = after
+        self.predictions = 0
+
+    def predict(self, text: str) -> tuple[Language, float]:
+        self.predictions += 1
+        if self.predictions == self.after:
+            raise Interrupted
+        return super().predict(text)
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    path = tmp_path / "corpus.txt"
+    path.write_text(CORPUS, encoding="utf-8")
+    return path
+
+
+def run(corpus: Path, name: str, **kwargs: object) -> CorpusCheckpoint:
+    directory = corpus.parent
+    return detect_corpus(
+        corpus,
+        directory / f"{name}.txt",
+        stats_path=directory / f"{name}.jsonl",
+        checkpoint_path=directory / f"{name}.ckpt",
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+def test_output_has_one_line_per_input_line(corpus: Path) -> None:
+    state = run(corpus, "out", backend=TableBackend(TABLE))
+    lines = (corpus.parent / "out.txt").read_text(encoding="utf-8").splitlines()
+    assert lines == ["zh", "zh", "zh", "", "en", "fr", "", "", "zh", "zh", "", "zh", "zh", "zh", "", "en"]
+    assert state.input_lines == 16
+    assert state.documents == 4
+    assert state.language_counts == {"zh": 8, "en": 2, "fr": 1}
+
+    stats = [json.loads(line) for line in (corpus.parent / "out.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert stats[1] == {"line": 5, "lines": 2, "languages": {"en": 1, "fr": 1}}
+    assert stats[2] == {"line": 9, "lines": 6, "languages": {"zh": 5}}
+
+
+@pytest.mark.parametrize("after", [2, 5, 9, 11])
+def test_resume_matches_uninterrupted_run(corpus: Path, after: int) -> None:
+    full = TableBackend(TABLE)
+    expected = run(corpus, "expected", backend=full, checkpoint_lines=1, max_document_lines=2)
+
+    with pytest.raises(Interrupted):
+        run(corpus, "resumed", backend=InterruptingBackend(after), checkpoint_lines=1, max_document_lines=2)
+    backend = TableBackend(TABLE)
+    state = run(corpus, "resumed", backend=backend, checkpoint_lines=1, max_document_lines=2, resume=True)
+    if after > 2:  # the first checkpoint is taken after two predictions
+        assert backend.calls < full.calls
+
+    directory = corpus.parent
+    assert (directory / "resumed.txt").read_bytes() == (directory / "expected.txt").read_bytes()
+    assert (directory / "resumed.jsonl").read_bytes() == (directory / "expected.jsonl").read_bytes()
+    assert state.language_counts == expected.language_counts
+    assert state.documents == expected.documents
+
+
+def test_checkpoint_records_the_document_in_progress(corpus: Path) -> None:
+    states: list[CorpusCheckpoint] = []
+    run(
+        corpus,
+        "out",
+        backend=TableBackend(TABLE),
+        checkpoint_lines=1,
+        max_document_lines=2,
+        on_checkpoint=states.append,
+    )
+
+    # After the first segment of the first document
+    assert states[0].input_lines == 2
+    assert states[0].document_line == 1
+    assert states[0].document_counts == {"zh": 2}
+    assert states[0].output_offset == len("zh\nzh\n")
+    assert CorpusCheckpoint.load(corpus.parent / "out.ckpt") == states[-1]
+
+
+def test_resume_of_a_finished_run_changes_nothing(corpus: Path) -> None:
+    first = run(corpus, "out", backend=TableBackend(TABLE))
+    output = (corpus.parent / "out.txt").read_bytes()
+    second = run(corpus, "out", backend=TableBackend(TABLE), resume=True)
+    assert (corpus.parent / "out.txt").read_bytes() == output
+    assert second == first
+
+
+def test_resume_without_a_checkpoint_starts_over(corpus: Path) -> None:
+    (corpus.parent / "out.txt").write_text("stale\n", encoding="utf-8")
+    run(corpus, "out", backend=TableBackend(TABLE), resume=True)
+    assert (corpus.parent / "out.txt").read_text(encoding="utf-8").startswith("zh\n")
+
+
+def test_resume_with_different_options_is_refused(corpus: Path) -> None:
+    with pytest.raises(Interrupted):
+        run(corpus, "out", backend=InterruptingBackend(5), checkpoint_lines=1)
+    with pytest.raises(ValueError, match="different options"):
+        run(corpus, "out", backend=TableBackend(TABLE), checkpoint_lines=1, context_correction=False, resume=True)
+
+
+def test_resume_with_a_different_stats_path_is_refused(corpus: Path) -> None:
+    with pytest.raises(Interrupted):
+        run(corpus, "out", backend=InterruptingBackend(5), checkpoint_lines=1)
+    with pytest.raises(ValueError, match="different options"):
+        detect_corpus(
+            corpus,
+            corpus.parent / "out.txt",
+            stats_path=corpus.parent / "other.jsonl",
+            checkpoint_path=corpus.parent / "out.ckpt",
+            backend=TableBackend(TABLE),
+            checkpoint_lines=1,
+            resume=True,
+        )
+
+
+def test_checkpoint_round_trip() -> None:
+    state = CorpusCheckpoint({"input": "corpus.txt"}, 10, 2, 6, 0, 0, 1, {"zh": 2}, {"zh": 2})
+    assert CorpusCheckpoint.from_dict(json.loads(json.dumps(state.to_dict()))) == state
+    with pytest.raises(ValueError, match="version"):
+        CorpusCheckpoint.from_dict({**state.to_dict(), "version": 0})
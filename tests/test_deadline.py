@@ -0,0 +1,136 @@
+"""Tests for deadline-aware detection."""
+
+from collections.abc import Mapping, Sequence
+
+import pytest
+
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.deadline import UNKNOWN_LANGUAGE, Deadline, Degradation
+from contextual_langdetect.detection import (
+    LangProbabilities,
+    Language,
+    ModelSize,
+    contextual_detect,
+    count_by_language,
+    get_majority_language,
+)
+
+TABLE = {
+    "中文": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "English": {"en": 0.95},
+}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SlowBackend(TableBackend):
+    """A table backend whose predictions take `predict_cost` and distributions `top_k_cost` fake seconds."""
+
+    def __init__(
+        self, table: Mapping[str, Mapping[Language, float]], clock: FakeClock, predict_cost: float, top_k_cost: float
+    ) -> None:
+        super().__init__(table)
+        self.clock = clock
+        self.predict_cost = predict_cost
+        self.top_k_cost = top_k_cost
+        self.top_k_calls = 0
+
+    def predict(self, text: str) -> tuple[Language, float]:
+        self.clock.now += self.predict_cost
+        return super().predict(text)
+
+    def top_k(self, text: str, k: int = 5) -> LangProbabilities:
+        self.clock.now += self.top_k_cost
+        self.top_k_calls += 1
+        return super().top_k(text, k)
+
+
+def document(n: int) -> Sequence[str]:
+    return (["中文", "中文", "很好", "English"] * n)[: 4 * n]
+
+
+def test_generous_budget_matches_contextual_detect() -> None:
+    clock = FakeClock()
+    backend = SlowBackend(TABLE, clock, 1.0, 1.0)
+    deadline = Deadline(100.0, clock=clock)
+    assert contextual_detect(document(2), backend=backend, deadline=deadline) == contextual_detect(
+        document(2), backend=backend
+    )
+    assert deadline.degradation == Degradation.NONE
+
+
+def test_tight_budget_skips_distribution() -> None:
+    clock = FakeClock()
+    backend = SlowBackend(TABLE, clock, 1.0, 3.0)
+    # 8 sentences at 4s each need 32s; without distributions they need 8s
+    deadline = Deadline(16.0, clock=clock)
+    result = contextual_detect(document(2), backend=backend, deadline=deadline)
+    assert deadline.degradation == Degradation.NO_DISTRIBUTION
+    assert backend.top_k_calls == 1
+    assert UNKNOWN_LANGUAGE not in result
+    # The Japanese-without-kana rule doesn't need the distribution
+    assert result == ["zh", "zh", "zh", "en"] * 2
+
+
+def test_spent_budget_labels_the_rest_unknown() -> None:
+    clock = FakeClock()
+    backend = SlowBackend(TABLE, clock, 1.0, 1.0)
+    deadline = Deadline(5.0, clock=clock)
+    result = contextual_detect(document(2), backend=backend, deadline=deadline)
+    assert deadline.degradation == Degradation.UNKNOWN
+    assert len(result) == 8
+    assert result[-1] == UNKNOWN_LANGUAGE
+    # Sentences reached before the deadline keep their first-pass language: no correction was applied
+    assert result[2] == "ja"
+
+
+def test_zero_budget() -> None:
+    clock = FakeClock()
+    backend = SlowBackend(TABLE, clock, 1.0, 1.0)
+    deadline = Deadline(0.0, clock=clock)
+    assert contextual_detect(document(1), backend=backend, deadline=deadline) == [UNKNOWN_LANGUAGE] * 4
+    assert backend.calls == 0
+
+
+def test_aggregate_helpers_accept_deadline() -> None:
+    clock = FakeClock()
+    backend = SlowBackend(TABLE, clock, 1.0, 1.0)
+    deadline = Deadline(100.0, clock=clock)
+    assert count_by_language(document(1), backend=backend, deadline=deadline) == {"zh": 3, "en": 1}
+    assert get_majority_language(document(1), backend=backend, deadline=Deadline(100.0, clock=clock)) == "zh"
+
+
+def test_step_projects_remaining_time() -> None:
+    clock = FakeClock()
+    deadline = Deadline(10.0, clock=clock)
+    assert deadline.step(0, 10) == Degradation.NONE
+    clock.now = 2.0  # 2s per sentence, 9 sentences left: 18s needed, 8s left
+    assert deadline.step(1, 10) == Degradation.NO_DISTRIBUTION
+    # No measurement at the new level yet: stay
+    assert deadline.step(1, 10) == Degradation.NO_DISTRIBUTION
+    clock.now = 2.5  # 0.5s per sentence at this level, 8 left: 4s needed, 7.5s left
+    assert deadline.step(2, 10) == Degradation.NO_DISTRIBUTION
+    clock.now = 10.0
+    assert deadline.step(3, 10) == Degradation.UNKNOWN
+    assert deadline.expired
+
+
+def test_small_model_replaces_large(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = FakeClock()
+    backends = {
+        ModelSize.LARGE: SlowBackend(TABLE, clock, 4.0, 4.0),
+        ModelSize.SMALL: SlowBackend(TABLE, clock, 0.1, 0.1),
+    }
+    monkeypatch.setattr("contextual_langdetect.detection.default_backend", lambda model: backends[model])
+    deadline = Deadline(20.0, clock=clock)
+    result = contextual_detect(document(2), model=ModelSize.LARGE, deadline=deadline)
+    assert deadline.degradation == Degradation.SMALL_MODEL
+    assert backends[ModelSize.SMALL].calls > 0
+    assert UNKNOWN_LANGUAGE not in result
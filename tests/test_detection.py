@@ -4,16 +4,20 @@ from unittest.mock import patch
 
 import pytest
 
+from contextual_langdetect.backends import TableBackend
 from contextual_langdetect.detection import (
     DetectionResult,
     Language,
     LanguageState,
+    Thresholds,
     contextual_detect,
     count_by_language,
     detect_language,
     get_language_probabilities,
     get_languages_by_count,
     get_majority_language,
+    make_inference,
+    single_language,
 )
 
 
@@ -453,3 +457,69 @@ def test_language_state_initialization() -> None:
     state.record_language("en")
     assert state.language_history is not None
     assert state.language_history["en"] == 1
+
+
+def _code_switched_backend() -> TableBackend:
+    return TableBackend(
+        {
+            "中文": {"zh": 0.95},
+            "English": {"en": 0.95},
+            "Ambiguous": {"ja": 0.50, "en": 0.35, "zh": 0.34},
+        }
+    )
+
+
+def test_contextual_detect_with_window() -> None:
+    """Test that windowed correction uses the local neighborhood instead of the whole document."""
+    backend = _code_switched_backend()
+    # A long Chinese stretch followed by a short English stretch
+    sentences = ["中文"] * 20 + ["English", "Ambiguous", "English"] + ["中文"] * 20 + ["Ambiguous"]
+
+    # Globally, English is below the 10% primary-language threshold, so the ambiguous sentence falls back to zh
+    global_results = contextual_detect(sentences, backend=backend)
+    assert global_results[21] == "zh"
+
+    # Locally, English dominates the neighborhood of the ambiguous sentence
+    local_results = contextual_detect(sentences, backend=backend, window=1)
+    assert local_results[21] == "en"
+    assert local_results[-1] == "zh"
+
+
+def test_contextual_detect_window_covering_document_matches_global() -> None:
+    """Test that a window as large as the document gives the same results as global correction."""
+    backend = _code_switched_backend()
+    sentences = ["中文", "Ambiguous", "English", "中文", "Ambiguous", "English", "Ambiguous"]
+    expected = contextual_detect(sentences, backend=backend)
+    assert contextual_detect(sentences, backend=backend, window=len(sentences)) == expected
+
+
+def test_contextual_detect_window_zero_and_invalid() -> None:
+    """Test edge cases of the window size."""
+    backend = _code_switched_backend()
+    # With a window of zero the only context is the sentence itself, which has no confident detections
+    assert contextual_detect(["中文", "Ambiguous"], backend=backend, window=0) == ["zh", "ja"]
+    with pytest.raises(ValueError, match="window"):
+        contextual_detect(["中文", "Ambiguous"], backend=backend, window=-1)
+
+
+def test_make_inference() -> None:
+    """Test the shared first-pass inference function."""
+    backend = TableBackend({"很好": {"ja": 0.55, "zh": 0.35, "ko": 0.1}})
+    assert make_inference(backend=backend)("很好") == (
+        DetectionResult("ja", 0.55, True),
+        {"ja": 0.55, "zh": 0.35, "ko": 0.1},
+    )
+    assert make_inference(backend=backend, languages=["zh", "en"])("很好")[1] == {"zh": 0.35}
+    assert make_inference(backend=backend, distribution=False)("很好")[1] == {"ja": 0.55}
+    detection, _ = make_inference(backend=backend, thresholds=Thresholds(confidence=0.5))("很好")
+    assert not detection.is_ambiguous
+    with pytest.raises(ValueError):
+        make_inference(backend=backend)(" ")
+
+
+def test_single_language() -> None:
+    """Test the single-expected-language shortcut."""
+    assert single_language(["zh"]) == "zh"
+    assert single_language(["zh", "en"]) is None
+    assert single_language(None) is None
+    assert single_language([]) is None
@@ -0,0 +1,142 @@
+"""Tests for the reusable Detector object."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from contextual_langdetect.detection import ModelSize, Thresholds
+from contextual_langdetect.detector import Detector
+from contextual_langdetect.types import Language
+
+
+def test_detector_precomputes_configuration() -> None:
+    """Test that configuration is resolved once, at construction."""
+    detector = Detector(model=ModelSize.LARGE, languages=["zh", "en", "zh"])
+    assert detector.languages == ("zh", "en")
+
+    with patch("contextual_langdetect.detection.CONFIDENCE_THRESHOLD", 0.99):
+        # Changing the module constant after construction doesn't affect the detector
+        assert detector.thresholds.confidence == Thresholds().confidence
+        assert Detector().thresholds.confidence == 0.99
+
+
+def test_detector_detect_uses_configured_model_and_threshold() -> None:
+    """Test single-sentence detection with custom thresholds."""
+    detector = Detector(model=ModelSize.LARGE, thresholds=Thresholds(confidence=0.9))
+    with (
+        patch("fast_langdetect.detect") as mock_detect,
+        patch("fast_langdetect.detect_multilingual") as mock_multi,
+    ):
+        mock_detect.return_value = {"lang": "en", "score": 0.85}
+        mock_multi.return_value = [{"lang": "en", "score": 0.85}]
+        result = detector.detect("Hello")
+        assert result.language == "en"
+        assert result.is_ambiguous
+        assert mock_detect.call_args.kwargs["low_memory"] is False
+
+
+def test_detector_empty_text() -> None:
+    """Test that empty text raises ValueError."""
+    with pytest.raises(ValueError, match="Empty or whitespace-only text"):
+        Detector().detect("   ")
+
+
+def test_detector_contextual_detect_matches_function() -> None:
+    """Test that Detector.contextual_detect applies the same correction as contextual_detect."""
+    distributions = {
+        "你好": [{"lang": "zh", "score": 0.95}],
+        "侬好": [{"lang": "wuu", "score": 0.60}, {"lang": "zh", "score": 0.30}],
+        "我很好": [{"lang": "zh", "score": 0.90}],
+    }
+    with (
+        patch("fast_langdetect.detect") as mock_detect,
+        patch("fast_langdetect.detect_multilingual") as mock_multi,
+    ):
+        # The warm-up call uses a sentence outside the table
+        mock_detect.side_effect = lambda text, **_: distributions.get(text, distributions["你好"])[0]  # type: ignore
+        mock_multi.side_effect = lambda text, **_: distributions[text]  # type: ignore
+        detector = Detector()
+        assert detector.contextual_detect(list(distributions)) == ["zh", "zh", "zh"]
+        assert detector.contextual_detect(list(distributions), context_correction=False) == ["zh", "wuu", "zh"]
+        assert detector.get_majority_language(list(distributions)) == "zh"
+        assert detector.get_languages_by_count(list(distributions)) == [("zh", 3)]
+
+
+def test_detector_single_language() -> None:
+    """Test that a detector with one expected language assigns it to every sentence."""
+    assert Detector(languages=["en"]).count_by_language(["a", "b"]) == {"en": 2}
+
+
+def test_detector_cache_and_stats() -> None:
+    """Test that cached sentences skip inference and are counted."""
+    detector = Detector(cache_size=2, collect_stats=True)
+    with (
+        patch("fast_langdetect.detect") as mock_detect,
+        patch("fast_langdetect.detect_multilingual") as mock_multi,
+    ):
+        mock_detect.return_value = {"lang": "en", "score": 0.95}
+        mock_multi.return_value = [{"lang": "en", "score": 0.95}]
+        detector.contextual_detect(["one", "two", "one"])
+
+        # One warm-up call plus one call per distinct sentence
+        assert mock_detect.call_count == 3
+        assert mock_multi.call_count == 2
+
+    stats = detector.stats
+    assert stats.calls == 1
+    assert stats.sentences == 3
+    assert stats.cache_hits == 1
+    assert stats.cache_misses == 2
+
+
+def test_detector_cache_eviction() -> None:
+    """Test that the cache is bounded."""
+    detector = Detector(cache_size=1, collect_stats=True)
+    with (
+        patch("fast_langdetect.detect") as mock_detect,
+        patch("fast_langdetect.detect_multilingual") as mock_multi,
+    ):
+        mock_detect.return_value = {"lang": "en", "score": 0.95}
+        mock_multi.return_value = [{"lang": "en", "score": 0.95}]
+        detector.contextual_detect(["one", "two", "one"])
+    assert detector.stats.cache_hits == 0
+
+
+def test_detector_detect_returns_copy_of_cached_result() -> None:
+    """Test that mutating a returned detection does not corrupt the cache."""
+    detector = Detector(cache_size=10)
+    with (
+        patch("fast_langdetect.detect") as mock_detect,
+        patch("fast_langdetect.detect_multilingual") as mock_multi,
+    ):
+        mock_detect.return_value = {"lang": "en", "score": 0.95}
+        mock_multi.return_value = [{"lang": "en", "score": 0.95}]
+        result = detector.detect("one")
+        result.language = Language("fr")
+        result.confidence = 0.0
+        again = detector.detect("one")
+    assert again.language == "en"
+    assert again.confidence == 0.95
+
+
+def test_detector_is_thread_safe() -> None:
+    """Test that concurrent calls on a shared detector produce consistent results."""
+    detector = Detector(cache_size=100, collect_stats=True)
+    sentences = ["Hello world.", "Bonjour le monde.", "Hello again."]
+    expected = detector.contextual_detect(sentences)
+    results: list[list[str]] = []
+
+    def worker() -> None:
+        for _ in range(20):
+            results.append(detector.contextual_detect(sentences))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result == expected for result in results)
+    assert detector.stats.calls == 81
+    assert detector.stats.sentences == 243
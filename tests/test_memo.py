@@ -0,0 +1,114 @@
+"""Tests for the document-level result memo."""
+
+from collections.abc import Iterator
+
+import pytest
+
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.deadline import Deadline
+from contextual_langdetect.detection import (
+    contextual_detect,
+    count_by_language,
+    get_languages_by_count,
+    get_majority_language,
+)
+from contextual_langdetect.memo import (
+    DocumentMemo,
+    disable_document_memo,
+    document_digest,
+    enable_document_memo,
+    get_document_memo,
+)
+from contextual_langdetect.metrics import disable_metrics, enable_metrics
+
+TABLE = {
+    "你好": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "Hello": {"en": 0.95},
+}
+SENTENCES = ["你好", "很好", "Hello", "你好"]
+
+
+@pytest.fixture
+def memo() -> Iterator[DocumentMemo]:
+    yield enable_document_memo(maxsize=2)
+    disable_document_memo()
+
+
+def test_disabled_by_default() -> None:
+    assert get_document_memo() is None
+
+
+def test_digest_includes_sentence_boundaries() -> None:
+    assert document_digest(["ab", "c"]) != document_digest(["a", "bc"])
+    assert document_digest(["ab", "c"]) == document_digest(("ab", "c"))
+    assert len(document_digest([])) == 16
+
+
+def test_repeated_documents_skip_the_pipeline(memo: DocumentMemo) -> None:
+    backend = TableBackend(TABLE)
+    first = contextual_detect(SENTENCES, backend=backend)
+    calls = backend.calls
+
+    assert contextual_detect(SENTENCES, backend=backend) == first == ["zh", "zh", "en", "zh"]
+    assert get_majority_language(SENTENCES, backend=backend) == "zh"
+    assert count_by_language(SENTENCES, backend=backend) == {"zh": 3, "en": 1}
+    assert get_languages_by_count(SENTENCES, backend=backend) == [("zh", 3), ("en", 1)]
+    assert backend.calls == calls
+    assert len(memo) == 1
+
+
+def test_results_are_copies(memo: DocumentMemo) -> None:
+    backend = TableBackend(TABLE)
+    contextual_detect(SENTENCES, backend=backend).append("xx")
+    assert contextual_detect(SENTENCES, backend=backend) == ["zh", "zh", "en", "zh"]
+
+
+def test_options_are_part_of_the_key(memo: DocumentMemo) -> None:
+    backend = TableBackend(TABLE)
+    assert contextual_detect(SENTENCES, backend=backend) == ["zh", "zh", "en", "zh"]
+    assert contextual_detect(SENTENCES, backend=backend, context_correction=False) == ["zh", "ja", "en", "zh"]
+    assert contextual_detect(SENTENCES, backend=TableBackend({}, default={"fr": 0.9})) == ["fr"] * 4
+    assert len(memo) == 2  # maxsize
+
+
+def test_least_recently_used_document_is_evicted(memo: DocumentMemo) -> None:
+    backend = TableBackend(TABLE)
+    contextual_detect(["你好"], backend=backend)
+    contextual_detect(["Hello"], backend=backend)
+    contextual_detect(["你好"], backend=backend)
+    contextual_detect(["很好"], backend=backend)  # evicts ["Hello"]
+    calls = backend.calls
+
+    contextual_detect(["你好"], backend=backend)
+    assert backend.calls == calls
+    contextual_detect(["Hello"], backend=backend)
+    assert backend.calls > calls
+
+
+def test_degraded_results_are_not_stored(memo: DocumentMemo) -> None:
+    contextual_detect(SENTENCES, backend=TableBackend(TABLE), deadline=Deadline(-1.0))
+    assert len(memo) == 0
+    contextual_detect(SENTENCES, backend=TableBackend(TABLE), deadline=Deadline(60.0))
+    assert len(memo) == 1
+
+
+def test_many_languages_are_stored() -> None:
+    memo = DocumentMemo()
+    languages = [f"l{i}" for i in range(300)]
+    memo.put("key", languages)
+    assert memo.get("key") == languages
+    with pytest.raises(ValueError):
+        DocumentMemo(0)
+
+
+def test_lookups_are_counted(memo: DocumentMemo) -> None:
+    backend = TableBackend(TABLE)
+    registry = enable_metrics()
+    try:
+        contextual_detect(SENTENCES, backend=backend)
+        get_majority_language(SENTENCES, backend=backend)
+    finally:
+        disable_metrics()
+    assert registry.value("cache_requests_total", cache="document", result="miss") == 1
+    assert registry.value("cache_requests_total", cache="document", result="hit") == 1
@@ -0,0 +1,116 @@
+"""Tests for the optional metrics registry."""
+
+import urllib.request
+from collections.abc import Iterator
+
+import pytest
+
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.detection import ModelSize, contextual_detect, get_majority_language
+from contextual_langdetect.detector import Detector
+from contextual_langdetect.metrics import (
+    MetricsRegistry,
+    disable_metrics,
+    enable_metrics,
+    get_registry,
+    serve_metrics,
+)
+
+TABLE = {
+    "中文": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "吴语": {"wuu": 0.50, "zh": 0.40},
+    "English": {"en": 0.95},
+    "Okay": {"en": 0.60, "zh": 0.31},
+}
+
+
+@pytest.fixture
+def registry() -> Iterator[MetricsRegistry]:
+    yield enable_metrics()
+    disable_metrics()
+
+
+def test_metrics_are_disabled_by_default() -> None:
+    assert get_registry() is None
+    # Instrumented code runs without a registry
+    assert contextual_detect(["中文"], backend=TableBackend(TABLE)) == ["zh"]
+
+
+def test_entry_point_calls_and_sentences(registry: MetricsRegistry) -> None:
+    backend = TableBackend(TABLE)
+    contextual_detect(["中文", "English"], backend=backend)
+    get_majority_language(["中文", "中文", "English"], backend=backend)
+
+    assert registry.value("calls_total", entry_point="contextual_detect") == 1
+    assert registry.value("sentences_total", entry_point="contextual_detect") == 2
+    # Nested calls are attributed only to the outermost entry point
+    assert registry.value("calls_total", entry_point="get_majority_language") == 1
+    assert registry.value("sentences_total", entry_point="get_majority_language") == 3
+    assert registry.value("calls_total", entry_point="count_by_language") == 0
+    assert registry.value("calls_total", entry_point="detect_language") == 0
+
+
+def test_inference_latency_by_model(registry: MetricsRegistry) -> None:
+    contextual_detect(["中文", "English"], model=ModelSize.LARGE, backend=TableBackend(TABLE))
+    # One detection and one distribution per sentence
+    assert registry.value("inference_seconds", model="large") == 4
+    assert registry.value("inference_seconds", model="small") == 0
+
+
+def test_ambiguous_sentences_and_correction_rules(registry: MetricsRegistry) -> None:
+    sentences = ["中文", "中文", "很好", "吴语", "English", "Okay"]
+    assert contextual_detect(sentences, backend=TableBackend(TABLE)) == ["zh", "zh", "zh", "zh", "en", "en"]
+
+    assert registry.value("sentences_detected_total") == 6
+    assert registry.value("sentences_ambiguous_total") == 3
+    assert registry.value("corrections_total", rule="wuu_as_zh") == 1
+    assert registry.value("corrections_total", rule="ja_without_kana_as_zh") == 1
+    # "Okay" is ambiguous but its best primary language is the detected one: not a correction
+    assert registry.value("corrections_total", rule="primary_language") == 0
+
+
+def test_detector_cache_hits(registry: MetricsRegistry) -> None:
+    detector = Detector(backend=TableBackend(TABLE), cache_size=10)
+    detector.contextual_detect(["中文", "English", "中文"])
+
+    assert registry.value("cache_requests_total", cache="detector", result="hit") == 1
+    assert registry.value("cache_requests_total", cache="detector", result="miss") == 2
+    assert registry.value("calls_total", entry_point="Detector.contextual_detect") == 1
+
+
+def test_render_prometheus_text_format() -> None:
+    registry = MetricsRegistry()
+    registry.inc("calls_total", entry_point='say "hi"')
+    registry.observe("inference_seconds", 0.0002, model="small")
+    registry.observe("inference_seconds", 2.0, model="small")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE contextual_langdetect_calls_total counter" in lines
+    assert 'contextual_langdetect_calls_total{entry_point="say \\"hi\\""} 1' in lines
+    assert "# TYPE contextual_langdetect_inference_seconds histogram" in lines
+    assert 'contextual_langdetect_inference_seconds_bucket{model="small",le="0.0001"} 0' in lines
+    assert 'contextual_langdetect_inference_seconds_bucket{model="small",le="0.00025"} 1' in lines
+    assert 'contextual_langdetect_inference_seconds_bucket{model="small",le="1"} 1' in lines
+    assert 'contextual_langdetect_inference_seconds_bucket{model="small",le="+Inf"} 2' in lines
+    assert 'contextual_langdetect_inference_seconds_count{model="small"} 2' in lines
+    # Metrics without samples are omitted
+    assert not any("corrections_total" in line for line in lines)
+
+
+def test_unknown_metric_raises() -> None:
+    with pytest.raises(KeyError):
+        MetricsRegistry().inc("no_such_metric")
+
+
+def test_serve_metrics(registry: MetricsRegistry) -> None:
+    registry.inc("calls_total", entry_point="contextual_detect")
+    server = serve_metrics(0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            body = response.read().decode()
+        assert 'contextual_langdetect_calls_total{entry_point="contextual_detect"} 1' in body
+    finally:
+        server.shutdown()
+        server.server_close()
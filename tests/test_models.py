@@ -0,0 +1,86 @@
+"""Tests for local model files and offline configuration."""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import fast_langdetect
+import pytest
+
+from contextual_langdetect.backends import FastLangDetectBackend, configure_models, default_backend, set_default_backend
+from contextual_langdetect.detection import ModelSize, detect_language
+from contextual_langdetect.exceptions import ModelVerificationError
+from contextual_langdetect.models import LocalModel, file_sha256, sidecar_path, verify_model
+
+BUNDLED_SMALL_MODEL = Path(fast_langdetect.__file__).parent / "resources" / "lid.176.ftz"
+
+
+@pytest.fixture
+def model_file(tmp_path: Path) -> Path:
+    path = tmp_path / "model.bin"
+    path.write_bytes(b"not really a model")
+    return path
+
+
+@pytest.fixture
+def restore_default_backends() -> Iterator[None]:
+    saved = {size: default_backend(size) for size in ModelSize}
+    yield
+    for size, backend in saved.items():
+        set_default_backend(size, backend)
+
+
+def test_verify_model_records_sidecar(model_file: Path) -> None:
+    model = LocalModel(model_file, sha256=file_sha256(model_file))
+    assert verify_model(model) is True
+    assert sidecar_path(model_file).exists()
+    # The sidecar matches: no re-hashing
+    assert verify_model(model) is False
+
+
+def test_verify_model_rehashes_changed_file(model_file: Path) -> None:
+    model = LocalModel(model_file, sha256=file_sha256(model_file))
+    verify_model(model)
+    stat = model_file.stat()
+    os.utime(model_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert verify_model(model) is True
+
+
+def test_verify_model_rejects_wrong_hash(model_file: Path) -> None:
+    with pytest.raises(ModelVerificationError):
+        verify_model(LocalModel(model_file, sha256="0" * 64))
+    assert not sidecar_path(model_file).exists()
+
+
+def test_verify_model_does_not_trust_sidecar_for_other_hash(model_file: Path) -> None:
+    verify_model(LocalModel(model_file, sha256=file_sha256(model_file)))
+    with pytest.raises(ModelVerificationError):
+        verify_model(LocalModel(model_file, sha256="0" * 64))
+
+
+def test_verify_model_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        verify_model(LocalModel(tmp_path / "missing.bin"))
+    with pytest.raises(FileNotFoundError):
+        FastLangDetectBackend(ModelSize.LARGE, LocalModel(tmp_path / "missing.bin"))
+
+
+def test_backend_loads_local_model() -> None:
+    backend = FastLangDetectBackend(ModelSize.LARGE, LocalModel(BUNDLED_SMALL_MODEL))
+    language, confidence = backend.predict("Hello, how are you today?")
+    assert language == "en"
+    assert confidence > 0.5
+    assert "en" in backend.top_k("Hello, how are you today?")
+
+
+@pytest.mark.usefixtures("restore_default_backends")
+def test_configure_models_replaces_default_backend(tmp_path: Path) -> None:
+    path = tmp_path / "lid.ftz"
+    path.write_bytes(BUNDLED_SMALL_MODEL.read_bytes())
+    configure_models({ModelSize.LARGE: LocalModel(path, sha256=file_sha256(path))})
+
+    backend = default_backend(ModelSize.LARGE)
+    assert isinstance(backend, FastLangDetectBackend)
+    assert backend.local_model is not None and backend.local_model.path == path
+    assert detect_language("Bonjour, comment allez-vous ?", model=ModelSize.LARGE).language == "fr"
+    assert sidecar_path(path).exists()
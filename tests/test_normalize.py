@@ -0,0 +1,137 @@
+"""Tests for the text normalization stage."""
+
+import pytest
+
+from contextual_langdetect.backends import FastLangDetectBackend, TableBackend, default_backend, set_default_backend
+from contextual_langdetect.deadline import Deadline
+from contextual_langdetect.detection import ModelSize, contextual_detect, count_by_language
+from contextual_langdetect.detector import Detector
+from contextual_langdetect.memo import disable_document_memo, enable_document_memo
+from contextual_langdetect.normalize import Lowercase, TextNormalizer
+
+TABLE = {
+    "中文": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "hello there": {"en": 0.95},
+}
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("  hello \t there\n", "hello there"),
+        ("hello\r\n\r\nthere", "hello there"),
+        ("hel\x00lo​ there﻿", "hello there"),
+        ("‮hello there‬", "hello there"),
+        ("می‌خواهم", "می‌خواهم"),  # zero-width non-joiners are part of the text
+        ("HELLO THERE", "hello there"),
+        ("Hello There", "Hello There"),
+        ("   ", ""),
+    ],
+)
+def test_normalize(text: str, expected: str) -> None:
+    assert TextNormalizer().normalize(text) == expected
+
+
+def test_lowercase_modes() -> None:
+    assert TextNormalizer(lowercase=Lowercase.NEVER).normalize("HELLO THERE") == "HELLO THERE"
+    assert TextNormalizer(lowercase=Lowercase.ALWAYS).normalize("Hello There") == "hello there"
+    assert TextNormalizer().normalize("NASA said hello") == "NASA said hello"
+    assert TextNormalizer().normalize("NASA SAID HELLO ok") == "nasa said hello ok"
+
+
+def test_strip_urls_and_emoji() -> None:
+    text = "see https://example.com/a?b=c and www.example.org 👍🏽 ok 👨‍👩‍👧 ❤️"
+    assert TextNormalizer().normalize(text) == text
+    assert TextNormalizer(strip_urls=True).normalize(text) == "see and 👍🏽 ok 👨‍👩‍👧 ❤️"
+    assert TextNormalizer(strip_emoji=True).normalize(text) == "see https://example.com/a?b=c and www.example.org ok"
+    assert TextNormalizer(strip_urls=True, strip_emoji=True).normalize("👍 https://example.com") == ""
+
+
+def test_normalize_batch_normalizes_repeats_once() -> None:
+    calls: list[str] = []
+
+    class CountingNormalizer(TextNormalizer):
+        def normalize(self, text: str) -> str:
+            calls.append(text)
+            return super().normalize(text)
+
+    assert CountingNormalizer().normalize_batch([" a ", "b", " a ", "b"]) == ["a", "b", "a", "b"]
+    assert calls == [" a ", "b"]
+
+
+def test_contextual_detect_infers_normalized_sentences_once() -> None:
+    backend = TableBackend(TABLE)
+    sentences = ["中文", " 很好\n", "中文", "HELLO  THERE", "hello\tthere", "\x00"]
+    result = contextual_detect(sentences, backend=backend, normalizer=TextNormalizer())
+    assert result == ["zh", "zh", "zh", "en", "en"]
+    assert backend.calls == 6  # a prediction and a distribution for each of the three distinct sentences
+
+
+def test_normalizer_applies_with_a_deadline() -> None:
+    sentences = ["中文", " 很好\n", "HELLO THERE"]
+    result = contextual_detect(
+        sentences, backend=TableBackend(TABLE), deadline=Deadline(60.0), normalizer=TextNormalizer()
+    )
+    assert result == ["zh", "zh", "en"]
+
+
+def test_aggregates_pass_normalizer_through() -> None:
+    counts = count_by_language(
+        ["中文", "中文 ", "HELLO THERE"], backend=TableBackend(TABLE), normalizer=TextNormalizer()
+    )
+    assert counts == {"zh": 2, "en": 1}
+
+
+def test_memo_is_keyed_by_normalized_text() -> None:
+    memo = enable_document_memo()
+    try:
+        backend = TableBackend(TABLE)
+        normalizer = TextNormalizer()
+        contextual_detect(["中文", "hello there"], backend=backend, normalizer=normalizer)
+        contextual_detect([" 中文 ", "HELLO\nTHERE"], backend=backend, normalizer=normalizer)
+        assert len(memo) == 1
+        assert backend.calls == 4
+    finally:
+        disable_document_memo()
+
+
+def test_detector_caches_normalized_text() -> None:
+    backend = TableBackend(TABLE)
+    detector = Detector(backend=backend, normalizer=TextNormalizer(), cache_size=10)
+    assert detector.detect(" HELLO THERE ").language == "en"
+    assert detector.probabilities("hello\nthere") == {"en": 0.95}
+    assert detector.contextual_detect(["中文", "很好", " 中文"]) == ["zh", "zh", "zh"]
+    assert len(detector._cache or ()) == 3  # pyright: ignore[reportPrivateUsage]
+
+
+def test_detector_infers_repeats_once_without_a_cache() -> None:
+    backend = TableBackend(TABLE)
+    detector = Detector(backend=backend, normalizer=TextNormalizer())
+    detector.warm_up()
+    calls = backend.calls
+    detector.contextual_detect(["中文", "中文 ", "中文\n"])
+    assert backend.calls - calls == 2
+
+
+def test_unnormalized_default_backend() -> None:
+    backend = default_backend(ModelSize.SMALL, normalize_input=False)
+    assert backend is default_backend(ModelSize.SMALL, normalize_input=False)
+    assert backend is not default_backend(ModelSize.SMALL)
+    assert not backend.normalize_input
+    assert Detector(normalizer=TextNormalizer()).backend is backend
+
+
+def test_setting_the_default_backend_replaces_its_unnormalized_variant() -> None:
+    original = default_backend(ModelSize.LARGE)
+    unnormalized = default_backend(ModelSize.LARGE, normalize_input=False)
+    try:
+        set_default_backend(ModelSize.LARGE, FastLangDetectBackend(ModelSize.LARGE))
+        assert default_backend(ModelSize.LARGE, normalize_input=False) is not unnormalized
+    finally:
+        set_default_backend(ModelSize.LARGE, original)
+
+
+def test_unnormalized_backend_predicts_normalized_text() -> None:
+    text = TextNormalizer().normalize("THIS IS AN ENGLISH SENTENCE")
+    assert FastLangDetectBackend(normalize_input=False).predict(text)[0] == "en"
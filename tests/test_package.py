@@ -0,0 +1,31 @@
+"""Tests for the package's lazy public namespace."""
+
+import subprocess
+import sys
+
+import pytest
+
+import contextual_langdetect
+
+
+def test_public_names_resolve() -> None:
+    for name in contextual_langdetect.__all__:
+        assert getattr(contextual_langdetect, name) is not None
+    assert set(contextual_langdetect.__all__) <= set(dir(contextual_langdetect))
+
+
+def test_unknown_name_raises_attribute_error() -> None:
+    with pytest.raises(AttributeError):
+        _ = contextual_langdetect.no_such_name  # type: ignore[attr-defined]
+
+
+def test_import_does_not_load_fast_langdetect() -> None:
+    code = (
+        "import sys\n"
+        "import contextual_langdetect\n"
+        "from contextual_langdetect import LanguageState, LanguageDetectionError, Detector\n"
+        "assert 'fast_langdetect' not in sys.modules, 'loaded at import'\n"
+        "contextual_langdetect.detect_language('Hello, how are you today?')\n"
+        "assert 'fast_langdetect' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,75 @@
+"""Tests for concurrent detection on a thread pool."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from contextual_langdetect.backends import FastLangDetectBackend, TableBackend
+from contextual_langdetect.detection import contextual_detect
+from contextual_langdetect.detector import Detector
+from contextual_langdetect.parallel import contextual_detect_many
+
+TABLE = {
+    "中文": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "English": {"en": 0.95},
+    "Okay": {"en": 0.60, "zh": 0.31},
+}
+
+DOCUMENTS = [
+    ["中文", "很好", "中文"],
+    ["English", "Okay"],
+    ["很好", "English", "Okay", "English"],
+    [],
+] * 5
+
+
+def test_contextual_detect_many_matches_sequential() -> None:
+    backend = TableBackend(TABLE)
+    expected = [contextual_detect(document, backend=backend) for document in DOCUMENTS]
+    assert contextual_detect_many(DOCUMENTS, backend=backend, max_workers=4) == expected
+
+
+def test_contextual_detect_many_with_executor() -> None:
+    backend = TableBackend(TABLE)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = contextual_detect_many(DOCUMENTS[:3], backend=backend, executor=executor)
+    assert result == [["zh", "zh", "zh"], ["en", "en"], ["ja", "en", "en", "en"]]
+
+
+def test_contextual_detect_many_propagates_errors() -> None:
+    with pytest.raises(ValueError):
+        contextual_detect_many([["中文"]], backend=TableBackend(TABLE), window=-1)
+
+
+def test_detector_contextual_detect_many() -> None:
+    detector = Detector(backend=TableBackend(TABLE), cache_size=100)
+    assert detector.contextual_detect_many(DOCUMENTS, max_workers=4) == [
+        detector.contextual_detect(document) for document in DOCUMENTS
+    ]
+
+
+def test_backend_loads_model_once_under_concurrency() -> None:
+    backend = FastLangDetectBackend()
+    calls = 0
+    lock = threading.Lock()
+
+    def slow_detect(text: str, **kwargs: Any) -> dict[str, Any]:
+        nonlocal calls
+        with lock:
+            calls += 1
+        time.sleep(0.01)
+        return {"lang": "en", "score": 0.9}
+
+    with patch("fast_langdetect.detect", side_effect=slow_detect):
+        threads = [threading.Thread(target=backend.load) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        backend.load()
+    assert calls == 1
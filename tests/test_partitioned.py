@@ -0,0 +1,135 @@
+"""Tests for language-partitioned columnar output."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from contextual_langdetect.backends import TableBackend  # noqa: E402
+from contextual_langdetect.corpus import detect_corpus  # noqa: E402
+from contextual_langdetect.partitioned import (  # noqa: E402
+    SCHEMA,
+    PartitionedWriter,
+    language_counts,
+    part_path,
+    read_language,
+    remove_parts,
+)
+
+TABLE = {
+    "中文": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "English": {"en": 0.95},
+    "Bonjour": {"fr": 0.90},
+}
+
+CORPUS = "中文\n很好\n中文\n\nEnglish\nBonjour\n\n\n很好\n中文\n???\n中文\n很好\n中文\n\nEnglish\n"
+
+
+class Interrupted(Exception):
+    pass
+
+
+class InterruptingBackend(TableBackend):
+    def __init__(self, after: int) -> None:
+        super().__init__(TABLE)
+        self.after = after
+        self.predictions = 0
+
+    def predict(self, text: str) -> tuple[str, float]:
+        self.predictions += 1
+        if self.predictions == self.after:
+            raise Interrupted
+        return super().predict(text)
+
+
+def test_batches_hold_one_language(tmp_path: Path) -> None:
+    writer = PartitionedWriter(tmp_path, batch_rows=2)
+    for line, language in enumerate(["zh", "en", "zh", "zh", "ja", "en"], start=1):
+        writer.add(0, line, line - 1, language, 0.9, False)
+    assert writer.close() == 1
+
+    index = json.loads((tmp_path / "part-00000.arrow.json").read_text(encoding="utf-8"))
+    assert index["rows"] == 6
+    assert index["languages"] == {
+        "en": {"batches": [1], "rows": 2},
+        "ja": {"batches": [2], "rows": 1},
+        "zh": {"batches": [0, 3], "rows": 3},
+    }
+    reader = pa.ipc.open_file(pa.memory_map(str(part_path(tmp_path, 0))))
+    assert reader.schema == SCHEMA
+    for i in range(reader.num_record_batches):
+        assert len(set(reader.get_batch(i).column("language").to_pylist())) == 1
+
+
+def test_read_language_across_parts(tmp_path: Path) -> None:
+    writer = PartitionedWriter(tmp_path)
+    writer.add(0, 1, 0, "zh", 0.9, False)
+    writer.add(0, 2, 1, "ja", 0.5, True)
+    assert writer.close_part() == 1
+    assert writer.close_part() == 1  # an empty part is not written
+    writer.add(1, 4, 0, "zh", None, False)
+    assert writer.close() == 2
+
+    table = read_language(tmp_path, "zh")
+    assert table.column("line").to_pylist() == [1, 4]
+    assert table.column("confidence").to_pylist() == [pytest.approx(0.9), None]
+    assert read_language(tmp_path, "ja", columns=["line", "ambiguous"]).to_pylist() == [{"line": 2, "ambiguous": True}]
+    assert read_language(tmp_path, "en").num_rows == 0
+    assert language_counts(tmp_path) == {"zh": 2, "ja": 1}
+
+
+def test_unfinished_parts_are_ignored_and_removed(tmp_path: Path) -> None:
+    writer = PartitionedWriter(tmp_path)
+    writer.add(0, 1, 0, "zh", 0.9, False)
+    writer.close()
+    writer.add(0, 2, 1, "zh", 0.9, False)
+    writer.close_part()
+    (tmp_path / "part-00001.arrow.json").unlink()  # as if the run stopped while writing it
+
+    assert read_language(tmp_path, "zh").num_rows == 1
+    remove_parts(tmp_path, 1)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["part-00000.arrow", "part-00000.arrow.json"]
+
+
+def test_corpus_columnar_output(tmp_path: Path) -> None:
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text(CORPUS, encoding="utf-8")
+    state = detect_corpus(corpus, tmp_path / "out.txt", columnar_path=tmp_path / "out", backend=TableBackend(TABLE))
+
+    assert language_counts(tmp_path / "out") == state.language_counts
+    zh = read_language(tmp_path / "out", "zh")
+    assert zh.column("line").to_pylist() == [1, 2, 3, 9, 10, 12, 13, 14]
+    assert zh.column("document").to_pylist() == [0, 0, 0, 2, 2, 2, 2, 2]
+    assert zh.column("offset").to_pylist() == [0, 1, 2, 0, 1, 3, 4, 5]
+    assert zh.column("ambiguous").to_pylist() == [False, True, False, True, False, False, True, False]
+    assert zh.column("confidence").to_pylist()[1] == pytest.approx(0.35)  # corrected from ja
+    assert read_language(tmp_path / "out", "en").column("document").to_pylist() == [1, 3]
+
+
+@pytest.mark.parametrize("after", [2, 5, 9, 11])
+def test_resumed_columnar_output_matches_uninterrupted_run(tmp_path: Path, after: int) -> None:
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text(CORPUS, encoding="utf-8")
+
+    def run(name: str, backend: TableBackend, resume: bool = False) -> None:
+        detect_corpus(
+            corpus,
+            tmp_path / f"{name}.txt",
+            checkpoint_path=tmp_path / f"{name}.ckpt",
+            columnar_path=tmp_path / name,
+            resume=resume,
+            checkpoint_lines=1,
+            max_document_lines=2,
+            backend=backend,
+        )
+
+    run("expected", TableBackend(TABLE))
+    with pytest.raises(Interrupted):
+        run("resumed", InterruptingBackend(after))
+    run("resumed", TableBackend(TABLE), resume=True)
+
+    for language in ["zh", "en", "fr"]:
+        assert read_language(tmp_path / "resumed", language) == read_language(tmp_path / "expected", language)
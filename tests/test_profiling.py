@@ -0,0 +1,69 @@
+"""Tests for the timing and profiling helpers used by the tools."""
+
+import pstats
+import time
+from pathlib import Path
+
+from rich.console import Console
+
+from contextual_langdetect.profiling import LineTiming, Timings, profile
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_timings_percentiles_and_slowest() -> None:
+    timings = Timings(lines=[LineTiming(n, f"line {n}", n / 1000) for n in range(1, 101)])
+    percentiles = timings.percentiles()
+    assert percentiles["min"] == 0.001
+    assert percentiles["max"] == 0.1
+    assert abs(percentiles["p50"] - 0.0505) < 1e-9
+    assert [line.line_number for line in timings.slowest(3)] == [100, 99, 98]
+
+
+def test_timings_records_lines_and_phases() -> None:
+    timings = Timings()
+    with timings.phase("inference"):
+        with timings.line(1, "first"):
+            _busy(0.001)
+        with timings.line(2, "second"):
+            pass
+    assert [line.line_number for line in timings.lines] == [1, 2]
+    assert timings.lines[0].seconds >= 0.001
+    assert timings.phase_seconds["inference"] >= timings.lines[0].seconds
+    assert Timings().percentiles() == {}
+    assert set(Timings(lines=timings.lines[:1]).percentiles()) == {"min", "max"}
+
+
+def test_timings_print() -> None:
+    console = Console(record=True, width=120)
+    timings = Timings(phase_seconds={"inference": 0.5}, lines=[LineTiming(7, "slow line", 0.002)])
+    timings.print(console)
+    output = console.export_text()
+    assert "inference" in output
+    assert "slow line" in output
+    assert "2000 µs" in output
+
+
+def test_profile_writes_pstats(tmp_path: Path) -> None:
+    path = tmp_path / "run.prof"
+    with profile(path):
+        _busy(0.01)
+    stats = pstats.Stats(str(path))
+    assert any(function == "_busy" for _, _, function in stats.stats)
+
+
+def test_profile_writes_collapsed_stacks(tmp_path: Path) -> None:
+    path = tmp_path / "run.folded"
+    with profile(path):
+        _busy(0.05)
+    lines = path.read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack
+    assert any("_busy (test_profiling.py" in line for line in lines)
@@ -0,0 +1,161 @@
+"""Tests for progress reporting and cancellation."""
+
+from collections.abc import Mapping
+
+import pytest
+
+from contextual_langdetect import detection
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.deadline import Deadline
+from contextual_langdetect.detection import Language, contextual_detect, count_by_language
+from contextual_langdetect.detector import Detector
+from contextual_langdetect.memo import disable_document_memo, enable_document_memo
+from contextual_langdetect.progress import CancellationToken, Progress
+from contextual_langdetect.short_inputs import ShortInputPolicy
+
+TABLE = {
+    "中文": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "English": {"en": 0.95},
+    "ok": {"en": 0.60},
+    "中文句子": {"zh": 0.95},
+}
+
+DOCUMENT = ["中文", "很好", "中文", "English"] * 5
+
+
+class CancellingBackend(TableBackend):
+    """A table backend that cancels `token` once it has made `after` predictions."""
+
+    def __init__(self, table: Mapping[str, Mapping[Language, float]], token: CancellationToken, after: int) -> None:
+        super().__init__(table)
+        self.token = token
+        self.after = after
+        self.predictions = 0
+
+    def predict(self, text: str) -> tuple[Language, float]:
+        self.predictions += 1
+        if self.predictions == self.after:
+            self.token.cancel()
+        return super().predict(text)
+
+
+@pytest.fixture(autouse=True)
+def small_interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(detection, "PROGRESS_INTERVAL", 4)
+
+
+def test_progress_is_reported_each_interval() -> None:
+    reports: list[Progress] = []
+    contextual_detect(DOCUMENT[:10], backend=TableBackend(TABLE), progress=reports.append)
+    assert [(report.done, report.total) for report in reports] == [(4, 10), (8, 10), (10, 10)]
+    assert all(report.elapsed >= 0 for report in reports)
+    assert reports[-1].fraction == 1.0
+
+
+def test_progress_properties() -> None:
+    progress = Progress(done=50, total=200, elapsed=2.0)
+    assert progress.fraction == 0.25
+    assert progress.sentences_per_second == 25.0
+    assert progress.remaining_seconds == 6.0
+    assert Progress(done=0, total=10, elapsed=0.0).remaining_seconds is None
+    assert Progress(done=0, total=0, elapsed=0.0).fraction == 1.0
+
+
+def test_uncancelled_call_processes_everything() -> None:
+    token = CancellationToken()
+    backend = TableBackend(TABLE)
+    assert contextual_detect(DOCUMENT, backend=backend, cancel=token) == contextual_detect(DOCUMENT, backend=backend)
+    assert not token.cancelled
+    assert token.processed == len(DOCUMENT)
+
+
+def test_cancellation_returns_the_corrected_prefix() -> None:
+    token = CancellationToken()
+    backend = CancellingBackend(TABLE, token, after=6)
+    result = contextual_detect(DOCUMENT, backend=backend, cancel=token)
+
+    # The interval in progress when the token was cancelled is finished
+    assert token.processed == 8
+    assert result == contextual_detect(DOCUMENT[:8], backend=TableBackend(TABLE))
+    assert result[1] == "zh"  # corrected with the context of the prefix
+
+
+def test_cancellation_before_the_call_returns_nothing() -> None:
+    token = CancellationToken()
+    token.cancel()
+    assert contextual_detect(DOCUMENT, backend=TableBackend(TABLE), cancel=token) == []
+    assert token.processed == 0
+
+
+def test_cancellation_without_correction_returns_first_pass_prefix() -> None:
+    token = CancellationToken()
+    backend = CancellingBackend(TABLE, token, after=1)
+    result = contextual_detect(DOCUMENT, backend=backend, context_correction=False, cancel=token)
+    assert result == ["zh", "ja", "zh", "en"]
+    assert token.processed == 4
+
+
+def test_cancellation_with_short_inputs_keeps_inherited_prefix() -> None:
+    sentences = ["中文句子", "ok", "中文句子", "中文句子", "中文句子", "ok", "English", "English"]
+    token = CancellationToken()
+    backend = CancellingBackend(TABLE, token, after=1)
+    result = contextual_detect(
+        sentences, backend=backend, short_inputs=ShortInputPolicy(max_chars=2, max_tokens=0), cancel=token
+    )
+
+    # The first interval infers sentences 0, 2, 3 and 4; "ok" at 5 inherits too, up to the next inferred sentence
+    assert token.processed == 6
+    assert result == ["zh"] * 6
+
+
+def test_cancelled_results_are_not_memoized() -> None:
+    memo = enable_document_memo()
+    try:
+        token = CancellationToken()
+        contextual_detect(DOCUMENT, backend=CancellingBackend(TABLE, token, after=1), cancel=token)
+        assert len(memo) == 0
+
+        token = CancellationToken()
+        contextual_detect(DOCUMENT, backend=TableBackend(TABLE), cancel=token)
+        assert len(memo) == 1
+        token = CancellationToken()
+        contextual_detect(DOCUMENT, backend=TableBackend(TABLE), cancel=token)
+        assert token.processed == len(DOCUMENT)
+    finally:
+        disable_document_memo()
+
+
+def test_cancellation_with_deadline() -> None:
+    token = CancellationToken()
+    backend = CancellingBackend(TABLE, token, after=3)
+    reports: list[Progress] = []
+    result = contextual_detect(
+        DOCUMENT, backend=backend, deadline=Deadline(60.0), progress=reports.append, cancel=token
+    )
+    # The deadline path checks the token before every sentence
+    assert token.processed == 3
+    assert result == ["zh", "zh", "zh"]
+    assert reports == []
+
+
+def test_deadline_reports_progress() -> None:
+    reports: list[Progress] = []
+    contextual_detect(DOCUMENT[:10], backend=TableBackend(TABLE), deadline=Deadline(60.0), progress=reports.append)
+    assert [report.done for report in reports] == [4, 8, 10]
+
+
+def test_aggregates_pass_cancellation_through() -> None:
+    token = CancellationToken()
+    counts = count_by_language(DOCUMENT, backend=CancellingBackend(TABLE, token, after=1), cancel=token)
+    assert counts == {"zh": 3, "en": 1}
+
+
+def test_detector_cancellation() -> None:
+    token = CancellationToken()
+    detector = Detector(backend=CancellingBackend(TABLE, token, after=6))  # one prediction warms it up
+    reports: list[Progress] = []
+    result = detector.contextual_detect(DOCUMENT, progress=reports.append, cancel=token)
+    assert token.processed == 8
+    assert len(result) == 8
+    assert [report.done for report in reports] == [4, 8]
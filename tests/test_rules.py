@@ -0,0 +1,114 @@
+"""Tests for table-driven context correction."""
+
+from collections.abc import Iterator
+
+import pytest
+
+from contextual_langdetect import rules as rules_module
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.detection import DetectionResult, Thresholds, contextual_detect, resolve_language
+from contextual_langdetect.detector import Detector
+from contextual_langdetect.metrics import disable_metrics, enable_metrics
+from contextual_langdetect.rules import (
+    CLOSELY_RELATED_RULES,
+    DEFAULT_RULES,
+    CorrectionRule,
+    RuleTable,
+    confusable,
+    default_rules,
+    has_kana,
+    register_rules,
+)
+
+THRESHOLDS = Thresholds()
+
+CLOSELY_RELATED = DEFAULT_RULES.extend(CLOSELY_RELATED_RULES)
+
+
+@pytest.fixture(autouse=True)
+def restore_default_rules() -> Iterator[None]:
+    yield
+    rules_module.set_default_rules(DEFAULT_RULES)
+
+
+def resolve(
+    sentence: str, detected: str, probs: dict[str, float], primary: list[str], rules: RuleTable | None = None
+) -> str:
+    detection = DetectionResult(language=detected, confidence=0.5, is_ambiguous=True)
+    return resolve_language(sentence, detection, probs, primary, THRESHOLDS, rules)
+
+
+def test_builtin_rules() -> None:
+    assert resolve("侬好", "wuu", {"wuu": 0.6}, ["zh"]) == "zh"
+    assert resolve("很好", "ja", {"ja": 0.6}, ["zh", "ja"]) == "zh"
+    assert resolve("すごい", "ja", {"ja": 0.6, "zh": 0.35}, ["zh"]) == "ja"
+    assert has_kana("すごい") and not has_kana("很好")
+
+
+@pytest.mark.parametrize(
+    ("detected", "primary", "expected"),
+    [
+        ("id", ["ms"], "ms"),
+        ("ms", ["id"], "id"),
+        ("hr", ["sr"], "sr"),
+        ("bs", ["hr", "en"], "hr"),
+        ("no", ["da"], "da"),
+        ("gl", ["pt"], "pt"),
+        ("id", ["ms", "id"], "id"),  # the detected language is itself primary
+        ("id", ["en"], "id"),
+    ],
+)
+def test_confusion_pairs(detected: str, primary: list[str], expected: str) -> None:
+    assert resolve("text", detected, {detected: 0.5}, primary, CLOSELY_RELATED) == expected
+
+
+def test_first_matching_rule_wins() -> None:
+    # hr -> sr comes before hr -> bs in the table
+    assert resolve("text", "hr", {"hr": 0.5}, ["bs", "sr"], CLOSELY_RELATED) == "sr"
+
+
+def test_closely_related_languages_are_not_corrected_by_default() -> None:
+    # The probability-based fallback picks the most likely primary language
+    assert resolve("text", "hr", {"hr": 0.5, "bs": 0.45, "sr": 0.05}, ["sr", "bs"]) == "bs"
+    assert resolve("text", "id", {"id": 0.5}, ["ms"]) == "id"
+
+
+def test_lookup_is_cached_per_detected_language_and_primary_set() -> None:
+    table = RuleTable(confusable("id", "ms"))
+    rule = table.lookup("id", frozenset(["ms"]))
+    assert rule is not None and rule.name == "id_as_ms"
+    assert table.lookup("id", frozenset(["ms"])) is rule
+    assert table.lookup("id", frozenset(["en"])) is None
+    assert len(table) == 2
+
+
+def test_register_rules_extends_default_table() -> None:
+    assert resolve("text", "uk", {"uk": 0.5}, ["ru"]) == "uk"
+    register_rules(*confusable("uk", "ru"))
+    assert len(default_rules()) == len(DEFAULT_RULES) + 2
+    assert resolve("text", "uk", {"uk": 0.5}, ["ru"]) == "ru"
+
+
+def test_custom_rule_with_keep_condition() -> None:
+    table = RuleTable([CorrectionRule("yue", "zh", "cantonese", keep=lambda sentence: "嘅" in sentence)])
+    assert resolve("你好", "yue", {"yue": 0.5}, ["zh"], table) == "zh"
+    assert resolve("我嘅", "yue", {"yue": 0.5, "zh": 0.4}, ["zh"], table) == "yue"
+    # Without a table row, the probability-based fallback applies
+    assert resolve("你好", "wuu", {"wuu": 0.5, "zh": 0.4}, ["zh"], table) == "zh"
+    assert resolve("你好", "wuu", {"wuu": 0.5}, ["zh"], table) == "wuu"
+
+
+def test_detector_rules() -> None:
+    backend = TableBackend({"Selamat pagi.": {"ms": 0.95}, "Terima kasih.": {"id": 0.55, "ms": 0.20}})
+    sentences = ["Selamat pagi.", "Selamat pagi.", "Terima kasih."]
+    assert contextual_detect(sentences, backend=backend) == ["ms", "ms", "id"]
+    assert Detector(backend=backend, rules=CLOSELY_RELATED).contextual_detect(sentences) == ["ms", "ms", "ms"]
+
+
+def test_corrections_are_counted_by_rule_name() -> None:
+    registry = enable_metrics()
+    try:
+        resolve("Terima kasih.", "id", {"id": 0.55}, ["ms"], CLOSELY_RELATED)
+    finally:
+        disable_metrics()
+    assert registry.value("corrections_total", rule="id_as_ms") == 1
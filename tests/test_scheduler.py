@@ -0,0 +1,135 @@
+"""Tests for the priority scheduler."""
+
+import threading
+
+import pytest
+
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.detection import Language, contextual_detect
+from contextual_langdetect.metrics import disable_metrics, enable_metrics
+from contextual_langdetect.scheduler import Priority, Scheduler
+
+TABLE = {
+    "你好": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "Hello": {"en": 0.95},
+}
+
+
+class GatedBackend(TableBackend):
+    """A table backend that records the texts it predicts, and holds its first prediction until released."""
+
+    def __init__(self) -> None:
+        super().__init__(TABLE, default={"en": 0.9})
+        self.order: list[str] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def predict(self, text: str) -> tuple[Language, float]:
+        if not self.started.is_set():
+            self.started.set()
+            self.release.wait(5)
+        self.order.append(text)
+        return super().predict(text)
+
+
+class FailingBackend(TableBackend):
+    def predict(self, text: str) -> tuple[Language, float]:
+        raise RuntimeError("model crashed")
+
+
+def test_results_match_contextual_detect_across_chunks() -> None:
+    # The ambiguous sentence is resolved with the context of the chunks before and after it
+    document = ["你好", "你好", "Hello", "很好", "Hello", "你好"]
+    with Scheduler(backend=TableBackend(TABLE), chunk_size=2) as scheduler:
+        assert scheduler.contextual_detect(document, Priority.BULK) == contextual_detect(
+            document, backend=TableBackend(TABLE)
+        )
+        assert scheduler.contextual_detect(document, context_correction=False)[3] == "ja"
+        assert scheduler.contextual_detect(["很好"], languages=["zh"]) == ["zh"]
+        assert scheduler.contextual_detect([]) == []
+
+
+def test_interactive_requests_run_between_bulk_chunks() -> None:
+    backend = GatedBackend()
+    with Scheduler(backend=backend, chunk_size=2) as scheduler:
+        bulk = scheduler.submit([f"bulk {i}" for i in range(6)], Priority.BULK)
+        assert backend.started.wait(5)
+        interactive = scheduler.submit(["interactive"])
+        assert scheduler.stats()[Priority.BULK].queued_chunks == 2
+        assert scheduler.stats()[Priority.INTERACTIVE].queued_chunks == 1
+        backend.release.set()
+
+        assert interactive.result(5) == ["en"]
+        assert bulk.result(5) == ["en"] * 6
+    assert backend.order.index("interactive") == 2  # right after the first bulk chunk
+
+
+def test_stats() -> None:
+    with Scheduler(backend=TableBackend(TABLE), chunk_size=1) as scheduler:
+        scheduler.contextual_detect(["你好", "Hello"], Priority.BULK)
+        scheduler.contextual_detect(["你好"])
+        stats = scheduler.stats()
+    assert stats[Priority.BULK].submitted == stats[Priority.BULK].completed == 1
+    assert stats[Priority.INTERACTIVE].completed == 1
+    assert stats[Priority.BULK].queued_chunks == 0
+    assert 0 <= stats[Priority.BULK].wait_p50 <= stats[Priority.BULK].wait_p99 <= stats[Priority.BULK].max_wait
+
+
+def test_wait_times_are_recorded_in_metrics() -> None:
+    registry = enable_metrics()
+    try:
+        with Scheduler(backend=TableBackend(TABLE), chunk_size=1) as scheduler:
+            scheduler.contextual_detect(["你好", "Hello"], Priority.BULK)
+    finally:
+        disable_metrics()
+    assert registry.value("scheduler_wait_seconds", priority="bulk") == 2
+    assert registry.value("calls_total", entry_point="Scheduler.submit") == 1
+    # Inference on the workers is part of the submitted call
+    assert registry.value("calls_total", entry_point="detect_language") == 0
+
+
+def test_failures_are_raised_from_the_future() -> None:
+    with Scheduler(backend=FailingBackend(TABLE), chunk_size=1) as scheduler:
+        with pytest.raises(RuntimeError, match="model crashed"):
+            scheduler.contextual_detect(["你好", "Hello"])
+
+
+def test_cancelled_documents_are_dropped() -> None:
+    backend = GatedBackend()
+    with Scheduler(backend=backend, chunk_size=1) as scheduler:
+        first = scheduler.submit(["first"], Priority.BULK)
+        assert backend.started.wait(5)
+        cancelled = scheduler.submit(["a", "b", "c"], Priority.BULK)
+        assert cancelled.cancel()
+        backend.release.set()
+        assert first.result(5) == ["en"]
+    assert backend.order == ["first"]
+
+
+def test_stats_after_cancel() -> None:
+    backend = GatedBackend()
+    with Scheduler(backend=backend, chunk_size=1) as scheduler:
+        first = scheduler.submit(["first"], Priority.BULK)
+        assert backend.started.wait(5)
+        cancelled = scheduler.submit(["a", "b", "c"], Priority.BULK)
+        assert scheduler.stats()[Priority.BULK].queued_chunks == 3
+        assert cancelled.cancel()
+        stats = scheduler.stats()[Priority.BULK]
+        assert stats.queued_chunks == 0
+        assert stats.cancelled == 1
+        backend.release.set()
+        first.result(5)
+    stats = scheduler.stats()[Priority.BULK]
+    assert (stats.submitted, stats.completed, stats.cancelled) == (2, 1, 1)
+
+
+def test_close() -> None:
+    scheduler = Scheduler(backend=TableBackend(TABLE), workers=2)
+    future = scheduler.submit(["你好"] * 100)
+    scheduler.close()
+    assert future.result() == ["zh"] * 100
+    with pytest.raises(RuntimeError):
+        scheduler.submit(["你好"])
+    with pytest.raises(ValueError):
+        Scheduler(backend=TableBackend(TABLE), chunk_size=0)
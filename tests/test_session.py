@@ -0,0 +1,89 @@
+"""Tests for incremental document sessions."""
+
+import random
+
+import pytest
+
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.detection import contextual_detect
+from contextual_langdetect.session import DocumentSession
+
+TABLE = {
+    "中文": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "English": {"en": 0.95},
+    "Okay": {"en": 0.60, "zh": 0.31},
+    "Français": {"fr": 0.95},
+}
+
+
+def test_session_matches_contextual_detect() -> None:
+    backend = TableBackend(TABLE)
+    sentences = ["中文", "很好", "English", "Okay", "中文"]
+    session = DocumentSession(sentences, backend=backend)
+    assert session.languages == contextual_detect(sentences, backend=backend)
+    assert session.sentences == sentences
+    assert len(session) == 5
+
+
+def test_session_reinfers_only_changed_sentences() -> None:
+    backend = TableBackend(TABLE)
+    session = DocumentSession(["中文", "很好", "English"], backend=backend)
+    calls = backend.calls
+
+    session.update(2, "中文")
+    # One detection and one distribution for the single changed sentence
+    assert backend.calls == calls + 2
+
+
+def test_session_reports_only_changed_languages() -> None:
+    backend = TableBackend(TABLE)
+    session = DocumentSession(["中文", "很好", "English", "Okay"], backend=backend)
+    assert session.languages == ["zh", "zh", "en", "en"]
+
+    # Same language at the same position: nothing to report
+    assert session.update(0, "中文") == {}
+
+    # Inserted sentences are always reported; shifted sentences whose language is unchanged are not
+    assert session.insert(1, ["Français"]) == {1: "fr"}
+    assert session.languages == ["zh", "fr", "zh", "en", "en"]
+
+    # Removing all the English context changes the resolution of the ambiguous "Okay"
+    changes = session.remove(3, 4)
+    assert session.languages == ["zh", "fr", "zh", "zh"]
+    assert changes == {3: "zh"}
+
+
+def test_session_random_edits_match_full_recompute() -> None:
+    rng = random.Random(0)
+    texts = list(TABLE)
+    backend = TableBackend(TABLE)
+    session = DocumentSession([rng.choice(texts) for _ in range(20)], backend=backend)
+    for _ in range(50):
+        before = session.languages
+        start = rng.randrange(len(session) + 1)
+        end = rng.randrange(start, min(len(session), start + 3) + 1)
+        new = [rng.choice(texts) for _ in range(rng.randrange(3))]
+        changes = session.replace(start, end, new)
+        expected = contextual_detect(session.sentences, backend=backend)
+        assert session.languages == expected
+        for index in range(start, start + len(new)):
+            if index >= end or before[index] != expected[index]:
+                assert changes[index] == expected[index]
+
+
+def test_session_undetectable_sentences_keep_position() -> None:
+    session = DocumentSession(["中文", "", "English"], backend=TableBackend(TABLE))
+    assert session.languages == ["zh", None, "en"]
+
+
+def test_session_single_language() -> None:
+    session = DocumentSession(["a", "b"], languages=["en"])
+    assert session.insert(0, ["c"]) == {0: "en"}
+    assert session.languages == ["en", "en", "en"]
+
+
+def test_session_invalid_range() -> None:
+    session = DocumentSession(["中文"], backend=TableBackend(TABLE))
+    with pytest.raises(IndexError):
+        session.replace(1, 3, [])
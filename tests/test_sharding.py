@@ -0,0 +1,54 @@
+"""Tests for mergeable document statistics and sharded two-pass detection."""
+
+import json
+import pickle
+
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.detection import DocumentStatistics, contextual_detect
+from contextual_langdetect.sharding import DocumentShard
+
+TABLE = {
+    "中文": {"zh": 0.95},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "English": {"en": 0.95},
+    "Okay": {"en": 0.60, "zh": 0.31},
+    "Merci": {"fr": 0.50, "en": 0.45},
+}
+
+
+def test_shards_agree_with_whole_document() -> None:
+    backend = TableBackend(TABLE)
+    document = ["中文", "中文", "中文", "很好", "English", "Okay", "Merci", "English", "很好", "English"]
+    parts = [document[:3], document[3:7], document[7:]]
+
+    shards = [DocumentShard(part, backend=backend) for part in parts]
+    statistics = sum((shard.statistics for shard in shards[1:]), shards[0].statistics)
+    languages = [lang for shard in shards for lang in shard.resolve(statistics)]
+
+    assert statistics.total == len(document)
+    assert languages == contextual_detect(document, backend=backend)
+    # Without the global statistics, the first shard would not know about English
+    assert statistics.primary_languages() == ["zh", "en"]
+    assert shards[0].statistics.primary_languages() == ["zh"]
+
+
+def test_statistics_merge_preserves_first_appearance_order() -> None:
+    a = DocumentStatistics({"zh": 2, "en": 1}, {"zh": 2}, 3)
+    b = DocumentStatistics({"fr": 1, "en": 2}, {"en": 2, "fr": 1}, 3)
+    merged = a + b
+    assert list(merged.language_counts.items()) == [("zh", 2), ("en", 3), ("fr", 1)]
+    assert list(merged.confident_language_counts.items()) == [("zh", 2), ("en", 2), ("fr", 1)]
+    assert merged.total == 6
+
+
+def test_statistics_serialization_round_trip() -> None:
+    stats = DocumentStatistics({"zh": 2, "en": 1}, {"zh": 2}, 3)
+    assert DocumentStatistics.from_dict(json.loads(json.dumps(stats.to_dict()))) == stats
+    assert pickle.loads(pickle.dumps(stats)) == stats
+
+
+def test_shard_with_single_expected_language() -> None:
+    backend = TableBackend(TABLE)
+    shard = DocumentShard(["中文", "English"], languages=["zh"], backend=backend)
+    assert shard.resolve() == ["zh", "zh"]
+    assert backend.calls == 0
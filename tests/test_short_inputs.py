@@ -0,0 +1,131 @@
+"""Tests for the short-input fast path."""
+
+import pytest
+
+from contextual_langdetect.backends import TableBackend
+from contextual_langdetect.deadline import UNKNOWN_LANGUAGE, Deadline
+from contextual_langdetect.detection import contextual_detect, count_by_language
+from contextual_langdetect.detector import Detector
+from contextual_langdetect.metrics import disable_metrics, enable_metrics
+from contextual_langdetect.short_inputs import InheritFrom, ShortInputPolicy
+
+TABLE = {
+    "你好，最近怎么样？": {"zh": 0.95},
+    "我今天很忙。": {"zh": 0.9},
+    "How are you doing today?": {"en": 0.95},
+    "See you tomorrow.": {"en": 0.9},
+    "ok": {"en": 0.4, "it": 0.3},
+    "很好": {"ja": 0.55, "zh": 0.35},
+    "👍": {"en": 0.2},
+}
+
+
+@pytest.mark.parametrize(
+    ("text", "short"),
+    [
+        ("ok", True),
+        ("Yes", True),
+        ("okay.", True),
+        ("很好", True),
+        ("👍👍👍👍", True),
+        ("12345 678", True),
+        ("Yes please", False),
+        ("你好，最近怎么样？", False),
+        ("", False),
+        ("   ", False),
+    ],
+)
+def test_is_short(text: str, short: bool) -> None:
+    assert ShortInputPolicy().is_short(text) is short
+
+
+def test_max_tokens() -> None:
+    policy = ShortInputPolicy(max_tokens=3)
+    assert policy.is_short("Yes, thank you")
+    assert not policy.is_short("Yes, thank you all")
+    assert policy.is_short("谢谢你")
+    assert not policy.is_short("谢谢你们")
+
+
+def test_short_sentences_skip_inference_and_inherit_from_neighbors() -> None:
+    backend = TableBackend(TABLE)
+    sentences = ["ok", "你好，最近怎么样？", "很好", "How are you doing today?", "👍", "See you tomorrow."]
+    policy = ShortInputPolicy()
+
+    languages = contextual_detect(sentences, backend=backend, short_inputs=policy)
+
+    assert languages == ["zh", "zh", "zh", "en", "en", "en"]
+    assert policy.inherited(sentences) == [0, 2, 4]
+    assert backend.calls == 2 * 3  # predict and top_k for each long sentence only
+
+
+def test_inherit_from_primary_language() -> None:
+    sentences = ["你好，最近怎么样？", "我今天很忙。", "How are you doing today?", "ok"]
+    policy = ShortInputPolicy(inherit_from=InheritFrom.PRIMARY)
+
+    assert contextual_detect(sentences, backend=TableBackend(TABLE), short_inputs=policy) == ["zh", "zh", "en", "zh"]
+
+
+def test_all_short_sentences_are_detected() -> None:
+    backend = TableBackend(TABLE)
+    policy = ShortInputPolicy()
+
+    assert contextual_detect(["ok", "很好"], backend=backend, short_inputs=policy) == contextual_detect(
+        ["ok", "很好"], backend=TableBackend(TABLE)
+    )
+    assert policy.inherited(["ok", "很好"]) == []
+
+
+def test_empty_sentences_do_not_count_as_context() -> None:
+    policy = ShortInputPolicy()
+
+    assert contextual_detect(["ok", "", "  "], backend=TableBackend(TABLE), short_inputs=policy) == ["en"]
+    assert policy.inherited(["ok", ""]) == []
+
+
+def test_short_sentences_are_dropped_without_context() -> None:
+    backend = TableBackend(TABLE)
+
+    assert contextual_detect(["Not in the table", "ok"], backend=backend, short_inputs=ShortInputPolicy()) == []
+
+
+def test_aggregates_and_detector_accept_policy() -> None:
+    sentences = ["你好，最近怎么样？", "很好", "ok", "How are you doing today?"]
+    policy = ShortInputPolicy()
+
+    counts = count_by_language(sentences, backend=TableBackend(TABLE), short_inputs=policy)
+    detector = Detector(backend=TableBackend(TABLE), short_inputs=policy)
+
+    assert counts == {"zh": 3, "en": 1}
+    assert detector.contextual_detect(sentences) == ["zh", "zh", "zh", "en"]
+
+
+def test_deadline_labels_unreached_short_sentences_unknown() -> None:
+    sentences = ["你好，最近怎么样？", "ok", "How are you doing today?", "ok"]
+    deadline = Deadline(-1.0)
+
+    languages = contextual_detect(
+        sentences, backend=TableBackend(TABLE), deadline=deadline, short_inputs=ShortInputPolicy()
+    )
+
+    assert languages == [UNKNOWN_LANGUAGE] * 4
+
+
+def test_deadline_with_budget_matches_undeadlined_call() -> None:
+    sentences = ["ok", "你好，最近怎么样？", "很好", "How are you doing today?", "👍"]
+    policy = ShortInputPolicy()
+
+    assert contextual_detect(
+        sentences, backend=TableBackend(TABLE), deadline=Deadline(60.0), short_inputs=policy
+    ) == contextual_detect(sentences, backend=TableBackend(TABLE), short_inputs=policy)
+
+
+def test_inherited_sentences_are_counted() -> None:
+    registry = enable_metrics()
+    try:
+        sentences = ["ok", "你好，最近怎么样？", "很好"]
+        contextual_detect(sentences, backend=TableBackend(TABLE), short_inputs=ShortInputPolicy())
+    finally:
+        disable_metrics()
+
+    assert registry.value("sentences_inherited_total") == 2
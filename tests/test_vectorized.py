@@ -0,0 +1,99 @@
+"""Tests for the NumPy implementation of context correction."""
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from contextual_langdetect import detection, metrics  # noqa: E402
+from contextual_langdetect.backends import TableBackend  # noqa: E402
+from contextual_langdetect.detection import (  # noqa: E402
+    DetectionResult,
+    FirstPassResult,
+    Language,
+    Thresholds,
+    contextual_detect,
+    resolve_first_pass,
+)
+from contextual_langdetect.rules import CLOSELY_RELATED_RULES, DEFAULT_RULES, CorrectionRule  # noqa: E402
+from contextual_langdetect.vectorized import resolve_document  # noqa: E402
+
+LANGUAGES = ["zh", "ja", "wuu", "en", "ms", "id", "hr", "sr", "fr"]
+
+
+def random_results(rng: random.Random, n: int) -> list[FirstPassResult]:
+    """First-pass results with a skewed language mix, ties in the probabilities, and kana in some sentences."""
+    results: list[FirstPassResult] = []
+    for index in range(n):
+        language = rng.choices(LANGUAGES, weights=[30, 10, 3, 20, 8, 5, 2, 2, 1])[0]
+        confidence = round(rng.random(), 1)
+        candidates = rng.sample(LANGUAGES, rng.randint(0, 4))
+        probabilities = {lang: round(rng.random() * 0.6, 1) for lang in candidates}
+        probabilities[language] = confidence
+        sentence = rng.choice(["中文", "ひらがな", "text"])
+        detection = DetectionResult(language, confidence, confidence < 0.7)
+        results.append(FirstPassResult(sentence, detection, probabilities, index))
+    return results
+
+
+def loop(results: list[FirstPassResult], languages: list[Language] | None, thresholds: Thresholds) -> list[Language]:
+    return resolve_first_pass(results, languages, True, thresholds)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("languages", [None, ["zh", "en"], ["ms", "id"], ["fr"]])
+def test_matches_loop(seed: int, languages: list[Language] | None) -> None:
+    rng = random.Random(seed)
+    results = random_results(rng, rng.choice([1, 5, 50, 500]))
+    thresholds = Thresholds.from_module()
+    assert resolve_document(results, languages, thresholds) == loop(results, languages, thresholds)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_loop_with_other_thresholds_and_rules(seed: int) -> None:
+    rng = random.Random(seed)
+    results = random_results(rng, 300)
+    thresholds = Thresholds(0.5, 0.3, 1.2, 0.4, 0.0)
+    rules = DEFAULT_RULES.extend(CLOSELY_RELATED_RULES).extend([CorrectionRule("fr", "en", override_primary=True)])
+    expected = resolve_first_pass(results, None, True, thresholds, rules=rules)
+    assert resolve_document(results, None, thresholds, rules) == expected
+
+
+def test_records_the_same_corrections() -> None:
+    results = random_results(random.Random(0), 500)
+    thresholds = Thresholds.from_module()
+    registry = metrics.enable_metrics()
+    try:
+        loop(results, None, thresholds)
+        expected = registry.render()
+        registry = metrics.enable_metrics()
+        resolve_document(results, None, thresholds)
+        assert registry.render() == expected
+    finally:
+        metrics.disable_metrics()
+
+
+def test_empty_and_unambiguous_documents() -> None:
+    thresholds = Thresholds.from_module()
+    assert resolve_document([], None, thresholds) == []
+    results = [FirstPassResult("text", DetectionResult("en", 0.9, False), {"en": 0.9}, 0)]
+    assert resolve_document(results, None, thresholds) == ["en"]
+
+
+def test_large_documents_use_the_vectorized_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    table = {"中文": {"zh": 0.95}, "很好": {"ja": 0.55, "zh": 0.35}, "English": {"en": 0.95}}
+    document = ["中文", "很好", "中文", "English"] * 10
+    expected = contextual_detect(document, backend=TableBackend(table))
+
+    calls: list[int] = []
+
+    def spy(results: list[FirstPassResult], *args: object) -> list[Language]:
+        calls.append(len(results))
+        return resolve_document(results, *args)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(detection, "VECTORIZED_MIN_SENTENCES", 40)
+    monkeypatch.setattr("contextual_langdetect.vectorized.resolve_document", spy)
+    assert contextual_detect(document, backend=TableBackend(table)) == expected
+    assert contextual_detect(document[:-1], backend=TableBackend(table)) == expected[:-1]
+    assert calls == [40]
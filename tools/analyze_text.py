@@ -8,7 +8,10 @@ detection system works with different content.
 
 import argparse
 import sys
+import time
+from contextlib import nullcontext
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Iterator, TextIO
 
 from rich.console import Console
@@ -21,6 +24,8 @@ from contextual_langdetect.detection import (
     get_language_probabilities,
 )
 from contextual_langdetect.exceptions import LanguageDetectionError
+from contextual_langdetect.profiling import Timings, profile
+from contextual_langdetect.types import ModelSize
 
 console = Console()
 
@@ -42,11 +47,12 @@ def read_file_lines(file: TextIO) -> Iterator[LineInfo]:
         yield LineInfo(line_number, text, is_content)
 
 
-def process_file_with_context(file_path: str) -> None:
+def process_file_with_context(file_path: str, timings: Timings | None = None) -> None:
     """Process text file using context-aware language detection.
 
     Args:
         file_path: Path to the text file to analyze
+        timings: If given, load the model up front and record load, per-phase and per-line times
     """
     try:
         with open(file_path, encoding="utf-8") as f:
@@ -64,6 +70,10 @@ def process_file_with_context(file_path: str) -> None:
         f"[bold blue]Analyzing {len(content_lines)} non-empty, non-comment lines from {file_path}[/bold blue]"
     )
 
+    if timings is not None:
+        timings.load_model(ModelSize.SMALL)
+    first_pass_start = time.perf_counter()
+
     # Step 1: First Pass - Analyze each sentence independently
     first_pass_results: list[tuple[LineInfo, DetectionResult, dict[str, float]]] = []
     original_detections: list[str] = []
@@ -90,11 +100,12 @@ def process_file_with_context(file_path: str) -> None:
             continue
 
         try:
-            # Standard detection
-            detection = detect_language(line_info.text)
+            with timings.line(line_info.line_number, line_info.text) if timings is not None else nullcontext():
+                # Standard detection
+                detection = detect_language(line_info.text)
 
-            # Get full probability distribution
-            probs = get_language_probabilities(line_info.text)
+                # Get full probability distribution
+                probs = get_language_probabilities(line_info.text)
 
             first_pass_results.append((line_info, detection, probs))
             original_detections.append(detection.language)
@@ -111,12 +122,16 @@ def process_file_with_context(file_path: str) -> None:
         except LanguageDetectionError as e:
             console.print(f"Error on line {line_info.line_number}: {e}")
 
+    if timings is not None:
+        timings.phase_seconds["first pass"] = time.perf_counter() - first_pass_start
+
     # Print the table of detections
     console.print("\n[bold green]=== LINE-BY-LINE ANALYSIS ===[/bold green]")
     console.print(line_table)
 
     # Process using the context-aware approach
-    context_aware_results = contextual_detect([item[0].text for item in first_pass_results])
+    with timings.phase("contextual_detect") if timings is not None else nullcontext():
+        context_aware_results = contextual_detect([item[0].text for item in first_pass_results])
 
     # Compact summary table (only content lines)
     console.print("\n[bold green]=== CONTEXT-AWARE RESULTS ===[/bold green]")
@@ -149,9 +164,27 @@ def main() -> None:
     """Main function."""
     parser = argparse.ArgumentParser(description="Test context-aware language detection")
     parser.add_argument("file", help="Text file to analyze")
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report model load time, inference time, the per-line latency distribution and the slowest lines",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help="Write a cProfile dump to PATH, or collapsed stacks for a flame graph if PATH ends in .folded",
+    )
     args = parser.parse_args()
 
-    process_file_with_context(args.file)
+    timings = Timings() if args.timings else None
+    with profile(args.profile) if args.profile else nullcontext():
+        process_file_with_context(args.file, timings)
+    if timings is not None:
+        console.print()
+        timings.print(console)
+    if args.profile:
+        console.print(f"[dim]Profile written to {args.profile}[/dim]")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""Detect the language of every line of a large corpus, with checkpoints so that an interrupted run can resume.
+
+The corpus has one sentence per line, in documents separated by blank lines. The output has one language code per
+input line. A checkpoint is written atomically every --checkpoint-lines lines; after a crash or preemption, run the
+same command with --resume to continue where the last checkpoint left off.
+"""
+
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from contextual_langdetect.corpus import (
+    DEFAULT_CHECKPOINT_LINES,
+    DEFAULT_MAX_DOCUMENT_LINES,
+    CorpusCheckpoint,
+    detect_corpus,
+)
+from contextual_langdetect.types import ModelSize
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("input", type=Path, help="Corpus file: one sentence per line, blank lines between documents")
+    parser.add_argument("output", type=Path, help="File to write one language code per input line to")
+    parser.add_argument("--stats", type=Path, metavar="PATH", help="Write per-document language counts as JSON lines")
+    parser.add_argument(
+        "--arrow", type=Path, metavar="DIR", help="Also write language-partitioned Arrow IPC files to DIR"
+    )
+    parser.add_argument(
+        "--checkpoint", type=Path, metavar="PATH", help="Checkpoint file (default: the output path + .ckpt)"
+    )
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint, if there is one")
+    parser.add_argument(
+        "--checkpoint-lines",
+        type=int,
+        default=DEFAULT_CHECKPOINT_LINES,
+        help=f"Input lines between checkpoints (default: {DEFAULT_CHECKPOINT_LINES:,})",
+    )
+    parser.add_argument(
+        "--max-document-lines",
+        type=int,
+        default=DEFAULT_MAX_DOCUMENT_LINES,
+        help=f"Resolve longer documents in segments of this many lines (default: {DEFAULT_MAX_DOCUMENT_LINES:,})",
+    )
+    parser.add_argument("--languages", help="Comma-separated expected languages, e.g. zh,en")
+    parser.add_argument("--model", choices=["small", "large"], default="small", help="Model to use")
+    parser.add_argument("--no-context", action="store_true", help="Write raw detections, without context correction")
+    args = parser.parse_args()
+
+    console = Console(stderr=True)
+    checkpoint_path = args.checkpoint or args.output.with_name(args.output.name + ".ckpt")
+    start = time.perf_counter()
+    start_lines = 0
+
+    def report(state: CorpusCheckpoint) -> None:
+        rate = (state.input_lines - start_lines) / max(time.perf_counter() - start, 1e-9)
+        console.print(f"[dim]{state.input_lines:,} lines, {state.documents:,} documents, {rate:,.0f} lines/s[/dim]")
+
+    if args.resume and checkpoint_path.exists():
+        resumed = CorpusCheckpoint.load(checkpoint_path)
+        start_lines = resumed.input_lines
+        console.print(f"[cyan]Resuming at line {resumed.input_lines + 1:,}[/cyan]")
+    try:
+        state = detect_corpus(
+            args.input,
+            args.output,
+            stats_path=args.stats,
+            checkpoint_path=checkpoint_path,
+            resume=args.resume,
+            checkpoint_lines=args.checkpoint_lines,
+            max_document_lines=args.max_document_lines,
+            languages=args.languages.split(",") if args.languages else None,
+            model=ModelSize(args.model),
+            context_correction=not args.no_context,
+            columnar_path=args.arrow,
+            on_checkpoint=report,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    table = Table(title=f"{state.input_lines:,} lines, {state.documents:,} documents")
+    table.add_column("Language")
+    table.add_column("Lines", justify="right")
+    for language, count in sorted(state.language_counts.items(), key=lambda item: (-item[1], item[0])):
+        table.add_row(language, f"{count:,}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
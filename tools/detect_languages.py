@@ -6,9 +6,12 @@ Each non-empty, non-comment line is analyzed separately. The script outputs a ta
 showing language detection probabilities for each line.
 """
 
+import time
 from argparse import ArgumentParser
 from collections import Counter
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TextIO, TypedDict
@@ -17,6 +20,18 @@ from fast_langdetect import detect_multilingual
 from rich.console import Console
 from rich.table import Table
 
+from contextual_langdetect.backends import default_backend
+from contextual_langdetect.detection import LanguageState, Thresholds, resolve_language
+from contextual_langdetect.profiling import LineTiming, Timings, profile
+from contextual_langdetect.types import DetectionResult as Detection
+from contextual_langdetect.types import Language, ModelSize
+
+# Models compared in interactive mode
+MODELS = (ModelSize.SMALL, ModelSize.LARGE)
+
+# Scores at or below this are not shown
+MIN_SCORE = 0.01
+
 
 class LangDetectResult(TypedDict):
     lang: str
@@ -34,12 +49,15 @@ def read_sentences(file: TextIO) -> list[str]:
     return [line.strip() for line in file if line.strip() and not line.strip().startswith("#")]
 
 
-def detect_languages(sentences: Sequence[str], *, model: str = "small") -> list[DetectionResult]:
-    """Detect languages for each sentence."""
+def detect_languages(
+    sentences: Sequence[str], *, model: str = "small", timings: Timings | None = None
+) -> list[DetectionResult]:
+    """Detect languages for each sentence, recording per-sentence latencies in `timings` if given."""
     results: list[DetectionResult] = []
-    for text in sentences:
-        langs = detect_multilingual(text, low_memory=(model == "small"), k=5)
-        filtered_langs = [lang for lang in langs if lang["score"] > 0.01]
+    for number, text in enumerate(sentences, 1):
+        with timings.line(number, text) if timings is not None else nullcontext():
+            langs = detect_multilingual(text, low_memory=(model == "small"), k=5)
+        filtered_langs = [lang for lang in langs if lang["score"] > MIN_SCORE]
         results.append(DetectionResult(text=text, languages=filtered_langs))
     return results
 
@@ -50,35 +68,98 @@ def format_detection_result(result: DetectionResult) -> str:
     return " ".join(f"{lang['lang']}:{lang['score']:.2f}" for lang in scores)
 
 
-def interactive_mode() -> None:
-    """Run in interactive mode, comparing small and large models."""
+def load_models(console: Console, timings: dict[ModelSize, Timings]) -> None:
+    """Load the models concurrently, showing a timer until they are all ready."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(MODELS)) as pool, console.status("") as status:
+        futures = [pool.submit(timings[model].load_model, model) for model in MODELS]
+        while not all(future.done() for future in futures):
+            status.update(f"[cyan]Loading models... {time.perf_counter() - start:.1f} s[/cyan]")
+            wait(futures, timeout=0.1)
+        for future in futures:
+            future.result()
+    loaded = ", ".join(f"{model.value} {timings[model].model_load_seconds[model]:.2f} s" for model in MODELS)
+    console.print(f"[dim]Models loaded in {time.perf_counter() - start:.2f} s ({loaded})[/dim]")
+
+
+def detect_with_model(text: str, model: ModelSize) -> tuple[DetectionResult, float]:
+    """Detect the languages of `text` with an already loaded model, and return the result and its latency."""
+    start = time.perf_counter()
+    probabilities = default_backend(model).top_k(text, k=5)
+    seconds = time.perf_counter() - start
+    languages = [LangDetectResult(lang=lang, score=score) for lang, score in probabilities.items() if score > MIN_SCORE]
+    return DetectionResult(text=text, languages=languages), seconds
+
+
+def contextual_language(state: LanguageState, result: DetectionResult, thresholds: Thresholds) -> Language | None:
+    """Resolve a result with the primary languages of the inputs so far, then add it to them."""
+    if not result.languages:
+        return None
+    top = max(result.languages, key=lambda lang: lang["score"])
+    detection = Detection(
+        language=top["lang"], confidence=top["score"], is_ambiguous=top["score"] < thresholds.confidence
+    )
+    probabilities = {lang["lang"]: lang["score"] for lang in result.languages}
+    language = resolve_language(result.text, detection, probabilities, state.primary_languages or [], thresholds)
+    state.record_language(detection.language)
+    return language
+
+
+def interactive_mode(context: bool = False, show_timings: bool = False) -> None:
+    """Run in interactive mode, comparing small and large models.
+
+    Both models are loaded before the first prompt and run concurrently on each input. With `context`, each model
+    keeps a `LanguageState` of the inputs so far, and each input's contextual language is shown next to its raw one.
+    """
     console = Console()
+    timings = {model: Timings() for model in MODELS}
+    load_models(console, timings)
+    states = {model: LanguageState() for model in MODELS}
+    thresholds = Thresholds.from_module()
     console.print("[cyan]Enter text to analyze (Ctrl+D or Ctrl+C to exit)[/cyan]")
 
-    try:
-        while True:
-            try:
-                text = input("\nText> ").strip()
-                if not text:
-                    continue
-
-                # Analyze with both models
-                small_result = detect_languages([text], model="small")[0]
-                large_result = detect_languages([text], model="large")[0]
-
-                # Display results
-                console.print("\n[yellow]Small model:[/yellow]", end=" ")
-                console.print(format_detection_result(small_result))
-                console.print("[yellow]Large model:[/yellow]", end=" ")
-                console.print(format_detection_result(large_result))
-
-            except EOFError:
-                break
-            except KeyboardInterrupt:
-                break
-    except KeyboardInterrupt:
-        pass
-
+    with ThreadPoolExecutor(max_workers=len(MODELS)) as pool:
+        try:
+            number = 0
+            while True:
+                try:
+                    text = input("\nText> ").strip()
+                    if not text:
+                        continue
+                    number += 1
+
+                    # Analyze with both models at once
+                    start = time.perf_counter()
+                    futures = {model: pool.submit(detect_with_model, text, model) for model in MODELS}
+                    results = {model: future.result() for model, future in futures.items()}
+                    elapsed = time.perf_counter() - start
+
+                    # Display results
+                    console.print()
+                    for model, (result, seconds) in results.items():
+                        timings[model].lines.append(LineTiming(number, text, seconds))
+                        console.print(
+                            f"[yellow]{model.value.capitalize()} model[/yellow] [dim]{seconds * 1e3:6.2f} ms[/dim]",
+                            end=" ",
+                        )
+                        console.print(format_detection_result(result), end="")
+                        if context:
+                            language = contextual_language(states[model], result, thresholds)
+                            console.print(f"  [green]in context: {language}[/green]", end="")
+                        console.print()
+                    console.print(f"[dim]Both models: {elapsed * 1e3:.2f} ms[/dim]")
+
+                except EOFError:
+                    break
+                except KeyboardInterrupt:
+                    break
+        except KeyboardInterrupt:
+            pass
+
+    if show_timings:
+        for model in MODELS:
+            console.print(f"\n[bold]{model.value.capitalize()} model[/bold]")
+            timings[model].print(console)
     console.print("\n[cyan]Goodbye![/cyan]")
 
 
@@ -196,10 +277,26 @@ def main() -> None:
         action="store_true",
         help="Run in interactive mode, comparing small and large models",
     )
+    parser.add_argument(
+        "--context",
+        action="store_true",
+        help="In interactive mode, also show each input's language in the context of the previous inputs",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report model load time, inference time, the per-line latency distribution and the slowest lines",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help="Write a cProfile dump to PATH, or collapsed stacks for a flame graph if PATH ends in .folded",
+    )
     args = parser.parse_args()
 
     if args.interactive:
-        interactive_mode()
+        interactive_mode(context=args.context, show_timings=args.timings)
         return
 
     if not args.file:
@@ -208,12 +305,23 @@ def main() -> None:
     with open(args.file) as f:
         sentences = read_sentences(f)
 
-    results = detect_languages(sentences, model=args.model)
-    major_langs, total_scores = find_major_languages(results)
-    table = create_results_table(results, major_langs, total_scores)
+    timings = Timings() if args.timings else None
+    with profile(args.profile) if args.profile else nullcontext():
+        if timings is not None:
+            timings.load_model(ModelSize(args.model))
+            with timings.phase("inference"):
+                results = detect_languages(sentences, model=args.model, timings=timings)
+        else:
+            results = detect_languages(sentences, model=args.model)
+        major_langs, total_scores = find_major_languages(results)
+        table = create_results_table(results, major_langs, total_scores)
 
     console = Console()
     console.print(table)
+    if timings is not None:
+        timings.print(console)
+    if args.profile:
+        console.print(f"[dim]Profile written to {args.profile}[/dim]")
 
 
 if __name__ == "__main__":